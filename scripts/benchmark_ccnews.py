@@ -0,0 +1,280 @@
+import functools
+import gzip
+import logging
+import multiprocessing
+import os
+import random
+import sys
+import tempfile
+import time
+from argparse import ArgumentParser, Namespace
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from fastwarc.stream_io import FileStream, GZipStream
+from fastwarc.warc import WarcRecord, WarcRecordType
+from tqdm import tqdm
+
+from fundus import CCNewsCrawler, PublisherCollection
+from fundus.logging import set_log_level
+from fundus.publishers.base_objects import Publisher
+from fundus.scraping.stats import Metric
+from scripts.benchmark_utility import Results, add_baseline_arguments, report
+from tests.utility import load_html_test_file_mapping
+
+# the month the synthetic WARC files are dated to
+MONTH = datetime(2024, 1, 1)
+
+CHARSETS = ["windows-1252", "iso-8859-1"]
+
+
+@dataclass
+class Page:
+    url: str
+    content: str
+
+
+@dataclass
+class WarcStats:
+    records: int = 0
+    responses: int = 0
+    matching: int = 0
+
+
+def load_corpus() -> List[Page]:
+    pages: List[Page] = []
+    for publisher in tqdm(list(PublisherCollection), desc="loading test HTML", leave=False):
+        pages.extend(Page(html.url, html.content) for html in load_html_test_file_mapping(publisher).values())
+    return pages
+
+
+def _http_response(content_type: str, body: bytes) -> bytes:
+    return f"HTTP/1.1 200 OK\r\nContent-Type: {content_type}\r\nContent-Length: {len(body)}\r\n\r\n".encode() + body
+
+
+def _write_record(
+    stream: GZipStream, record_type: WarcRecordType, url: str, date: datetime, block: bytes, content_type: str
+) -> None:
+    record = WarcRecord()
+    record.init_headers(len(block), record_type)
+    record.headers["WARC-Target-URI"] = url
+    record.headers["WARC-Date"] = date.strftime("%Y-%m-%dT%H:%M:%SZ")
+    record.headers["Content-Type"] = content_type
+    record.set_bytes_content(block)
+    record.write(stream, checksum_data=True)
+
+
+def write_warc(path: Path, pages: List[Page], arguments: Namespace, rng: random.Random, date: datetime) -> WarcStats:
+    """Writes a WARC file resembling CC-NEWS.
+
+    Besides HTML responses of supported publishers, some of which use legacy charsets that are declared,
+    missing or declared wrongly, the file contains responses of unsupported domains, non-HTML responses
+    as well as request and metadata records.
+    """
+    stats = WarcStats()
+    stream = GZipStream(FileStream(str(path), "wb"))
+    try:
+        for i in range(arguments.records):
+            page = rng.choice(pages)
+            url = page.url
+            date = date + timedelta(seconds=1)
+            stats.records += 1
+
+            if rng.random() < arguments.non_html_rate:
+                kind = rng.choice(["request", "metadata", "image"])
+                if kind == "request":
+                    block = f"GET {url} HTTP/1.1\r\nHost: example\r\n\r\n".encode()
+                    _write_record(stream, WarcRecordType.request, url, date, block, "application/http; msgtype=request")
+                elif kind == "metadata":
+                    block = b"fetchTimeMs: 42\r\n"
+                    _write_record(stream, WarcRecordType.metadata, url, date, block, "application/warc-fields")
+                else:
+                    block = _http_response("image/jpeg", rng.getrandbits(8 * 2048).to_bytes(2048, "little"))
+                    url = f"https://images-{i % 97}.example/{i}.jpg"
+                    stats.responses += 1
+                    _write_record(
+                        stream, WarcRecordType.response, url, date, block, "application/http; msgtype=response"
+                    )
+                continue
+
+            if rng.random() < arguments.foreign_rate:
+                url = f"https://news-{i % 997}.example/article/{i}"
+            else:
+                stats.matching += 1
+
+            charset, declared = "utf-8", "utf-8"
+            if rng.random() < arguments.charset_rate:
+                charset = rng.choice(CHARSETS)
+                declared = rng.choice([charset, "", "utf-8"])
+            body = page.content.encode(charset, errors="xmlcharrefreplace")
+            content_type = f"text/html; charset={declared}" if declared else "text/html"
+            block = _http_response(content_type, body)
+            stats.responses += 1
+            _write_record(stream, WarcRecordType.response, url, date, block, "application/http; msgtype=response")
+    finally:
+        stream.close()
+    return stats
+
+
+def generate_warc_files(directory: Path, arguments: Namespace) -> WarcStats:
+    """Generates <arguments.files> WARC files and a warc.paths.gz index in the layout of the CC-NEWS server."""
+    rng = random.Random(arguments.seed)
+    pages = load_corpus()
+    month_path = Path("crawl-data", "CC-NEWS", MONTH.strftime("%Y/%m"))
+    (directory / month_path).mkdir(parents=True, exist_ok=True)
+
+    total = WarcStats()
+    warc_paths: List[str] = []
+    for i in tqdm(range(arguments.files), desc="generating WARC files", leave=False):
+        date = MONTH + timedelta(hours=i)
+        warc_path = month_path / f"CC-NEWS-{date.strftime('%Y%m%d%H%M%S')}-{i:05d}.warc.gz"
+        stats = write_warc(directory / warc_path, pages, arguments, rng, date)
+        total.records += stats.records
+        total.responses += stats.responses
+        total.matching += stats.matching
+        warc_paths.append(warc_path.as_posix())
+
+    (directory / month_path / "warc.paths.gz").write_bytes(gzip.compress("\n".join(warc_paths).encode()))
+    return total
+
+
+def serve(directory: str, ready: "multiprocessing.Queue[int]") -> None:
+    class Handler(SimpleHTTPRequestHandler):
+        def log_message(self, *args) -> None:
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), functools.partial(Handler, directory=directory))
+    server.daemon_threads = True
+    ready.put(server.server_address[1])
+    server.serve_forever()
+
+
+def _cpu_seconds() -> Tuple[float, float]:
+    times = os.times()
+    return times.user + times.system, times.children_user + times.children_system
+
+
+def benchmark_ccnews(
+    processes: int, server_address: str, publishers: List[Publisher], warc_stats: WarcStats
+) -> Dict[str, float]:
+    crawler = CCNewsCrawler(
+        *publishers,
+        start=MONTH,
+        end=MONTH + timedelta(days=27),
+        processes=processes,
+        disable_tqdm=True,
+        server_address=server_address,
+    )
+
+    articles = 0
+    main_start, children_start = _cpu_seconds()
+    start = time.perf_counter()
+    for _ in crawler.crawl(only_complete=False, only_unique=False, error_handling="suppress"):
+        articles += 1
+    seconds = time.perf_counter() - start
+    main_end, children_end = _cpu_seconds()
+
+    return {
+        "records": warc_stats.records,
+        "records_per_second": warc_stats.records / seconds if seconds else 0.0,
+        "articles": articles,
+        "articles_per_second": articles / seconds if seconds else 0.0,
+        "wall_seconds": seconds,
+        "cpu_seconds_main": main_end - main_start,
+        # includes the manager process relaying articles to the main process
+        "cpu_seconds_workers": children_end - children_start,
+        "decode_seconds": crawler.stats.get(Metric.DECODE_SECONDS),
+        "decoded_with_chardet": int(crawler.stats.get(Metric.DECODED_WITH_CHARDET)),
+        "parse_seconds": crawler.stats.get(Metric.PARSE_SECONDS),
+    }
+
+
+def parse_arguments() -> Namespace:
+    parser = ArgumentParser(
+        prog="benchmark_ccnews",
+        description=(
+            "generates WARC files resembling CC-NEWS from the parser test HTML, serves them from a local server "
+            "and crawls them with the CCNewsCrawler. reports WARC records and articles per second as well as the CPU "
+            "time of the main and the worker processes."
+        ),
+    )
+    warc = parser.add_argument_group("WARC files")
+    warc.add_argument("--files", type=int, default=2, help="number of WARC files. default: 2")
+    warc.add_argument("--records", type=int, default=500, help="records per WARC file. default: 500")
+    warc.add_argument(
+        "--foreign-rate",
+        type=float,
+        default=0.5,
+        help="fraction of HTML responses from domains of unsupported publishers. default: 0.5",
+    )
+    warc.add_argument(
+        "--non-html-rate",
+        type=float,
+        default=0.1,
+        help="fraction of request, metadata and non-HTML response records. default: 0.1",
+    )
+    warc.add_argument(
+        "--charset-rate",
+        type=float,
+        default=0.2,
+        help="fraction of HTML responses encoded with a legacy charset that is declared, missing or wrong. "
+        "default: 0.2",
+    )
+    warc.add_argument("--seed", type=int, default=0, help="seed for generating the WARC files. default: 0")
+    warc.add_argument(
+        "--warc-dir",
+        type=Path,
+        help="directory to write the WARC files to, e.g. to inspect them. defaults to a temporary directory",
+    )
+
+    parser.add_argument(
+        "--processes",
+        type=int,
+        nargs="+",
+        default=[0, 2],
+        help="run the CCNewsCrawler with each of these numbers of processes. default: 0 2",
+    )
+    add_baseline_arguments(parser)
+    return parser.parse_args()
+
+
+def main() -> None:
+    arguments = parse_arguments()
+    set_log_level(logging.ERROR)
+
+    tmp_dir: "Optional[tempfile.TemporaryDirectory[str]]" = None
+    if arguments.warc_dir is None:
+        tmp_dir = tempfile.TemporaryDirectory(prefix="fundus-ccnews-")
+        directory = Path(tmp_dir.name)
+    else:
+        directory = arguments.warc_dir
+
+    try:
+        warc_stats = generate_warc_files(directory, arguments)
+
+        # the server runs in its own process, so it does not add to the CPU time of the crawler
+        ready: "multiprocessing.Queue[int]" = multiprocessing.Queue()
+        server = multiprocessing.Process(target=serve, args=(str(directory), ready), daemon=True)
+        server.start()
+        try:
+            server_address = f"http://127.0.0.1:{ready.get(timeout=60)}/"
+            results: Results = {}
+            for processes in arguments.processes:
+                results[f"processes={processes}"] = benchmark_ccnews(
+                    processes, server_address, list(PublisherCollection), warc_stats
+                )
+        finally:
+            server.terminate()
+            server.join()
+    finally:
+        if tmp_dir is not None:
+            tmp_dir.cleanup()
+
+    sys.exit(report(arguments, results))
+
+
+if __name__ == "__main__":
+    main()
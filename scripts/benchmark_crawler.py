@@ -0,0 +1,273 @@
+import gzip
+import itertools
+import logging
+import multiprocessing
+import os
+import random
+import sys
+import time
+from argparse import ArgumentParser, Namespace
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+
+from fundus import AsyncCrawler, Crawler, RSSFeed, Sitemap
+from fundus.logging import set_log_level
+from fundus.parser import BaseParser, ParserProxy, attribute
+from fundus.publishers.base_objects import Publisher
+from fundus.scraping.crawler import CrawlerBase
+from fundus.scraping.stats import Metric
+from scripts.benchmark_utility import Results, add_baseline_arguments, report
+from tests.resources.parser.test_data import __module_path__ as test_resource_path
+
+Route = Tuple[str, bytes]
+
+
+@dataclass
+class ServerConfig:
+    publishers: int
+    articles: int
+    feed_size: int
+    sitemap_size: int
+    latency: float
+    error_rate: float
+    page_size: Optional[int]
+    seed: int
+
+
+def load_pages(page_size: Optional[int]) -> List[bytes]:
+    """Loads the bundled parser test HTML, optionally padded to at least <page_size> bytes."""
+    pages = [gzip.decompress(path.read_bytes()) for path in sorted(test_resource_path.glob("*/*.html.gz"))]
+    if page_size is not None:
+        pages = [page + b"<!--" + b"x" * max(0, page_size - len(page) - 7) + b"-->" for page in pages]
+    return pages
+
+
+def build_routes(config: ServerConfig, base_url: str) -> Dict[str, Route]:
+    """Builds robots.txt, an RSS feed, a nested sitemap index with gzipped children and articles per publisher.
+
+    Every publisher lives under its own path prefix /<publisher>/, so it gets its own robots.txt.
+    """
+    pages = itertools.cycle(load_pages(config.page_size))
+    routes: Dict[str, Route] = {}
+
+    def urlset(paths: List[str]) -> bytes:
+        return (
+            "<urlset>" + "".join(f"<url><loc>{base_url}{path}</loc></url>" for path in paths) + "</urlset>"
+        ).encode()
+
+    def sitemapindex(paths: List[str]) -> bytes:
+        return (
+            "<sitemapindex>"
+            + "".join(f"<sitemap><loc>{base_url}{path}</loc></sitemap>" for path in paths)
+            + "</sitemapindex>"
+        ).encode()
+
+    for publisher in range(config.publishers):
+        prefix = f"/publisher-{publisher}"
+        articles = [f"{prefix}/article/{i}" for i in range(config.articles)]
+        for path in articles:
+            routes[path] = ("text/html", next(pages))
+
+        routes[f"{prefix}/robots.txt"] = ("text/plain", b"User-agent: *\nDisallow: /private\n")
+        routes[f"{prefix}/feed.xml"] = (
+            "application/rss+xml",
+            (
+                "<rss><channel>"
+                + "".join(f"<item><link>{base_url}{path}</link></item>" for path in articles[: config.feed_size])
+                + "</channel></rss>"
+            ).encode(),
+        )
+
+        # sitemap.xml -> archive.xml -> sitemap-<i>.xml.gz
+        chunks = [articles[i : i + config.sitemap_size] for i in range(0, len(articles), config.sitemap_size)]
+        children = [f"{prefix}/sitemap-{i}.xml.gz" for i in range(len(chunks))]
+        for path, chunk in zip(children, chunks):
+            routes[path] = ("application/x-gzip", gzip.compress(urlset(chunk)))
+        routes[f"{prefix}/archive.xml"] = ("application/xml", sitemapindex(children))
+        routes[f"{prefix}/sitemap.xml"] = ("application/xml", sitemapindex([f"{prefix}/archive.xml"]))
+
+    return routes
+
+
+def serve(config: ServerConfig, ready: "multiprocessing.Queue[int]") -> None:
+    routes: Dict[str, Route] = {}
+    rng = random.Random(config.seed)
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, *args) -> None:
+            pass
+
+        def do_GET(self) -> None:
+            if config.latency:
+                time.sleep(config.latency)
+            if (route := routes.get(self.path)) is None:
+                status, content_type, body = 404, "text/plain", b""
+            elif "/article/" in self.path and rng.random() < config.error_rate:
+                status, content_type, body = 503, "text/plain", b""
+            else:
+                status, (content_type, body) = 200, route
+            self.send_response(status)
+            self.send_header("content-type", content_type)
+            self.send_header("content-length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    port = server.server_address[1]
+    routes.update(build_routes(config, f"http://127.0.0.1:{port}"))
+    ready.put(port)
+    server.serve_forever()
+
+
+class BenchmarkParserProxy(ParserProxy):
+    class V1(BaseParser):
+        @attribute
+        def title(self) -> Optional[str]:
+            return self.precomputed.meta.get("og:title") or self.precomputed.doc.findtext(".//title")
+
+        @attribute(validate=False)
+        def text(self) -> str:
+            return " ".join(self.precomputed.doc.xpath("//p//text()"))
+
+
+def build_publishers(config: ServerConfig, port: int) -> List[Publisher]:
+    publishers = []
+    for publisher in range(config.publishers):
+        domain = f"http://127.0.0.1:{port}/publisher-{publisher}/"
+        publishers.append(
+            Publisher(
+                name=f"publisher-{publisher}",
+                domain=domain,
+                parser=BenchmarkParserProxy,
+                sources=[RSSFeed(domain + "feed.xml"), Sitemap(domain + "sitemap.xml")],
+            )
+        )
+    return publishers
+
+
+def _cpu_seconds() -> float:
+    times = os.times()
+    return times.user + times.system + times.children_user + times.children_system
+
+
+def _peak_rss_kib() -> Optional[float]:
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # bytes on macOS, KiB everywhere else
+    return peak / 1024 if sys.platform == "darwin" else float(peak)
+
+
+def benchmark_crawler(arguments: Namespace, engine: str, publishers: List[Publisher]) -> Dict[str, float]:
+    crawler: CrawlerBase
+    if engine == "async":
+        crawler = AsyncCrawler(*publishers, delay=arguments.delay, max_in_flight_per_publisher=arguments.max_in_flight)
+    else:
+        crawler = Crawler(
+            *publishers,
+            delay=arguments.delay,
+            max_in_flight_per_publisher=arguments.max_in_flight,
+            parse_workers=arguments.parse_workers,
+        )
+
+    articles = 0
+    time_to_first_article = float("nan")
+    cpu_start = _cpu_seconds()
+    start = time.perf_counter()
+    for _ in crawler.crawl(only_complete=False, error_handling="suppress"):
+        if not articles:
+            time_to_first_article = time.perf_counter() - start
+        articles += 1
+    seconds = time.perf_counter() - start
+    cpu_seconds = _cpu_seconds() - cpu_start
+
+    result = {
+        "articles": articles,
+        "articles_per_second": articles / seconds if seconds else 0.0,
+        "time_to_first_article_seconds": time_to_first_article,
+        "wall_seconds": seconds,
+        "cpu_seconds": cpu_seconds,
+        "requests_failed": int(crawler.stats.get(Metric.REQUESTS_FAILED)),
+    }
+    if (peak_rss := _peak_rss_kib()) is not None:
+        result["peak_rss_kib"] = peak_rss
+    return result
+
+
+def parse_arguments() -> Namespace:
+    parser = ArgumentParser(
+        prog="benchmark_crawler",
+        description=(
+            "starts a local HTTP server standing in for publishers, serving robots.txt files, RSS feeds, nested and "
+            "gzipped sitemaps and articles built from the parser test HTML, and crawls it. reports articles per second, "
+            "time to first article, CPU time and peak memory of the crawling process."
+        ),
+    )
+    server = parser.add_argument_group("server")
+    server.add_argument("--publishers", type=int, default=4, help="number of publishers. default: 4")
+    server.add_argument("--articles", type=int, default=200, help="number of articles per publisher. default: 200")
+    server.add_argument("--feed-size", type=int, default=20, help="articles listed in each RSS feed. default: 20")
+    server.add_argument("--sitemap-size", type=int, default=50, help="articles per gzipped sitemap. default: 50")
+    server.add_argument("--latency", type=float, default=0.02, help="seconds to wait per response. default: 0.02")
+    server.add_argument(
+        "--error-rate", type=float, default=0.0, help="fraction of article requests answered with 503. default: 0.0"
+    )
+    server.add_argument("--page-size", type=int, help="pad article pages to at least this many bytes")
+    server.add_argument("--seed", type=int, default=0, help="seed for error injection. default: 0")
+
+    crawler = parser.add_argument_group("crawler")
+    crawler.add_argument(
+        "--engines",
+        nargs="+",
+        choices=["sync", "async"],
+        default=["sync"],
+        help="run the Crawler (sync) and/or the AsyncCrawler (async). default: sync",
+    )
+    crawler.add_argument("--delay", type=float, default=0.0, help="delay between requests. default: 0.0")
+    crawler.add_argument("--max-in-flight", type=int, default=1, help="max_in_flight_per_publisher. default: 1")
+    crawler.add_argument("--parse-workers", type=int, help="parse_workers of the Crawler")
+
+    add_baseline_arguments(parser)
+    return parser.parse_args()
+
+
+def main() -> None:
+    arguments = parse_arguments()
+    set_log_level(logging.ERROR)
+
+    config = ServerConfig(
+        publishers=arguments.publishers,
+        articles=arguments.articles,
+        feed_size=arguments.feed_size,
+        sitemap_size=arguments.sitemap_size,
+        latency=arguments.latency,
+        error_rate=arguments.error_rate,
+        page_size=arguments.page_size,
+        seed=arguments.seed,
+    )
+
+    # the server runs in its own process, so it does not add to the CPU time of the crawler
+    ready: "multiprocessing.Queue[int]" = multiprocessing.Queue()
+    server = multiprocessing.Process(target=serve, args=(config, ready), daemon=True)
+    server.start()
+    try:
+        port = ready.get(timeout=60)
+        results: Results = {}
+        for engine in arguments.engines:
+            # fresh publishers, so robots.txt files are requested again
+            results[engine] = benchmark_crawler(arguments, engine, build_publishers(config, port))
+    finally:
+        server.terminate()
+        server.join()
+
+    sys.exit(report(arguments, results))
+
+
+if __name__ == "__main__":
+    main()
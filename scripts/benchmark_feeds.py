@@ -0,0 +1,198 @@
+import gzip
+import itertools
+import logging
+import random
+import subprocess
+import sys
+from argparse import ArgumentParser, Namespace
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from pathlib import Path
+from typing import Callable, Iterator, List, Tuple
+
+from fundus import RSSFeed
+from fundus.logging import set_log_level
+from fundus.scraping.cache import CachedResponse
+from scripts.benchmark_utility import Measurement, Results, add_baseline_arguments, report
+from tests.resources.parser.test_data import __module_path__ as test_resource_path
+
+FORMATS = ["rss2", "atom", "rss1"]
+
+Feed = Tuple[str, bytes]
+
+
+def load_pages() -> List[str]:
+    """Loads the bundled parser test HTML, used as summaries and content of feed entries like publishers embed them."""
+    return [
+        gzip.decompress(path.read_bytes()).decode("utf-8", errors="replace")
+        for path in sorted(test_resource_path.glob("*/*.html.gz"))
+    ]
+
+
+def _cdata(text: str) -> str:
+    return "<![CDATA[" + text.replace("]]>", "]]]]><![CDATA[>") + "]]>"
+
+
+def build_entry(feed_format: str, i: int, date: datetime, page: str, content_size: int) -> str:
+    url = f"https://www.example.com/news/{date:%Y/%m/%d}/article-{i}.html?utm_source=rss&amp;utm_medium=feed"
+    content = _cdata(page[:content_size]) if content_size else ""
+    if feed_format == "atom":
+        return (
+            f"<entry><title>Article {i}</title><id>urn:uuid:{i:08d}</id>"
+            f'<link rel="alternate" type="text/html" href="{url}"/>'
+            f'<link rel="enclosure" type="image/jpeg" href="https://img.example.com/{i}.jpg"/>'
+            f"<published>{date.isoformat()}</published><updated>{date.isoformat()}</updated>"
+            f"<author><name>Author {i % 7}</name></author>"
+            + (f'<summary type="html">{content}</summary>' if content else "")
+            + "</entry>"
+        )
+    if feed_format == "rss1":
+        return (
+            f'<item rdf:about="{url}"><title>Article {i}</title><link>{url}</link>'
+            f"<dc:date>{date.isoformat()}</dc:date><dc:creator>Author {i % 7}</dc:creator>"
+            + (f"<description>{content}</description>" if content else "")
+            + "</item>"
+        )
+    return (
+        f"<item><title>Article {i}</title><link>{url}</link>"
+        f'<guid isPermaLink="false">article-{i}</guid><pubDate>{format_datetime(date)}</pubDate>'
+        f"<dc:creator>Author {i % 7}</dc:creator><category>Politics</category><category>World</category>"
+        + (f"<description>{content}</description><content:encoded>{content}</content:encoded>" if content else "")
+        + "</item>"
+    )
+
+
+def build_feed(feed_format: str, entries: List[str]) -> bytes:
+    if feed_format == "atom":
+        head = (
+            '<feed xmlns="http://www.w3.org/2005/Atom"><title>Example</title>'
+            '<link rel="alternate" href="https://www.example.com/"/><id>https://www.example.com/</id>'
+        )
+        tail = "</feed>"
+    elif feed_format == "rss1":
+        head = (
+            '<rdf:RDF xmlns:rdf="http://www.w3.org/1999/02/22-rdf-syntax-ns#" xmlns="http://purl.org/rss/1.0/" '
+            'xmlns:dc="http://purl.org/dc/elements/1.1/"><channel rdf:about="https://www.example.com/">'
+            "<title>Example</title><link>https://www.example.com/</link></channel>"
+        )
+        tail = "</rdf:RDF>"
+    else:
+        head = (
+            '<rss version="2.0" xmlns:content="http://purl.org/rss/1.0/modules/content/" '
+            'xmlns:dc="http://purl.org/dc/elements/1.1/" xmlns:atom="http://www.w3.org/2005/Atom"><channel>'
+            '<title>Example</title><link>https://www.example.com/</link><atom:link href="https://www.example.com/feed" '
+            'rel="self" type="application/rss+xml"/>'
+        )
+        tail = "</channel></rss>"
+    return ('<?xml version="1.0" encoding="UTF-8"?>\n' + head + "".join(entries) + tail).encode()
+
+
+def build_feeds(arguments: Namespace, feed_format: str) -> List[Feed]:
+    """Builds <arguments.feeds> feeds of <feed_format>, each listing <arguments.entries> entries."""
+    rng = random.Random(arguments.seed)
+    pages = load_pages()
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    feeds: List[Feed] = []
+    counter = itertools.count()
+    for f in range(arguments.feeds):
+        entries = []
+        for _ in range(arguments.entries):
+            i = next(counter)
+            date = start + timedelta(minutes=rng.randint(0, 60 * 24 * 30))
+            entries.append(build_entry(feed_format, i, date, rng.choice(pages), arguments.content_size))
+        feeds.append((f"{feed_format}-{f}", build_feed(feed_format, entries)))
+    return feeds
+
+
+def load_feed_files(paths: List[Path]) -> List[Feed]:
+    return [(path.name, path.read_bytes()) for path in paths]
+
+
+def measure(extract: Callable[[CachedResponse], Iterator[str]], feeds: List[Feed]) -> Tuple[Measurement, int]:
+    measurement = Measurement()
+    urls = 0
+    for _, content in feeds:
+        response = CachedResponse("https://www.example.com/feed", content, {"content-type": "application/rss+xml"})
+        with measurement.measure():
+            urls += sum(1 for _ in extract(response))
+    return measurement, urls
+
+
+def benchmark_feeds(name: str, feeds: List[Feed], strict: bool) -> Results:
+    source = RSSFeed("https://www.example.com/feed")
+
+    def feedparser(response: CachedResponse) -> Iterator[str]:
+        return source._extract_urls_with_feedparser(response.text)
+
+    # warm up both, so the import of feedparser is not measured
+    for extract in (source._extract_urls, feedparser):
+        list(extract(CachedResponse(source.url, feeds[0][1], {})))
+
+    mismatches = []
+    for feed_name, content in feeds:
+        response = CachedResponse(source.url, content, {})
+        if list(source._extract_urls(response)) != list(feedparser(response)):
+            mismatches.append(feed_name)
+    if mismatches and strict:
+        raise AssertionError(f"lxml extractor disagrees with feedparser on {len(mismatches)} feed(s): {mismatches}")
+
+    results: Results = {}
+    for label, extract in (("lxml", source._extract_urls), ("feedparser", feedparser)):
+        measurement, urls = measure(extract, feeds)
+        summary = measurement.summary("feeds")
+        summary["urls"] = urls
+        summary["urls_per_second"] = urls / measurement.seconds if measurement.seconds else 0.0
+        if label == "lxml":
+            summary["feeds_differing_from_feedparser"] = len(mismatches)
+        results[f"{label} ({name})"] = summary
+    return results
+
+
+def import_seconds(module: str) -> float:
+    """Measures the import time of <module> in a fresh interpreter."""
+    code = f"import time; start = time.perf_counter(); import {module}; print(time.perf_counter() - start)"
+    output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    return float(output.stdout)
+
+
+def parse_arguments() -> Namespace:
+    parser = ArgumentParser(
+        prog="benchmark_feeds",
+        description=(
+            "extracts the URLs of RSS 2.0, RSS 1.0 and Atom feeds built from the parser test HTML, once with the lxml "
+            "extractor of RSSFeed and once with feedparser. reports feeds and URLs per second and p50/p95 latency, "
+            "and fails if both disagree on a synthetic feed. pass --feed-files to benchmark feeds saved from real "
+            "publishers as well."
+        ),
+    )
+    parser.add_argument("--feeds", type=int, default=50, help="number of feeds per format. default: 50")
+    parser.add_argument("--entries", type=int, default=50, help="entries per feed. default: 50")
+    parser.add_argument(
+        "--content-size",
+        type=int,
+        default=4096,
+        help="characters of article HTML embedded in each entry, like publishers do in summaries. default: 4096",
+    )
+    parser.add_argument("--formats", nargs="+", choices=FORMATS, default=FORMATS, help="feed formats to benchmark")
+    parser.add_argument("--feed-files", type=Path, nargs="+", default=[], help="feeds saved from real publishers")
+    parser.add_argument("--seed", type=int, default=0, help="seed for generating the feeds. default: 0")
+    add_baseline_arguments(parser)
+    return parser.parse_args()
+
+
+def main() -> None:
+    arguments = parse_arguments()
+    set_log_level(logging.ERROR)
+
+    results: Results = {}
+    for feed_format in arguments.formats:
+        results.update(benchmark_feeds(feed_format, build_feeds(arguments, feed_format), strict=True))
+    if arguments.feed_files:
+        # real feeds may be malformed in ways the extractors recover from differently, so mismatches are only counted
+        results.update(benchmark_feeds("files", load_feed_files(arguments.feed_files), strict=False))
+    results["import"] = {"feedparser_import_ms": import_seconds("feedparser") * 1000}
+    sys.exit(report(arguments, results))
+
+
+if __name__ == "__main__":
+    main()
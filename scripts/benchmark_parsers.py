@@ -0,0 +1,72 @@
+import sys
+from argparse import ArgumentParser, Namespace
+from typing import List
+
+from tqdm import tqdm
+
+from fundus import PublisherCollection
+from fundus.publishers.base_objects import Publisher
+from scripts.benchmark_utility import Measurement, Results, add_baseline_arguments, report, trace_peak_memory
+from tests.utility import load_html_test_file_mapping
+
+
+def parse_arguments() -> Namespace:
+    parser = ArgumentParser(
+        prog="benchmark_parsers",
+        description=(
+            "replays the HTML test files of every publisher through the corresponding parser version and reports "
+            "parsed documents per second, p50/p95 parse latency and peak memory per publisher and overall."
+        ),
+    )
+    parser.add_argument("-p", dest="publishers", metavar="P", nargs="+", help="only consider given publishers")
+    parser.add_argument("-r", "--repeat", type=int, default=5, help="how often each document is parsed. default: 5")
+    parser.add_argument("--no-memory", action="store_true", help="skip the additional pass measuring peak memory")
+    add_baseline_arguments(parser)
+    return parser.parse_args()
+
+
+def benchmark_publisher(publisher: Publisher, repeat: int, trace_memory: bool) -> Measurement:
+    measurement = Measurement()
+    html_files = load_html_test_file_mapping(publisher).values()
+
+    for html_file in html_files:
+        parser = publisher.parser(html_file.crawl_date)
+        # warm up caches, e.g. compiled selectors
+        parser.parse(html_file.content, "suppress")
+        for _ in range(repeat):
+            with measurement.measure():
+                parser.parse(html_file.content, "suppress")
+
+    if trace_memory:
+        # tracing slows down parsing, so memory is measured in a separate pass
+        with trace_peak_memory() as peak:
+            for html_file in html_files:
+                publisher.parser(html_file.crawl_date).parse(html_file.content, "suppress")
+        measurement.peak_memory = peak[0]
+
+    return measurement
+
+
+def main() -> None:
+    arguments = parse_arguments()
+
+    publishers: List[Publisher] = (
+        list(PublisherCollection)
+        if arguments.publishers is None
+        else [PublisherCollection[name] for name in arguments.publishers]
+    )
+
+    results: Results = {}
+    overall = Measurement()
+    for publisher in tqdm(publishers, desc="benchmarking parsers"):
+        measurement = benchmark_publisher(publisher, arguments.repeat, not arguments.no_memory)
+        if measurement.latencies:
+            results[publisher.__name__] = measurement.summary()
+            overall.extend(measurement)
+    results["overall"] = overall.summary()
+
+    sys.exit(report(arguments, results))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+import random
+import sys
+from argparse import ArgumentParser, Namespace
+from typing import Callable, Dict, List
+
+from robots import RobotFileParser
+
+from fundus.publishers.base_objects import Robots
+from scripts.benchmark_utility import Measurement, Results, add_baseline_arguments, report
+
+SECTIONS = ["politics", "business", "sports", "culture", "science", "opinion", "video", "live", "amp", "print"]
+
+
+def build_robots_txt(rules: int, wildcards: bool, rng: random.Random) -> str:
+    """Builds a robots.txt with <rules> Allow and Disallow rules for all user agents, like large publishers use."""
+    lines = ["User-agent: *"]
+    for i in range(rules):
+        path = f"/{rng.choice(SECTIONS)}/{rng.choice(SECTIONS)}-{i}"
+        if wildcards and rng.random() < 0.3:
+            path = rng.choice([f"/*/{rng.choice(SECTIONS)}-{i}", f"/*.{rng.choice(['pdf', 'json', 'rss'])}$"])
+        lines.append(f"{rng.choice(['Allow', 'Disallow'])}: {path}")
+    return "\n".join(lines)
+
+
+def build_urls(n: int, rng: random.Random) -> List[str]:
+    """Builds <n> article URLs as listed in a sitemap, sharing section prefixes."""
+    return [
+        f"https://www.example.com/{rng.choice(SECTIONS)}/{rng.randint(2000, 2025)}/{rng.randint(1, 12):02d}/"
+        f"article-{i}-{rng.getrandbits(32):08x}.html"
+        for i in range(n)
+    ]
+
+
+def measure(can_fetch: Callable[[str, str], bool], urls: List[str]) -> Measurement:
+    measurement = Measurement()
+    for url in urls:
+        with measurement.measure():
+            can_fetch("fundus", url)
+    return measurement
+
+
+def benchmark_robots(arguments: Namespace, wildcards: bool) -> Dict[str, Dict[str, float]]:
+    rng = random.Random(arguments.seed)
+    content = build_robots_txt(arguments.rules, wildcards, rng)
+    urls = build_urls(arguments.urls, rng)
+
+    reference = RobotFileParser("https://www.example.com/robots.txt")
+    reference.parse(content.splitlines())
+    robots = Robots("https://www.example.com/robots.txt")
+    robots.robots_file_parser.parse(content.splitlines())
+    robots.ready = True
+
+    mismatches = sum(reference.can_fetch("fundus", url) != robots.can_fetch("fundus", url) for url in urls[:1000])
+    if mismatches:
+        raise AssertionError(f"Compiled matcher disagrees with robotspy on {mismatches} URL(s)")
+
+    # fresh instance, so the decision cache starts empty
+    robots = Robots("https://www.example.com/robots.txt")
+    robots.robots_file_parser.parse(content.splitlines())
+    robots.ready = True
+
+    name = "wildcards" if wildcards else "prefixes"
+    return {
+        f"robotspy ({name})": measure(reference.can_fetch, urls).summary("urls"),
+        f"compiled ({name})": measure(robots.can_fetch, urls).summary("urls"),
+    }
+
+
+def parse_arguments() -> Namespace:
+    parser = ArgumentParser(
+        prog="benchmark_robots",
+        description=(
+            "checks the URLs of a large synthetic sitemap against a synthetic robots.txt, once with robotspy and once "
+            "with the compiled matcher of Robots. reports URLs per second and p50/p95 latency, with and without "
+            "wildcard rules."
+        ),
+    )
+    parser.add_argument("--rules", type=int, default=200, help="number of rules in the robots.txt. default: 200")
+    parser.add_argument("--urls", type=int, default=100_000, help="number of URLs to check. default: 100000")
+    parser.add_argument("--seed", type=int, default=0, help="seed for generating rules and URLs. default: 0")
+    add_baseline_arguments(parser)
+    return parser.parse_args()
+
+
+def main() -> None:
+    arguments = parse_arguments()
+    results: Results = {}
+    for wildcards in (False, True):
+        results.update(benchmark_robots(arguments, wildcards))
+    sys.exit(report(arguments, results))
+
+
+if __name__ == "__main__":
+    main()
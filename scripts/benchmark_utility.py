@@ -0,0 +1,179 @@
+import json
+import math
+import platform
+import subprocess
+import time
+import tracemalloc
+from argparse import ArgumentParser, Namespace
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+
+Results = Dict[str, Dict[str, float]]
+
+
+def percentile(values: Sequence[float], q: float) -> float:
+    """Returns the <q>-th percentile of <values> using linear interpolation."""
+    if not values:
+        return math.nan
+    ordered = sorted(values)
+    position = (len(ordered) - 1) * q / 100
+    lower, upper = math.floor(position), math.ceil(position)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+@dataclass
+class Measurement:
+    """Latencies of individual operations, e.g. parsing a document, plus the wall time they took overall."""
+
+    latencies: List[float] = field(default_factory=list)
+    seconds: float = 0.0
+    peak_memory: Optional[int] = None
+
+    @contextmanager
+    def measure(self) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            latency = time.perf_counter() - start
+            self.latencies.append(latency)
+            self.seconds += latency
+
+    def extend(self, other: "Measurement") -> None:
+        self.latencies.extend(other.latencies)
+        self.seconds += other.seconds
+        if other.peak_memory is not None:
+            self.peak_memory = max(self.peak_memory or 0, other.peak_memory)
+
+    def summary(self, unit: str = "docs") -> Dict[str, float]:
+        summary = {
+            unit: len(self.latencies),
+            f"{unit}_per_second": len(self.latencies) / self.seconds if self.seconds else 0.0,
+            "p50_ms": percentile(self.latencies, 50) * 1000,
+            "p95_ms": percentile(self.latencies, 95) * 1000,
+        }
+        if self.peak_memory is not None:
+            summary["peak_memory_kib"] = self.peak_memory / 1024
+        return summary
+
+
+@contextmanager
+def trace_peak_memory() -> Iterator[List[int]]:
+    """Yields a list that holds the peak number of bytes allocated by Python within the context afterward.
+
+    Memory allocated by C extensions directly, e.g. lxml trees, is not traced.
+    """
+    result: List[int] = []
+    tracemalloc.start()
+    try:
+        yield result
+    finally:
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        result.append(peak)
+
+
+def add_baseline_arguments(parser: ArgumentParser) -> None:
+    parser.add_argument("-o", "--output", type=Path, help="write results as JSON to this path, e.g. to use as baseline")
+    parser.add_argument("-b", "--baseline", type=Path, help="compare results against this JSON baseline")
+    parser.add_argument(
+        "-t",
+        "--tolerance",
+        type=float,
+        default=0.1,
+        help="relative change of a metric tolerated before it is reported as regression. default: 0.1",
+    )
+
+
+def _current_commit() -> Optional[str]:
+    try:
+        output = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True)
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return output.stdout.strip()
+
+
+def write_results(path: Path, results: Results) -> None:
+    content: Dict[str, Any] = {
+        "meta": {
+            "created": datetime.now().isoformat(timespec="seconds"),
+            "commit": _current_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+        },
+        "results": results,
+    }
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump(content, file, indent=2)
+        file.write("\n")
+
+
+def load_results(path: Path) -> Results:
+    with open(path, "r", encoding="utf-8") as file:
+        results: Results = json.load(file)["results"]
+    return results
+
+
+def _higher_is_better(metric: str) -> Optional[bool]:
+    if metric.endswith("_per_second"):
+        return True
+    if metric.endswith(("_ms", "_kib", "_seconds")):
+        return False
+    # counts and other metrics are not compared
+    return None
+
+
+def compare(results: Results, baseline: Results, tolerance: float) -> List[str]:
+    """Returns a description of every metric that got worse than <baseline> by more than <tolerance>."""
+    regressions: List[str] = []
+    for name, metrics in results.items():
+        if (reference := baseline.get(name)) is None:
+            continue
+        for metric, value in metrics.items():
+            if (higher_is_better := _higher_is_better(metric)) is None or not reference.get(metric):
+                continue
+            change = (value - reference[metric]) / reference[metric]
+            if (-change if higher_is_better else change) > tolerance:
+                regressions.append(f"{name}: {metric} {reference[metric]:.2f} -> {value:.2f} ({change:+.1%})")
+    return regressions
+
+
+def _format(value: float) -> str:
+    return str(value) if isinstance(value, int) else f"{value:.2f}"
+
+
+def format_table(results: Results) -> str:
+    metrics = list(dict.fromkeys(metric for summary in results.values() for metric in summary))
+    rows = [["name", *metrics]]
+    for name, summary in results.items():
+        rows.append([name, *(_format(summary[metric]) if metric in summary else "-" for metric in metrics)])
+    widths = [max(len(row[column]) for row in rows) for column in range(len(rows[0]))]
+    return "\n".join(
+        "  ".join(
+            cell.ljust(width) if column == 0 else cell.rjust(width)
+            for column, (cell, width) in enumerate(zip(row, widths))
+        )
+        for row in rows
+    )
+
+
+def report(arguments: Namespace, results: Results) -> int:
+    """Prints <results>, writes and compares them according to <arguments>, and returns the exit code."""
+    print(format_table(results))
+
+    if arguments.output is not None:
+        write_results(arguments.output, results)
+        print(f"\nWrote results to {str(arguments.output)!r}")
+
+    if arguments.baseline is not None:
+        if regressions := compare(results, load_results(arguments.baseline), arguments.tolerance):
+            print(f"\nFound {len(regressions)} regression(s) compared to {str(arguments.baseline)!r}:")
+            print("\n".join(f"  {regression}" for regression in regressions))
+            return 1
+        print(f"\nNo regressions compared to {str(arguments.baseline)!r}")
+
+    return 0
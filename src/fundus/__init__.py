@@ -4,7 +4,7 @@ from langdetect import DetectorFactory
 
 from fundus.publishers import PublisherCollection
 from fundus.scraping.article import Article
-from fundus.scraping.crawler import CCNewsCrawler, Crawler, CrawlerBase
+from fundus.scraping.crawler import AsyncCrawler, CCNewsCrawler, Crawler, CrawlerBase
 from fundus.scraping.filter import Requires
 from fundus.scraping.url import NewsMap, RSSFeed, Sitemap
 
@@ -14,6 +14,7 @@ __development_base_path__ = __module_path__.parents[1]
 __all__ = [
     "CrawlerBase",
     "Crawler",
+    "AsyncCrawler",
     "CCNewsCrawler",
     "PublisherCollection",
     "Requires",
@@ -2,6 +2,7 @@ import functools
 import inspect
 import itertools
 import re
+import time
 from abc import ABC
 from copy import copy
 from dataclasses import dataclass, field
@@ -10,6 +11,7 @@ from typing import (
     Any,
     Callable,
     Collection,
+    ContextManager,
     Dict,
     Iterator,
     List,
@@ -27,6 +29,7 @@ import lxml.html
 
 from fundus.logging import create_logger
 from fundus.parser.data import LinkedDataMapping
+from fundus.parser.profiling import SETUP, ParseProfile, active_profiles, profile_parsing
 from fundus.parser.utility import get_ld_content, get_meta_content
 
 RegisteredFunctionT_co = TypeVar("RegisteredFunctionT_co", covariant=True, bound="RegisteredFunction")
@@ -279,39 +282,54 @@ class BaseParser(ABC):
         self.precomputed = Precomputed(html, doc, get_meta_content(doc), get_ld_content(doc))
 
     def parse(self, html: str, error_handling: Literal["suppress", "catch", "raise"] = "raise") -> Dict[str, Any]:
+        profiles = active_profiles(type(self))
+
         # wipe existing precomputed
+        start = time.perf_counter() if profiles else 0.0
         self._base_setup(html)
+        if profiles:
+            self._record(profiles, SETUP, start)
 
         parsed_data = {}
 
         for func in self._sorted_registered_functions:
             attribute_name = re.sub(r"^_{1,2}([^_]*_?)$", r"\g<1>", func.__name__)
+            start = time.perf_counter() if profiles else 0.0
+
+            try:
+                if isinstance(func, Function):
+                    func()
+
+                elif isinstance(func, Attribute):
+                    try:
+                        parsed_data[attribute_name] = func()
+                    except Exception as err:
+                        if error_handling == "suppress":
+                            parsed_data[attribute_name] = func.__default__
+                            logger.info(
+                                f"Couldn't parse attribute {attribute_name!r} for "
+                                f"{self.precomputed.meta.get('og:url')!r}: {err!r}"
+                            )
+                        elif error_handling == "catch":
+                            parsed_data[attribute_name] = err
+                        elif error_handling == "raise":
+                            raise err
+                        else:
+                            raise ValueError(f"Invalid value {error_handling!r} for parameter <error_handling>")
 
-            if isinstance(func, Function):
-                func()
-
-            elif isinstance(func, Attribute):
-                try:
-                    parsed_data[attribute_name] = func()
-                except Exception as err:
-                    if error_handling == "suppress":
-                        parsed_data[attribute_name] = func.__default__
-                        logger.info(
-                            f"Couldn't parse attribute {attribute_name!r} for "
-                            f"{self.precomputed.meta.get('og:url')!r}: {err!r}"
-                        )
-                    elif error_handling == "catch":
-                        parsed_data[attribute_name] = err
-                    elif error_handling == "raise":
-                        raise err
-                    else:
-                        raise ValueError(f"Invalid value {error_handling!r} for parameter <error_handling>")
-
-            else:
-                raise TypeError(f"Invalid type for {func}. Only subclasses of 'RegisteredFunction' are allowed")
+                else:
+                    raise TypeError(f"Invalid type for {func}. Only subclasses of 'RegisteredFunction' are allowed")
+            finally:
+                if profiles:
+                    self._record(profiles, func.__name__, start)
 
         return parsed_data
 
+    def _record(self, profiles: Tuple[ParseProfile, ...], name: str, start: float) -> None:
+        seconds = time.perf_counter() - start
+        for profile in profiles:
+            profile.record(type(self), name, seconds)
+
     def share(self, **kwargs):
         for key, value in kwargs.items():
             self.precomputed.cache[key] = value
@@ -384,6 +402,19 @@ class ParserProxy(ABC):
             mapping[validation_date] = _ParserCache(versioned_parser)
         self._parser_mapping = mapping
 
+    def profiling(self) -> ContextManager[ParseProfile]:
+        """Records the time spent in each attribute of this proxy's parser versions while the context is active.
+
+        Examples:
+            >>> with PublisherCollection.us.TheNewYorker.parser.profiling() as profile:
+            >>>     for article in Crawler(PublisherCollection.us.TheNewYorker).crawl(max_articles=50):
+            >>>         pass
+            >>> print(profile.table())
+
+        See profile_parsing() for details.
+        """
+        return profile_parsing(ParseProfile(parsers=[cache.factory for cache in self._parser_mapping.values()]))
+
     def __call__(self, crawl_date: Optional[Union[datetime, date]] = None) -> BaseParser:
         if crawl_date is None:
             return self._get_latest_cache()()
@@ -0,0 +1,156 @@
+import contextlib
+import threading
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Collection, Dict, Iterator, List, Literal, Optional, Tuple, Type
+
+if TYPE_CHECKING:
+    from fundus.parser.base_parser import BaseParser
+
+__all__ = ["ProfileEntry", "ParseProfile", "profile_parsing"]
+
+SETUP = "<setup>"
+
+
+def parser_version(parser: Type["BaseParser"]) -> str:
+    """Returns a readable name of <parser> including its proxy, e.g. 'TheGuardianParser.V1'."""
+    return parser.__qualname__.rpartition("<locals>.")[2]
+
+
+@dataclass
+class ProfileEntry:
+    parser: str
+    function: str
+    calls: int = 0
+    seconds: float = 0.0
+    max_seconds: float = 0.0
+
+    @property
+    def mean_seconds(self) -> float:
+        return self.seconds / self.calls if self.calls else 0.0
+
+
+class ParseProfile:
+    def __init__(self, parsers: Optional[Collection[Type["BaseParser"]]] = None):
+        """Wall time and call counts of registered functions, recorded per parser version.
+
+        Use profile_parsing() or ParserProxy.profiling() to record a profile. Besides attributes and
+        functions, the time spent preparing the document, i.e. parsing the HTML and extracting meta and
+        linked data, is recorded as '<setup>'.
+
+        Args:
+            parsers: Only record calls of these parser versions. If None, all parsers are recorded.
+                Defaults to None.
+        """
+        self.parsers = None if parsers is None else frozenset(parsers)
+        self._lock = threading.Lock()
+        self._entries: Dict[Tuple[str, str], ProfileEntry] = {}
+
+    def accepts(self, parser: Type["BaseParser"]) -> bool:
+        return self.parsers is None or parser in self.parsers
+
+    def record(self, parser: Type["BaseParser"], function: str, seconds: float) -> None:
+        key = (parser_version(parser), function)
+        with self._lock:
+            if (entry := self._entries.get(key)) is None:
+                entry = self._entries[key] = ProfileEntry(*key)
+            entry.calls += 1
+            entry.seconds += seconds
+            entry.max_seconds = max(entry.max_seconds, seconds)
+
+    def entries(self, by: Literal["parser", "function"] = "parser") -> List[ProfileEntry]:
+        """Returns the recorded entries, sorted by total time, most expensive first.
+
+        Args:
+            by: If "parser", entries are recorded per parser version and function. If "function", entries
+                of functions with the same name are summed up across parser versions, e.g. to find the
+                attributes that are most expensive overall. Defaults to "parser".
+        """
+        with self._lock:
+            entries = [ProfileEntry(**vars(entry)) for entry in self._entries.values()]
+
+        if by == "function":
+            merged: Dict[str, ProfileEntry] = defaultdict(lambda: ProfileEntry("*", ""))
+            for entry in entries:
+                total = merged[entry.function]
+                total.function = entry.function
+                total.calls += entry.calls
+                total.seconds += entry.seconds
+                total.max_seconds = max(total.max_seconds, entry.max_seconds)
+            entries = list(merged.values())
+        elif by != "parser":
+            raise ValueError(f"Invalid value {by!r} for parameter <by>")
+
+        return sorted(entries, key=lambda entry: entry.seconds, reverse=True)
+
+    def table(self, by: Literal["parser", "function"] = "parser", limit: Optional[int] = None) -> str:
+        """Renders the entries as a plain text table. See entries() for <by>."""
+        entries = self.entries(by)
+        total = sum(entry.seconds for entry in entries) or 1.0
+        rows = [("parser", "function", "calls", "total ms", "mean ms", "max ms", "share")]
+        rows.extend(
+            (
+                entry.parser,
+                entry.function,
+                str(entry.calls),
+                f"{entry.seconds * 1000:.2f}",
+                f"{entry.mean_seconds * 1000:.3f}",
+                f"{entry.max_seconds * 1000:.3f}",
+                f"{entry.seconds / total:.1%}",
+            )
+            for entry in entries[:limit]
+        )
+        widths = [max(len(row[column]) for row in rows) for column in range(len(rows[0]))]
+        return "\n".join(
+            "  ".join(
+                cell.ljust(width) if column < 2 else cell.rjust(width)
+                for column, (cell, width) in enumerate(zip(row, widths))
+            )
+            for row in rows
+        )
+
+    def reset(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __str__(self) -> str:
+        return self.table()
+
+
+_active_profiles: Tuple[ParseProfile, ...] = ()
+_active_profiles_lock = threading.Lock()
+
+
+def active_profiles(parser: Type["BaseParser"]) -> Tuple[ParseProfile, ...]:
+    """Returns the profiles currently recording calls of <parser>."""
+    if not _active_profiles:
+        return ()
+    return tuple(profile for profile in _active_profiles if profile.accepts(parser))
+
+
+@contextlib.contextmanager
+def profile_parsing(profile: Optional[ParseProfile] = None) -> Iterator[ParseProfile]:
+    """Records the time spent in each attribute while the context is active.
+
+    Profiling covers parsers called from any thread of the current process. Articles parsed in
+    worker processes, i.e. when crawling with <parse_workers>, are not recorded.
+
+    Examples:
+        >>> with profile_parsing() as profile:
+        >>>     for article in crawler.crawl(max_articles=100):
+        >>>         pass
+        >>> print(profile.table(limit=20))
+
+    Args:
+        profile: The profile to record to. If None, a new profile is created. Defaults to None.
+    """
+    global _active_profiles
+
+    profile = profile or ParseProfile()
+    with _active_profiles_lock:
+        _active_profiles = _active_profiles + (profile,)
+    try:
+        yield profile
+    finally:
+        with _active_profiles_lock:
+            _active_profiles = tuple(active for active in _active_profiles if active is not profile)
@@ -1,19 +1,29 @@
+import re
 from collections import defaultdict
+from concurrent.futures import Future, as_completed
+from functools import lru_cache
 from textwrap import indent
-from typing import Dict, Iterable, Iterator, List, Optional, Set, Type, Union
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple, Type, Union
 from warnings import warn
 
 import more_itertools
-from curl_cffi.requests import BrowserType, BrowserTypeLiteral
+from curl_cffi.requests import BrowserType, BrowserTypeLiteral, Response
 from curl_cffi.requests.exceptions import ConnectionError, HTTPError, Timeout
 from curl_cffi.requests.impersonate import normalize_browser_type
 from robots import RobotFileParser
+from robots.parser import Rule
 from typing_extensions import TypeAlias
 
 from fundus.logging import create_logger
 from fundus.parser.base_parser import ParserProxy
+from fundus.scraping.cache import CachedRobots, RobotsCache
 from fundus.scraping.filter import URLFilter
-from fundus.scraping.session import _default_header, session_handler
+from fundus.scraping.session import (
+    AsyncSessionHandler,
+    InterruptableSession,
+    _default_header,
+    session_handler,
+)
 from fundus.scraping.url import NewsMap, RSSFeed, Sitemap, URLSource
 from fundus.utils.iteration import iterate_all_subclasses
 
@@ -51,9 +61,25 @@ class CustomRobotFileParser(RobotFileParser):
         self.disallows_training: bool = False
         self.url = url
         self.impersonate = impersonate
+        # the raw robots.txt and the response it was read from, used for caching
+        self.content: Optional[str] = None
+        self.status_code: Optional[int] = None
+        self.response_headers: Dict[str, str] = {}
         super().__init__(url)
 
     # noinspection PyAttributeOutsideInit
+    def _handle_http_error(self, err: HTTPError) -> None:
+        self.status_code = err.response.status_code
+        self.response_headers = {key.lower(): value for key, value in err.response.headers.items() if value}
+        if err.response.status_code in (401, 403):
+            logger.warning(
+                f"Robots {self.url!r} disallowed access with status code {err.response.status_code}."
+                " Defaulting to disallow all."
+            )
+            self.disallow_all = True
+        elif 400 <= err.response.status_code < 500:
+            self.allow_all = True
+
     def read(self) -> None:
         """Reads the robots.txt URL and feeds it to the parser."""
         try:
@@ -61,18 +87,28 @@ class CustomRobotFileParser(RobotFileParser):
             session = session_handler.get_session(self.impersonate)
             response = session.get_with_interrupt(self.url, headers=self.headers)
         except HTTPError as err:
-            if err.response.status_code in (401, 403):
-                logger.warning(
-                    f"Robots {self.url!r} disallowed access with status code {err.response.status_code}."
-                    " Defaulting to disallow all."
-                )
-                self.disallow_all = True
-            elif 400 <= err.response.status_code < 500:
-                self.allow_all = True
+            self._handle_http_error(err)
         else:
-            self.parse(response.text.splitlines())
+            self._read_response(response)
+
+    async def read_async(self, session_handler: AsyncSessionHandler) -> None:
+        """Asynchronous counterpart of read() using a session of <session_handler>."""
+        try:
+            session = session_handler.get_session(self.impersonate)
+            response = await session.get_with_interrupt(self.url, headers=self.headers)
+        except HTTPError as err:
+            self._handle_http_error(err)
+        else:
+            self._read_response(response)
+
+    def _read_response(self, response: Response) -> None:
+        self.status_code = response.status_code
+        self.response_headers = {key.lower(): value for key, value in response.headers.items() if value}
+        self.parse(response.text.splitlines())
 
     def parse(self, lines: Iterable[str]) -> None:
+        lines = list(lines)
+        self.content = "\n".join(lines)
         for line in lines:
             if line.strip().startswith("#") and set(line.split(" ")) & self._disallow_training_keywords:
                 self.disallows_training = True
@@ -80,6 +116,57 @@ class CustomRobotFileParser(RobotFileParser):
         super().parse(lines)
 
 
+class _CompiledRules:
+    def __init__(self, rules: List[Rule], cache_size: int = 4096) -> None:
+        """The rules of a robots.txt group compiled into a single regular expression.
+
+        robotspy checks the rules one after another, longest first, and the first matching rule
+        decides. The rules are joined into one alternation in the same order, so the first
+        alternative matching at the start of the path decides the same way. Decisions are cached
+        per path, or only per path prefix as long as the rules contain no wildcards, since then
+        no part of the path beyond the longest rule affects the decision.
+        """
+        self.allowed = [rule.allowed for rule in rules]
+        self.pattern = re.compile(
+            "|".join(f"(?P<r{i}>{self._translate(rule.path)})" for i, rule in enumerate(rules)), re.DOTALL
+        )
+        if any("*" in rule.path or "$" in rule.path for rule in rules):
+            self.prefix_length: Optional[int] = None
+        else:
+            self.prefix_length = max((len(rule.path) for rule in rules), default=0)
+        self._decide = lru_cache(maxsize=cache_size)(self._match)
+
+    @staticmethod
+    def _translate(path: str) -> str:
+        # see RobotsParser.can_fetch() for the matching rules reproduced here
+        if path == "*":
+            return ""
+        alternatives = [re.escape(path)]
+        if path.endswith("$"):
+            alternatives.append(re.escape(path[:-1]) + r"\Z")
+        if "*" in path:
+            pattern = path[:-1] if path.endswith("$") else path
+            wildcard = ".*".join(re.escape(part) for part in pattern.split("*"))
+            alternatives.append(wildcard + r"\Z" if path.endswith("$") else wildcard)
+        return "|".join(f"(?:{alternative})" for alternative in alternatives)
+
+    def _match(self, path: str) -> bool:
+        if (match := self.pattern.match(path)) is None or match.lastgroup is None:
+            return True
+        return self.allowed[int(match.lastgroup[1:])]
+
+    def can_fetch(self, path: str) -> bool:
+        return self._decide(path if self.prefix_length is None else path[: self.prefix_length])
+
+    @classmethod
+    def supports(cls, rules: List[Rule]) -> bool:
+        # robotspy matches wildcard rules with fnmatch, which gives brackets and, for rules ending with $,
+        # question marks a meaning as well
+        return not any(
+            "*" in rule.path and ("[" in rule.path or (rule.path.endswith("$") and "?" in rule.path)) for rule in rules
+        )
+
+
 class Robots:
     def __init__(
         self, url: str, headers: Optional[Dict[str, str]] = None, impersonate: Optional[BrowserTypeLiteral] = None
@@ -87,6 +174,7 @@ class Robots:
         self.url = url
         self.robots_file_parser = CustomRobotFileParser(url, headers=headers, impersonate=impersonate)
         self.ready: bool = False
+        self._compiled_rules: Dict[str, Optional[_CompiledRules]] = {}
 
     def _read(self) -> None:
         try:
@@ -101,9 +189,65 @@ class Robots:
         if not self.ready:
             self._read()
 
+    def _load(self, cache: RobotsCache) -> bool:
+        """Reads the robots.txt from <cache>.
+
+        Returns:
+            True if <cache> held an entry that did not expire yet.
+        """
+        if (cached := cache.get(self.url)) is None:
+            return False
+        parser = self.robots_file_parser
+        if cached.content is not None:
+            parser.parse(cached.content.splitlines())
+        # keep flags set by the publisher, e.g. to suppress robots
+        parser.allow_all = parser.allow_all or cached.allow_all
+        parser.disallow_all = parser.disallow_all or cached.disallow_all
+        self.ready = True
+        return True
+
+    def _store(self, cache: RobotsCache) -> None:
+        parser = self.robots_file_parser
+        # server errors are transient, so they are not worth remembering
+        if parser.status_code is None or parser.status_code >= 500:
+            return
+        if parser.content is not None:
+            cached = CachedRobots(parser.content, False, False)
+        else:
+            cached = CachedRobots(None, parser.allow_all, parser.disallow_all)
+        cache.store(self.url, cached, parser.response_headers)
+
+    async def ensure_ready_async(self, session_handler: AsyncSessionHandler) -> None:
+        """Asynchronous counterpart of ensure_ready() used by the async crawl engine."""
+        if not self.ready:
+            try:
+                await self.robots_file_parser.read_async(session_handler)
+            except (ConnectionError, Timeout):
+                logger.warning(f"Could not load robots {self.url!r}. Ignoring robots and continuing.")
+                self.robots_file_parser.allow_all = True
+            self.ready = True
+
+    def _compile(self, useragent: str) -> Optional[_CompiledRules]:
+        if (compiled := self._compiled_rules.get(useragent)) is None and useragent not in self._compiled_rules:
+            rules = self.robots_file_parser.find_rules(useragent)
+            compiled = _CompiledRules(rules) if _CompiledRules.supports(rules) else None
+            self._compiled_rules[useragent] = compiled
+        return compiled
+
     def can_fetch(self, useragent: str, url: str) -> bool:
         self.ensure_ready()
-        return self.robots_file_parser.can_fetch(useragent, url)
+        parser = self.robots_file_parser
+        if parser.allow_all:
+            return True
+        if parser.disallow_all:
+            return False
+        if (compiled := self._compile(useragent)) is None:
+            return parser.can_fetch(useragent, url)
+
+        host, path = RobotFileParser.normalize_url(url)
+        if host and parser.host and host != parser.host:
+            return False
+        return compiled.can_fetch(path)
 
     def crawl_delay(self, useragent: str) -> Optional[float]:
         self.ensure_ready()
@@ -119,6 +263,63 @@ class Robots:
         return self.robots_file_parser.disallow_all
 
 
+def prefetch_robots(robots: Iterable[Robots], cache: Optional[RobotsCache] = None) -> None:
+    """Reads all robots.txt files of <robots> that are not ready yet concurrently.
+
+    Entries of <cache> are used if they didn't expire, all other robots.txt files are requested at
+    once, each URL only once per impersonate profile, and stored in <cache> afterward.
+
+    Args:
+        robots: The robots.txt files to read.
+        cache: If set, robots.txt files are read from and stored in this cache. Defaults to None.
+    """
+    pending = [r for r in {id(r): r for r in robots}.values() if not r.ready]
+    if cache is not None:
+        pending = [r for r in pending if not r._load(cache)]
+    if not pending:
+        return
+
+    grouped: Dict[Tuple[str, Optional[BrowserTypeLiteral]], List[Robots]] = defaultdict(list)
+    for r in pending:
+        grouped[(r.url, r.robots_file_parser.impersonate)].append(r)
+
+    logger.debug(f"Prefetching {len(grouped)} robots.txt file(s)")
+    sessions: Dict[Optional[BrowserTypeLiteral], InterruptableSession] = {}
+    futures: Dict["Future[Response]", List[Robots]] = {}
+    try:
+        for (url, impersonate), group in grouped.items():
+            if (session := sessions.get(impersonate)) is None:
+                session = sessions[impersonate] = session_handler.create_session(impersonate)
+            futures[session.submit(url, headers=group[0].robots_file_parser.headers)] = group
+
+        for future in as_completed(futures):
+            group = futures[future]
+            try:
+                response = future.result()
+            except HTTPError as err:
+                for r in group:
+                    r.robots_file_parser._handle_http_error(err)
+            except (ConnectionError, Timeout):
+                logger.warning(f"Could not load robots {group[0].url!r}. Ignoring robots and continuing.")
+                for r in group:
+                    r.robots_file_parser.allow_all = True
+                    r.ready = True
+                continue
+            else:
+                for r in group:
+                    r.robots_file_parser._read_response(response)
+
+            for r in group:
+                r.ready = True
+            if cache is not None:
+                group[0]._store(cache)
+    finally:
+        for future in futures:
+            future.cancel()
+        for session in sessions.values():
+            session.close()
+
+
 class Publisher:
     __name__: str
     __group__: "PublisherGroup"
@@ -0,0 +1,358 @@
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+import zlib
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+from typing import Dict, Mapping, NamedTuple, Optional, Union
+
+from curl_cffi.requests import Headers, Response
+
+from fundus.logging import create_logger
+from fundus.scraping.encoding import decode
+
+logger = create_logger(__name__)
+
+
+class CachedResponse:
+    def __init__(self, url: str, content: bytes, headers: Dict[str, str]):
+        """A locally stored copy of a response, served in place of a 304 Not Modified response."""
+        self.url = url
+        self.content = content
+        self.headers = headers
+        self.status_code = 200
+
+    @property
+    def text(self) -> str:
+        return decode(self.content, self.headers.get("content-type")).text
+
+    @property
+    def validators(self) -> Dict[str, str]:
+        """Request headers asking the server to only send the resource again if it changed."""
+        validators = {}
+        if etag := self.headers.get("etag"):
+            validators["If-None-Match"] = etag
+        if last_modified := self.headers.get("last-modified"):
+            validators["If-Modified-Since"] = last_modified
+        return validators
+
+
+class SourceCache:
+    def __init__(self, cache_dir: Union[str, Path]):
+        """HTTP validators and copies of sitemaps, news maps and RSS feeds for conditional requests.
+
+        Responses carrying an ETag or Last-Modified header are stored per URL in a SQLite database
+        <cache_dir>/sources.sqlite. When the URL is requested again, the validators are sent along,
+        and if the server answers with 304 Not Modified, the stored copy is used instead of
+        downloading the source again. The cache is safe to use from multiple threads.
+
+        Args:
+            cache_dir: The directory to store the cache in. Will be created if it does not exist.
+        """
+        self.path = Path(cache_dir) / "sources.sqlite"
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+        self.hits = 0
+        self.misses = 0
+
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(self.path, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS sources ("
+            "url TEXT PRIMARY KEY, etag TEXT, last_modified TEXT, content_type TEXT, content BLOB NOT NULL"
+            ") WITHOUT ROWID"
+        )
+        self._connection.commit()
+
+    def get(self, url: str) -> Optional[CachedResponse]:
+        """Returns the stored copy of <url> or None if there is none."""
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT etag, last_modified, content_type, content FROM sources WHERE url = ?", (url,)
+            ).fetchone()
+        if row is None:
+            return None
+        etag, last_modified, content_type, content = row
+        headers = {
+            key: value
+            for key, value in (("etag", etag), ("last-modified", last_modified), ("content-type", content_type))
+            if value is not None
+        }
+        return CachedResponse(url, content, headers)
+
+    def revalidate(
+        self, url: str, response: Response, cached: Optional[CachedResponse]
+    ) -> Union[Response, CachedResponse]:
+        """Returns <cached> if <response> is 304 Not Modified, otherwise stores and returns <response>.
+
+        Args:
+            url: The requested URL.
+            response: The response to a request sending the validators of <cached>.
+            cached: The copy of <url> returned by get() before the request.
+        """
+        if response.status_code == 304 and cached is not None:
+            logger.debug(f"Source {url!r} not modified, using stored copy")
+            with self._lock:
+                self.hits += 1
+            return cached
+
+        with self._lock:
+            self.misses += 1
+        self.store(url, response)
+        return response
+
+    def store(self, url: str, response: Response) -> None:
+        """Stores <response> for <url> if it carries validators, otherwise drops a previously stored copy."""
+        etag, last_modified = response.headers.get("etag"), response.headers.get("last-modified")
+        with self._lock, self._connection:
+            if etag is None and last_modified is None:
+                self._connection.execute("DELETE FROM sources WHERE url = ?", (url,))
+            else:
+                self._connection.execute(
+                    "INSERT OR REPLACE INTO sources VALUES (?, ?, ?, ?, ?)",
+                    (url, etag, last_modified, response.headers.get("content-type"), response.content),
+                )
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
+        logger.debug(f"Closed source cache at {str(self.path)!r} ({self.hits} hits, {self.misses} misses)")
+
+    def __enter__(self) -> "SourceCache":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+
+def _max_age(headers: Mapping[str, str]) -> Optional[float]:
+    """Returns the number of seconds <headers> allow a response to be cached for or None if they don't say."""
+    if cache_control := headers.get("cache-control"):
+        directives = [directive.strip().lower() for directive in cache_control.split(",")]
+        if "no-store" in directives or "no-cache" in directives:
+            return 0.0
+        for directive in directives:
+            if directive.startswith("max-age="):
+                try:
+                    return max(0.0, float(directive[len("max-age=") :]))
+                except ValueError:
+                    pass
+    if expires := headers.get("expires"):
+        try:
+            return max(0.0, parsedate_to_datetime(expires).timestamp() - time.time())
+        except (TypeError, ValueError):
+            return 0.0
+    return None
+
+
+class CachedRobots(NamedTuple):
+    # None if the robots.txt could not be read and <allow_all> or <disallow_all> was derived from the status
+    content: Optional[str]
+    allow_all: bool
+    disallow_all: bool
+
+
+class RobotsCache:
+    def __init__(self, cache_dir: Union[str, Path], ttl: float = 24 * 60 * 60) -> None:
+        """Parsed robots.txt files of publishers, reused across crawls and processes until they expire.
+
+        Entries are stored per robots.txt URL in a SQLite database <cache_dir>/robots.sqlite. An entry
+        expires after the time given by the Cache-Control max-age or Expires header of its response,
+        or after <ttl> seconds if there is none. Responses that must not be cached aren't stored. The
+        cache is safe to use from multiple threads and processes.
+
+        Args:
+            cache_dir: The directory to store the cache in. Will be created if it does not exist.
+            ttl: Number of seconds an entry is used if its response did not say. Defaults to 24 hours.
+        """
+        self.path = Path(cache_dir) / "robots.sqlite"
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.ttl = ttl
+
+        self.hits = 0
+        self.misses = 0
+
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(self.path, check_same_thread=False, timeout=30)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        with self._connection:
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS robots ("
+                "url TEXT PRIMARY KEY, content TEXT, allow_all INTEGER NOT NULL, disallow_all INTEGER NOT NULL, "
+                "expires REAL NOT NULL) WITHOUT ROWID"
+            )
+
+    def get(self, url: str) -> Optional[CachedRobots]:
+        """Returns the stored robots.txt <url> or None if there is none or it expired."""
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT content, allow_all, disallow_all, expires FROM robots WHERE url = ?", (url,)
+            ).fetchone()
+            if row is None or row[3] < time.time():
+                self.misses += 1
+                return None
+            self.hits += 1
+        content, allow_all, disallow_all, _ = row
+        return CachedRobots(content, bool(allow_all), bool(disallow_all))
+
+    def store(self, url: str, robots: CachedRobots, headers: Optional[Mapping[str, str]] = None) -> None:
+        """Stores <robots> for <url> for as long as the response <headers> allow."""
+        max_age = _max_age(headers or {})
+        if max_age is None:
+            max_age = self.ttl
+        with self._lock, self._connection:
+            if max_age <= 0:
+                self._connection.execute("DELETE FROM robots WHERE url = ?", (url,))
+            else:
+                self._connection.execute(
+                    "INSERT OR REPLACE INTO robots VALUES (?, ?, ?, ?, ?)",
+                    (url, robots.content, robots.allow_all, robots.disallow_all, time.time() + max_age),
+                )
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
+        logger.debug(f"Closed robots cache at {str(self.path)!r} ({self.hits} hits, {self.misses} misses)")
+
+    def __enter__(self) -> "RobotsCache":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+
+class ResponseCache:
+    def __init__(
+        self, cache_dir: Union[str, Path], ttl: Optional[float] = None, max_size: Optional[int] = 2**30
+    ) -> None:
+        """Successful responses stored on disk, so repeated crawls don't download them again.
+
+        Responses are stored per requested URL in a SQLite database <cache_dir>/responses.sqlite.
+        Bodies are compressed and stored once per content hash, so URLs serving identical content
+        share their storage. The cache is safe to use from multiple threads.
+
+        Args:
+            cache_dir: The directory to store the cache in. Will be created if it does not exist.
+            ttl: Number of seconds a response is served from the cache. Older responses are
+                downloaded again. If None, responses never expire. Defaults to None.
+            max_size: Maximum number of bytes of compressed bodies. Once exceeded, the least
+                recently used responses are evicted. If None, the cache grows unbounded.
+                Defaults to 1 GiB.
+        """
+        self.path = Path(cache_dir) / "responses.sqlite"
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.ttl = ttl
+        self.max_size = max_size
+
+        self.hits = 0
+        self.misses = 0
+
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(self.path, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        with self._connection:
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS bodies (digest TEXT PRIMARY KEY, content BLOB NOT NULL, size INTEGER NOT NULL)"
+                " WITHOUT ROWID"
+            )
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "url TEXT PRIMARY KEY, final_url TEXT NOT NULL, status INTEGER NOT NULL, headers TEXT NOT NULL, "
+                "digest TEXT NOT NULL, stored REAL NOT NULL, accessed REAL NOT NULL) WITHOUT ROWID"
+            )
+            self._connection.execute("CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed)")
+            self._connection.execute("CREATE INDEX IF NOT EXISTS responses_digest ON responses (digest)")
+        self._size: int = self._connection.execute("SELECT COALESCE(SUM(size), 0) FROM bodies").fetchone()[0]
+
+    @property
+    def size(self) -> int:
+        """The number of bytes of compressed bodies currently stored."""
+        return self._size
+
+    def get(self, url: str) -> Optional[Response]:
+        """Returns the stored response to <url> or None if there is none or it expired."""
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT r.final_url, r.status, r.headers, r.stored, b.content FROM responses r "
+                "JOIN bodies b ON b.digest = r.digest WHERE r.url = ?",
+                (url,),
+            ).fetchone()
+            if row is None or (self.ttl is not None and time.time() - row[3] > self.ttl):
+                self.misses += 1
+                return None
+            with self._connection:
+                self._connection.execute("UPDATE responses SET accessed = ? WHERE url = ?", (time.time(), url))
+            self.hits += 1
+
+        final_url, status, headers, _, content = row
+        response = Response()
+        response.url = final_url
+        response.status_code = status
+        response.headers = Headers(json.loads(headers))
+        response.content = zlib.decompress(content)
+        object.__setattr__(response, "_history", [])
+        return response
+
+    def store(self, url: str, response: Response) -> None:
+        """Stores <response> as the response to <url>, evicting old responses if the cache grows too large."""
+        content = response.content
+        digest = hashlib.sha256(content).hexdigest()
+        headers = json.dumps(dict(response.headers.items()))
+        compressed: Optional[bytes] = None
+
+        with self._lock:
+            if self._connection.execute("SELECT 1 FROM bodies WHERE digest = ?", (digest,)).fetchone() is None:
+                compressed = zlib.compress(content)
+            now = time.time()
+            with self._connection:
+                previous = self._connection.execute("SELECT digest FROM responses WHERE url = ?", (url,)).fetchone()
+                if compressed is not None:
+                    self._connection.execute(
+                        "INSERT INTO bodies VALUES (?, ?, ?)", (digest, compressed, len(compressed))
+                    )
+                    self._size += len(compressed)
+                self._connection.execute(
+                    "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (url, str(response.url), response.status_code, headers, digest, now, now),
+                )
+                if previous is not None and previous[0] != digest:
+                    self._drop_unused_body(previous[0])
+                if self.max_size is not None and self._size > self.max_size:
+                    self._evict(self.max_size)
+
+    def _drop_unused_body(self, digest: str) -> None:
+        # should only be called while holding the lock
+        if self._connection.execute("SELECT 1 FROM responses WHERE digest = ? LIMIT 1", (digest,)).fetchone():
+            return
+        if row := self._connection.execute("SELECT size FROM bodies WHERE digest = ?", (digest,)).fetchone():
+            self._connection.execute("DELETE FROM bodies WHERE digest = ?", (digest,))
+            self._size -= row[0]
+
+    def _evict(self, max_size: int) -> None:
+        # should only be called while holding the lock
+        while self._size > max_size:
+            oldest = self._connection.execute(
+                "SELECT url, digest FROM responses ORDER BY accessed LIMIT 100"
+            ).fetchall()
+            if not oldest:
+                break
+            for url, digest in oldest:
+                self._connection.execute("DELETE FROM responses WHERE url = ?", (url,))
+                self._drop_unused_body(digest)
+                logger.debug(f"Evicted {url!r} from response cache")
+                if self._size <= max_size:
+                    break
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
+        logger.debug(f"Closed response cache at {str(self.path)!r} ({self.hits} hits, {self.misses} misses)")
+
+    def __enter__(self) -> "ResponseCache":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
@@ -0,0 +1,113 @@
+import sqlite3
+import threading
+import time
+from enum import IntEnum
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+
+from fundus.logging import create_logger
+
+logger = create_logger(__name__)
+
+
+class URLStatus(IntEnum):
+    SEEN = 0
+    FETCHED = 1
+    FAILED = 2
+
+
+class Checkpoint:
+    def __init__(self, state_dir: Union[str, Path], flush_every: int = 100, flush_interval: float = 5.0):
+        """Persistent per-publisher record of seen, fetched and failed URLs.
+
+        URLs are stored in a SQLite database <state_dir>/checkpoint.sqlite. A URL is marked as seen
+        right before it is requested, as failed if the request failed and as fetched once the resulting
+        article was handed to the caller or dropped by a filter. Only fetched URLs are skipped when the
+        crawl is restarted with the same <state_dir>. URLs that were only seen, e.g. because the crawl was
+        interrupted before their article was consumed, and failed URLs, e.g. because of a timeout or a
+        server error, are retried.
+
+        Writes are buffered and flushed every <flush_every> writes or <flush_interval> seconds,
+        whichever comes first, and when the checkpoint is closed. The checkpoint is safe to use
+        from multiple threads.
+
+        Args:
+            state_dir: The directory to store the checkpoint in. Will be created if it does not exist.
+            flush_every: Maximum number of buffered writes. Defaults to 100.
+            flush_interval: Maximum number of seconds writes are buffered. Defaults to 5.0.
+        """
+        self.path = Path(state_dir) / "checkpoint.sqlite"
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+        self.flush_every = flush_every
+        self.flush_interval = flush_interval
+
+        self._lock = threading.Lock()
+        self._buffer: Dict[Tuple[str, str], URLStatus] = {}
+        self._last_flush = time.monotonic()
+
+        self._connection = sqlite3.connect(self.path, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS urls ("
+            "publisher TEXT NOT NULL, url TEXT NOT NULL, status INTEGER NOT NULL, "
+            "PRIMARY KEY (publisher, url)) WITHOUT ROWID"
+        )
+        self._connection.commit()
+
+    def status(self, publisher: str, url: str) -> Optional[URLStatus]:
+        """Returns the recorded status of <url> for <publisher> or None if <url> was never seen."""
+        with self._lock:
+            if (status := self._buffer.get((publisher, url))) is not None:
+                return status
+            row = self._connection.execute(
+                "SELECT status FROM urls WHERE publisher = ? AND url = ?", (publisher, url)
+            ).fetchone()
+        return None if row is None else URLStatus(row[0])
+
+    def is_done(self, publisher: str, url: str) -> bool:
+        """Returns True if <url> was already fetched for <publisher>."""
+        return self.status(publisher, url) == URLStatus.FETCHED
+
+    def mark(self, publisher: str, url: str, status: URLStatus) -> None:
+        with self._lock:
+            self._buffer[(publisher, url)] = status
+            if len(self._buffer) >= self.flush_every or time.monotonic() - self._last_flush >= self.flush_interval:
+                self._flush()
+
+    def count(self, publisher: str, status: URLStatus) -> int:
+        """Returns the number of URLs of <publisher> with <status>."""
+        with self._lock:
+            self._flush()
+            row = self._connection.execute(
+                "SELECT COUNT(*) FROM urls WHERE publisher = ? AND status = ?", (publisher, int(status))
+            ).fetchone()
+        return int(row[0])
+
+    def _flush(self) -> None:
+        # should only be called while holding the lock
+        if self._buffer:
+            rows: List[Tuple[str, str, int]] = [
+                (publisher, url, int(status)) for (publisher, url), status in self._buffer.items()
+            ]
+            with self._connection:
+                self._connection.executemany("INSERT OR REPLACE INTO urls VALUES (?, ?, ?)", rows)
+            self._buffer.clear()
+        self._last_flush = time.monotonic()
+
+    def flush(self) -> None:
+        """Writes all buffered records to disk."""
+        with self._lock:
+            self._flush()
+
+    def close(self) -> None:
+        with self._lock:
+            self._flush()
+            self._connection.close()
+        logger.debug(f"Closed checkpoint at {str(self.path)!r}")
+
+    def __enter__(self) -> "Checkpoint":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import asyncio
 import contextlib
 import gzip
 import json
@@ -12,27 +13,29 @@ import time
 import traceback
 from abc import ABC, abstractmethod
 from collections import defaultdict
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from datetime import datetime
+from concurrent.futures import Executor, ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
 from functools import lru_cache, partial, wraps
 from multiprocessing import Manager
 from multiprocessing.context import TimeoutError
 from multiprocessing.managers import BaseManager
-from multiprocessing.pool import MapResult, Pool, ThreadPool
+from multiprocessing.pool import ApplyResult, Pool, ThreadPool
 from pathlib import Path
 from queue import Empty, Full, Queue
 from threading import current_thread
 from typing import (
     Any,
+    AsyncIterator,
     Callable,
     Dict,
+    Generator,
     Generic,
+    Iterable,
     Iterator,
     List,
     Literal,
     Optional,
     Pattern,
-    Set,
     Tuple,
     Type,
     TypeVar,
@@ -52,15 +55,21 @@ from typing_extensions import ParamSpec, TypeAlias
 
 from fundus.logging import create_logger, get_current_config
 from fundus.parser.data import remove_query_parameters_from_url
-from fundus.publishers.base_objects import FilteredPublisher, Publisher, PublisherGroup
+from fundus.publishers.base_objects import FilteredPublisher, Publisher, PublisherGroup, prefetch_robots
 from fundus.scraping.article import Article
+from fundus.scraping.cache import RobotsCache, SourceCache
+from fundus.scraping.checkpoint import Checkpoint, URLStatus
+from fundus.scraping.dedup import InMemoryDeduplicator, URLDeduplicator
 from fundus.scraping.delay import Delay
-from fundus.scraping.filter import ExtractionFilter, Requires, RequiresAll, URLFilter
-from fundus.scraping.html import CCNewsSource
-from fundus.scraping.scraper import CCNewsScraper, WebScraper
-from fundus.scraping.session import CrashThread, session_handler
+from fundus.scraping.filter import DateWindow, ExtractionFilter, Requires, RequiresAll, URLFilter
+from fundus.scraping.html import CCNewsSource, CircuitBreaker
+from fundus.scraping.scraper import AsyncWebScraper, CCNewsScraper, WebScraper, _init_parse_worker
+from fundus.scraping.session import AsyncSessionHandler, CrashThread, session_handler
+from fundus.scraping.stats import CrawlStats, Metric
 from fundus.scraping.url import URLSource
+from fundus.scraping.writer import ArticleWriter, JSONLinesWriter, is_jsonlines_path
 from fundus.utils.events import __EVENTS__
+from fundus.utils.serialization import JSONVal
 from fundus.utils.timeout import Timeout
 
 logger = create_logger(__name__)
@@ -137,6 +146,18 @@ def get_execution_context():
         return thread.name, thread.ident
 
 
+def get_process_initializer() -> Optional[Callable[[], None]]:
+    """Returns an initializer for worker processes restoring the current logging configuration.
+
+    With the `spawn` start method, we have to get current logging configurations and initialize them in the new
+    process. Forked processes inherit them.
+    """
+    if multiprocessing.get_start_method() == "spawn":
+        logging_config = get_current_config()
+        return partial(logging.config.dictConfig, config=logging_config)
+    return None
+
+
 def publisher_context_wrapper(func: Callable[[Publisher], None]) -> Callable[[Publisher], None]:
     """Wraps a callable to register an ``__EVENTS__`` alias context for the publisher argument.
 
@@ -217,7 +238,7 @@ def queue_wrapper(
     return wrapper
 
 
-def pool_queue_iter(handle: MapResult[Any], queue: Queue[Union[_T, Exception]]) -> Iterator[_T]:
+def pool_queue_iter(handle: ApplyResult[Any], queue: Queue[Union[_T, Exception]]) -> Iterator[_T]:
     """Utility function to iterate exhaustively over a pool queue.
 
     The underlying iterator of this function repeatedly exhausts the given queue.
@@ -272,6 +293,14 @@ class CrawlerBase(ABC):
         if not self.publishers:
             raise ValueError("param <publishers> of <Crawler.__init__> must include at least one publisher.")
 
+        # metrics of the current or most recent crawl
+        self.stats = CrawlStats()
+        self.robots_cache_dir: Union[None, str, Path] = None
+        # date window of the current crawl
+        self._date_window: Optional[DateWindow] = None
+        # checkpoint of the current crawl, set while its article iterator is running
+        self._checkpoint: Optional[Checkpoint] = None
+
     @abstractmethod
     def _build_article_iterator(
         self,
@@ -284,6 +313,33 @@ class CrawlerBase(ABC):
     ) -> Iterator[Article]:
         raise NotImplementedError
 
+    def _prefetch_robots(self, publishers: Iterable[Publisher]) -> None:
+        """Reads the robots.txt files of <publishers> concurrently, using the robots cache if configured."""
+        robots = [publisher.robots for publisher in publishers]
+        if self.robots_cache_dir is None:
+            prefetch_robots(robots)
+            return
+
+        with RobotsCache(self.robots_cache_dir) as cache:
+            prefetch_robots(robots, cache)
+
+    def _mark_fetched(self, article: Article) -> None:
+        """Records <article> as processed in the checkpoint of the current crawl, if any.
+
+        Articles dropped because a publisher reached <max_articles_per_publisher> are not recorded,
+        so a resumed crawl still yields them.
+        """
+        if self._checkpoint is not None:
+            self._checkpoint.mark(article.publisher, article.html.requested_url, URLStatus.FETCHED)
+
+    def _stop_publisher(self, publisher: str) -> None:
+        """Signals the crawl engine to stop crawling <publisher>.
+
+        Used when <max_articles_per_publisher> is reached. Engines that cannot stop a single
+        publisher keep running, in which case surplus articles are discarded by crawl().
+        """
+        pass
+
     def crawl(
         self,
         max_articles: Optional[int] = None,
@@ -293,9 +349,10 @@ class CrawlerBase(ABC):
         only_complete: Union[bool, ExtractionFilter] = Requires("title", "body", "publishing_date"),
         url_filter: Optional[URLFilter] = None,
         language_filter: Optional[List[str]] = None,
-        only_unique: bool = True,
-        save_to_file: Union[None, str, Path] = None,
+        only_unique: Union[bool, URLDeduplicator] = True,
+        save_to_file: Union[None, str, Path, ArticleWriter] = None,
         skip_publishers_disallowing_training: bool = False,
+        date_window: Union[None, timedelta, DateWindow] = None,
     ) -> Iterator[Article]:
         """Yields articles from initialized scrapers
 
@@ -323,13 +380,23 @@ class CrawlerBase(ABC):
             language_filter (Optional[List[str]]): A set of language codes to filter the articles by. If set,
                 articles of different languages will be skipped and not counted towards the article count. Defaults
                 to None.
-            only_unique (bool): If set to True, articles yielded will be unique on the responded URL.
-                Always returns the first encountered article. Defaults to True.
-            save_to_file (Union[None, str, Path]): If set, the crawled articles will be collected saved to the
-                specified file as a JSON list.
+            only_unique (Union[bool, URLDeduplicator]): If set to True, articles yielded will be unique on the
+                responded URL. Always returns the first encountered article. Encountered URLs are kept in memory,
+                which can grow large on long-running crawls. Pass a URLDeduplicator, e.g. a
+                BloomFilterDeduplicator or DiskDeduplicator, to use a different backend. Defaults to True.
+            save_to_file (Union[None, str, Path, ArticleWriter]): If set, the crawled articles will be saved to the
+                specified file. Paths ending with `.jsonl`, `.jsonl.gz` or `.jsonl.zst` are written as JSON Lines
+                while crawling, appending to existing files, other paths collect all articles and write them as a single JSON document at the
+                end of the crawl. Pass a JSONLinesWriter to configure compression, flushing and file rotation.
             skip_publishers_disallowing_training (bool): If set to True, publishers that disallow training
                 are skipped. Note that this is an indicator only and users with the intention of using Fundus to gather
                 training data should always check the publisher's terms of use beforehand.
+            date_window (Union[None, timedelta, DateWindow]): If set, URLs dated outside the window by their URL
+                source are skipped before download, as are child sitemaps last modified before it. Dates are
+                taken from <lastmod> and <news:publication_date> of sitemaps and news maps and from the entries
+                of RSS feeds. URLs without dates are crawled regardless. A timedelta, e.g. timedelta(hours=48),
+                crawls URLs dated within this duration before now. Not supported by the CCNewsCrawler.
+                Defaults to None.
 
         Returns:
             Iterator[Article]: An iterator yielding objects of type Article.
@@ -338,6 +405,11 @@ class CrawlerBase(ABC):
         if max_articles == 0:
             return
 
+        self.stats = CrawlStats()
+        if isinstance(date_window, timedelta):
+            date_window = DateWindow(start=datetime.now(timezone.utc) - date_window)
+        self._date_window = date_window
+
         max_articles = max_articles or -1
         timeout = timeout or -1
 
@@ -354,7 +426,11 @@ class CrawlerBase(ABC):
             else:
                 return only_complete
 
-        response_cache: Set[str] = set()
+        deduplicator: Optional[URLDeduplicator]
+        if isinstance(only_unique, URLDeduplicator):
+            deduplicator = only_unique
+        else:
+            deduplicator = InMemoryDeduplicator() if only_unique else None
 
         extraction_filter = build_extraction_filter()
         fitting_publishers: List[Union[Publisher, FilteredPublisher]] = []
@@ -405,7 +481,13 @@ class CrawlerBase(ABC):
             logger.info(f"Publisher language filter: {publisher_language_filter} will be used as the language filter. ")
 
         article_count: Dict[str, int] = defaultdict(int)
-        crawled_articles: Dict[str, List[Article]] = defaultdict(list)
+        crawled_articles: Dict[str, List[Dict[str, JSONVal]]] = defaultdict(list)
+
+        writer: Optional[ArticleWriter] = None
+        if isinstance(save_to_file, ArticleWriter):
+            writer = save_to_file
+        elif save_to_file is not None and is_jsonlines_path(save_to_file):
+            writer = JSONLinesWriter(save_to_file)
 
         # Unfortunately we relly on this little workaround here to terminate the 'Pool' used within
         # the 'CCNewsCrawler'. The 'Timeout' contextmanager utilizes '_thread.interrupt_main',
@@ -414,8 +496,10 @@ class CrawlerBase(ABC):
         # interrupted via a KeyboardInterrupt. The workaround is to have a modul global event
         # that can be set within the 'Timeout' thread using a callback.
         # With Python 3.10 we can pass a signum to '_thread.interrupt_main', maybe that's the way to go.
+        # The same applies to the 'AsyncCrawler', whose 'crawl()' may run outside the main thread
+        # when used through 'crawl_async()'.
         callback: Optional[Callable[[], None]]
-        if isinstance(self, CCNewsCrawler) and self.processes > 0:
+        if isinstance(self, AsyncCrawler) or (isinstance(self, CCNewsCrawler) and self.processes > 0):
 
             def callback() -> None:
                 __EVENTS__.set_event("stop", __MAIN_THREAD_ALIAS__)
@@ -436,34 +520,51 @@ class CrawlerBase(ABC):
                     skip_publishers_disallowing_training,
                 ):
                     if max_articles_per_publisher and article_count[article.publisher] == max_articles_per_publisher:
-                        if (isinstance(self, Crawler) and self.threading) and not __EVENTS__.is_event_set(
-                            "stop", article.publisher
-                        ):
-                            __EVENTS__.set_event("stop", article.publisher)
+                        self._stop_publisher(article.publisher)
                         if sum(article_count.values()) == len(self.publishers) * max_articles_per_publisher:
                             break
                         continue
                     timer.reset()
                     url_without_query_parameters = remove_query_parameters_from_url(article.html.responded_url)
-                    if not only_unique or url_without_query_parameters not in response_cache:
-                        response_cache.add(url_without_query_parameters)
+                    if deduplicator is None or deduplicator.add(url_without_query_parameters):
+                        self.stats.increment(article.publisher, article.html.source_info.label, Metric.ARTICLES_YIELDED)
                         article_count[article.publisher] += 1
-                        if save_to_file:
-                            crawled_articles[article.publisher].append(article)
-                        yield article
+                        if writer is not None:
+                            writer.write(article)
+                        elif save_to_file:
+                            # only keep the serialization, not the entire article including its HTML
+                            crawled_articles[article.publisher].append(article.to_json())
+                        try:
+                            yield article
+                        finally:
+                            # we get here once the caller received the article, either asking for the next or stopping
+                            self._mark_fetched(article)
+                    else:
+                        self.stats.increment(
+                            article.publisher, article.html.source_info.label, Metric.ARTICLES_DROPPED_DUPLICATE
+                        )
+                        self._mark_fetched(article)
                     if sum(article_count.values()) == max_articles:
                         break
         finally:
             session_handler.close_sessions()
-            if save_to_file is not None:
-                if isinstance(save_to_file, str):
-                    save_to_file = Path(save_to_file)
+            if deduplicator is not None:
+                logger.debug(
+                    f"{type(deduplicator).__name__} holds {len(deduplicator)} URLs "
+                    f"using {deduplicator.memory_footprint / 2**20:.2f} MiB of memory"
+                )
+            if writer is not None:
+                # writers passed by the caller may be reused for subsequent crawls
+                if writer is save_to_file:
+                    writer.flush()
+                else:
+                    writer.close()
+            elif isinstance(save_to_file, (str, Path)):
+                save_to_file = Path(save_to_file)
                 save_to_file.parent.mkdir(parents=True, exist_ok=True)
                 with open(save_to_file, "w", encoding="utf-8") as file:
                     logger.info(f"Writing crawled articles to {save_to_file!r}")
-                    file.write(
-                        json.dumps(crawled_articles, default=lambda o: o.to_json(), ensure_ascii=False, indent=4)
-                    )
+                    file.write(json.dumps(crawled_articles, ensure_ascii=False, indent=4))
 
 
 class Crawler(CrawlerBase):
@@ -477,6 +578,13 @@ class Crawler(CrawlerBase):
         ignore_robots: bool = False,
         ignore_crawl_delay: bool = False,
         impersonate: bool = False,
+        max_in_flight_per_publisher: int = 1,
+        parse_workers: Optional[int] = None,
+        state_dir: Union[None, str, Path] = None,
+        source_cache_dir: Union[None, str, Path] = None,
+        robots_cache_dir: Union[None, str, Path] = None,
+        circuit_breaker_threshold: Optional[int] = 20,
+        circuit_breaker_cooldown: Optional[float] = None,
     ):
         """Fundus base class for crawling articles from the web.
 
@@ -511,7 +619,36 @@ class Crawler(CrawlerBase):
                 curl_cffi's TLS/HTTP fingerprint impersonation. If False (default), the profile is ignored
                 and requests go out with Fundus' regular fingerprint — publishers gated by anti-bot checks
                 will likely return 4xx/5xx. Defaults to False.
+            max_in_flight_per_publisher (int): Maximum number of concurrent downloads per URL source of a
+                publisher. Downloads are still started at most once per <delay>, but slow responses no longer
+                block the next request. Defaults to 1, i.e. sequential downloads.
+            parse_workers (Optional[int]): If set, articles are parsed by a pool of <parse_workers> processes
+                instead of the threads downloading them. Parsing is CPU-bound and therefore serialized by the
+                GIL, so this is recommended when crawling many publishers at once. Articles of a publisher are
+                still yielded in the order they were downloaded. The processes are spawned, so scripts using
+                this must guard the crawl with `if __name__ == "__main__"`. Defaults to None, i.e. no parse
+                processes.
+            state_dir (Union[None, str, Path]): If set, the crawler records fetched and failed URLs per publisher
+                in a checkpoint within this directory. Crawls using the same <state_dir> skip URLs that were
+                already fetched, so an interrupted crawl resumes where it stopped. Failed URLs are retried.
+                Defaults to None.
+            source_cache_dir (Union[None, str, Path]): If set, sitemaps, news maps and RSS feeds are stored in this
+                directory together with their ETag and Last-Modified headers. Later crawls request them
+                conditionally and read the URLs of unchanged sources from the stored copy, which saves most of the
+                traffic for publishers with many archived sitemaps. Defaults to None.
+            robots_cache_dir (Union[None, str, Path]): If set, the robots.txt files of publishers are stored in this
+                directory and reused by later crawls, also from other processes, until they expire according to
+                their cache headers or after 24 hours. Defaults to None.
+            circuit_breaker_threshold (Optional[int]): Number of consecutive failed requests, i.e. connection
+                errors, timeouts or 4xx/5xx responses, after which a publisher is considered down or blocking and
+                its remaining URLs are skipped. Throttled requests only count once their URL ran out of retries.
+                If set to None, publishers are never skipped. Defaults to 20.
+            circuit_breaker_cooldown (Optional[float]): If set, a publisher's URLs are only skipped for this many
+                seconds after the circuit breaker opened. Then a single request probes whether the publisher
+                recovered. Defaults to None, i.e. the publisher is skipped for the rest of the crawl.
         """
+        if parse_workers is not None and parse_workers < 1:
+            raise ValueError(f"param <parse_workers> must be a positive integer, got {parse_workers}")
 
         def filter_publishers(publisher: Publisher) -> bool:
             if publisher.deprecated and ignore_deprecated:
@@ -534,6 +671,73 @@ class Crawler(CrawlerBase):
         self.ignore_robots = ignore_robots
         self.ignore_crawl_delay = ignore_crawl_delay
         self.impersonate = impersonate
+        self.max_in_flight_per_publisher = max_in_flight_per_publisher
+        self.parse_workers = parse_workers
+        self.state_dir = state_dir
+        self.source_cache_dir = source_cache_dir
+        self.robots_cache_dir = robots_cache_dir
+        self.circuit_breaker_threshold = circuit_breaker_threshold
+        self.circuit_breaker_cooldown = circuit_breaker_cooldown
+
+    def _stop_publisher(self, publisher: str) -> None:
+        if self.threading and not __EVENTS__.is_event_set("stop", publisher):
+            __EVENTS__.set_event("stop", publisher)
+
+    def _build_delay(self) -> Optional[Delay]:
+        if isinstance(self.delay, float):
+            delay = self.delay
+
+            def constant_delay() -> float:
+                return delay
+
+            return constant_delay
+
+        elif isinstance(self.delay, Delay):
+            return self.delay
+
+        else:
+            raise TypeError("param <delay> of <Crawler.__init__>")
+
+    def _build_circuit_breaker(self) -> Optional[CircuitBreaker]:
+        if self.circuit_breaker_threshold is None:
+            return None
+        return CircuitBreaker(self.circuit_breaker_threshold, self.circuit_breaker_cooldown)
+
+    @contextlib.contextmanager
+    def _manage_checkpoint(self) -> Iterator[Optional[Checkpoint]]:
+        if self.state_dir is None:
+            yield None
+            return
+
+        with Checkpoint(self.state_dir) as checkpoint:
+            self._checkpoint = checkpoint
+            try:
+                yield checkpoint
+            finally:
+                self._checkpoint = None
+
+    @contextlib.contextmanager
+    def _manage_source_cache(self) -> Iterator[Optional[SourceCache]]:
+        if self.source_cache_dir is None:
+            yield None
+            return
+
+        with SourceCache(self.source_cache_dir) as source_cache:
+            yield source_cache
+
+    @contextlib.contextmanager
+    def _manage_parse_pool(self, publishers: Tuple[Publisher, ...]) -> Iterator[Optional[Pool]]:
+        if self.parse_workers is None:
+            yield None
+            return
+
+        # forking a process running threads, e.g. the one of the curl transport, may deadlock, so workers are spawned
+        context = multiprocessing.get_context("spawn")
+        parsers = {publisher.name: publisher.parser for publisher in publishers}
+        with context.Pool(
+            processes=self.parse_workers, initializer=_init_parse_worker, initargs=(parsers, get_current_config())
+        ) as pool:
+            yield pool
 
     def _fetch_articles(
         self,
@@ -543,6 +747,9 @@ class Crawler(CrawlerBase):
         url_filter: Optional[URLFilter] = None,
         language_filter: Optional[List[str]] = None,
         skip_publishers_disallowing_training: bool = False,
+        parse_pool: Optional[Pool] = None,
+        checkpoint: Optional[Checkpoint] = None,
+        source_cache: Optional[SourceCache] = None,
     ) -> Iterator[Article]:
         if skip_publishers_disallowing_training and publisher.disallows_training:
             logger.info(f"Skipping publisher {publisher.name} because it disallows training.")
@@ -551,28 +758,19 @@ class Crawler(CrawlerBase):
             logger.info(f"Skipping publisher {publisher.name} because it disallows all URLs.")
             return
 
-        def build_delay() -> Optional[Delay]:
-            if isinstance(self.delay, float):
-                delay = self.delay
-
-                def constant_delay() -> float:
-                    return delay
-
-                return constant_delay
-
-            elif isinstance(self.delay, Delay):
-                return self.delay
-
-            else:
-                raise TypeError("param <delay> of <Crawler.__init__>")
-
         scraper = WebScraper(
             publisher,
             self.restrict_sources_to,
-            build_delay(),
+            self._build_delay(),
             ignore_robots=self.ignore_robots,
             ignore_crawl_delay=self.ignore_crawl_delay,
             impersonate=self.impersonate,
+            max_in_flight=self.max_in_flight_per_publisher,
+            checkpoint=checkpoint,
+            stats=self.stats,
+            source_cache=source_cache,
+            circuit_breaker=self._build_circuit_breaker(),
+            date_window=self._date_window,
         )
         if not scraper.sources and self.restrict_sources_to:
             logger.warning(
@@ -580,7 +778,15 @@ class Crawler(CrawlerBase):
                 f"found for publisher {publisher.name}. Skipping publisher."
             )
             return
-        yield from scraper.scrape(error_handling, extraction_filter, url_filter, language_filter)
+        yield from scraper.scrape(
+            error_handling,
+            extraction_filter,
+            url_filter,
+            language_filter,
+            parse_pool=parse_pool,
+            # keep one document parsing while the next one is downloaded, but bound memory per publisher
+            max_pending=max(2, self.max_in_flight_per_publisher),
+        )
 
     @staticmethod
     def _single_crawl(
@@ -631,10 +837,278 @@ class Crawler(CrawlerBase):
             skip_publishers_disallowing_training=skip_publishers_disallowing_training,
         )
 
-        if self.threading:
-            yield from self._threaded_crawl(publishers, article_task)
-        else:
-            yield from self._single_crawl(publishers, article_task)
+        self._prefetch_robots(publishers)
+        with self._manage_checkpoint() as checkpoint, self._manage_source_cache() as source_cache:
+            with self._manage_parse_pool(publishers) as parse_pool:
+                article_task = partial(
+                    article_task, parse_pool=parse_pool, checkpoint=checkpoint, source_cache=source_cache
+                )
+                if self.threading:
+                    articles = self._threaded_crawl(publishers, article_task)
+                else:
+                    articles = self._single_crawl(publishers, article_task)
+                yield from articles
+
+
+class AsyncCrawler(Crawler):
+    def __init__(
+        self,
+        *publishers: PublisherType,
+        restrict_sources_to: Optional[List[Type[URLSource]]] = None,
+        ignore_deprecated: bool = False,
+        delay: Optional[Union[float, Delay]] = 1.0,
+        ignore_robots: bool = False,
+        ignore_crawl_delay: bool = False,
+        impersonate: bool = False,
+        max_in_flight_per_publisher: int = 1,
+        parse_workers: Optional[int] = None,
+        state_dir: Union[None, str, Path] = None,
+        source_cache_dir: Union[None, str, Path] = None,
+        robots_cache_dir: Union[None, str, Path] = None,
+        circuit_breaker_threshold: Optional[int] = 20,
+        circuit_breaker_cooldown: Optional[float] = None,
+        max_connections: int = 100,
+    ):
+        """Fundus crawler running all publishers as coroutines on a single event loop.
+
+        Instead of one thread per publisher, every publisher, URL source, download and crawl-delay
+        is driven by one asyncio event loop running in a single background thread. All requests share
+        one libcurl multi handle. This keeps thread count and memory flat when crawling a large number
+        of publishers at once.
+
+        Examples:
+            >>> from fundus import PublisherCollection, AsyncCrawler
+            >>> crawler = AsyncCrawler(*PublisherCollection)
+            >>> for article in crawler.crawl(max_articles=100):
+            >>>     print(article)
+            >>> # or from within a coroutine
+            >>> async for article in crawler.crawl_async(max_articles=100):
+            >>>     print(article)
+
+        Args:
+            *publishers (Union[Publisher, PublisherGroup]): The publishers to crawl.
+            restrict_sources_to (Optional[List[Type[URLSource]]]): See Crawler.
+            ignore_deprecated (bool): See Crawler. Defaults to False.
+            delay (Optional[Union[float, Delay]]): See Crawler. Defaults to 1.0.
+            ignore_robots (bool): See Crawler. Defaults to False.
+            ignore_crawl_delay (bool): See Crawler. Defaults to False.
+            impersonate (bool): See Crawler. Defaults to False.
+            max_in_flight_per_publisher (int): See Crawler. Defaults to 1.
+            parse_workers (Optional[int]): See Crawler. Without parse processes, articles are parsed in threads
+                next to the event loop, so downloads continue while an article is parsed. Defaults to None.
+            state_dir (Union[None, str, Path]): See Crawler. Defaults to None.
+            source_cache_dir (Union[None, str, Path]): See Crawler. Defaults to None.
+            robots_cache_dir (Union[None, str, Path]): See Crawler. Defaults to None.
+            circuit_breaker_threshold (Optional[int]): See Crawler. Defaults to 20.
+            circuit_breaker_cooldown (Optional[float]): See Crawler. Defaults to None.
+            max_connections (int): Maximum number of concurrent connections per impersonate profile.
+                Defaults to 100.
+        """
+        super().__init__(
+            *publishers,
+            restrict_sources_to=restrict_sources_to,
+            ignore_deprecated=ignore_deprecated,
+            delay=delay,
+            threading=False,
+            ignore_robots=ignore_robots,
+            ignore_crawl_delay=ignore_crawl_delay,
+            impersonate=impersonate,
+            max_in_flight_per_publisher=max_in_flight_per_publisher,
+            parse_workers=parse_workers,
+            state_dir=state_dir,
+            source_cache_dir=source_cache_dir,
+            robots_cache_dir=robots_cache_dir,
+            circuit_breaker_threshold=circuit_breaker_threshold,
+            circuit_breaker_cooldown=circuit_breaker_cooldown,
+        )
+        self.max_connections = max_connections
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._publisher_tasks: Dict[str, "asyncio.Task[None]"] = {}
+
+    def _stop_publisher(self, publisher: str) -> None:
+        if self._loop is not None and (task := self._publisher_tasks.get(publisher)) is not None:
+            self._loop.call_soon_threadsafe(task.cancel)
+
+    async def _fetch_articles_async(
+        self,
+        publisher: Publisher,
+        session_handler: AsyncSessionHandler,
+        error_handling: Literal["suppress", "catch", "raise"],
+        extraction_filter: Optional[ExtractionFilter] = None,
+        url_filter: Optional[URLFilter] = None,
+        language_filter: Optional[List[str]] = None,
+        skip_publishers_disallowing_training: bool = False,
+        parse_pool: Optional[Pool] = None,
+        checkpoint: Optional[Checkpoint] = None,
+        source_cache: Optional[SourceCache] = None,
+        io_executor: Optional[Executor] = None,
+    ) -> AsyncIterator[Article]:
+        await publisher.robots.ensure_ready_async(session_handler)
+
+        if skip_publishers_disallowing_training and publisher.disallows_training:
+            logger.info(f"Skipping publisher {publisher.name} because it disallows training.")
+            return
+        elif publisher.robots.disallow_all():
+            logger.info(f"Skipping publisher {publisher.name} because it disallows all URLs.")
+            return
+
+        scraper = AsyncWebScraper(
+            publisher,
+            session_handler,
+            self.restrict_sources_to,
+            self._build_delay(),
+            ignore_robots=self.ignore_robots,
+            ignore_crawl_delay=self.ignore_crawl_delay,
+            impersonate=self.impersonate,
+            max_in_flight=self.max_in_flight_per_publisher,
+            checkpoint=checkpoint,
+            stats=self.stats,
+            source_cache=source_cache,
+            circuit_breaker=self._build_circuit_breaker(),
+            date_window=self._date_window,
+            io_executor=io_executor,
+        )
+        if not scraper.sources and self.restrict_sources_to:
+            logger.warning(
+                f"No sources of type {[source_type.__name__ for source_type in self.restrict_sources_to]} "
+                f"found for publisher {publisher.name}. Skipping publisher."
+            )
+            return
+        async for article in scraper.scrape_async(
+            error_handling, extraction_filter, url_filter, language_filter, parse_pool=parse_pool
+        ):
+            yield article
+
+    def _async_crawl(
+        self,
+        publishers: Tuple[Publisher, ...],
+        article_task: Callable[[Publisher, AsyncSessionHandler], AsyncIterator[Article]],
+    ) -> Iterator[Article]:
+        result_queue: Queue[Union[Article, Exception]] = Queue(len(publishers))
+
+        async def _guarded_put(obj: Union[Article, Exception]) -> None:
+            # the queue is consumed from another thread, so we must not block the event loop here
+            while True:
+                try:
+                    result_queue.put_nowait(obj)
+                except Full:
+                    await asyncio.sleep(0.05)
+                else:
+                    return
+
+        async def _run_publisher(publisher: Publisher, session_handler: AsyncSessionHandler) -> None:
+            try:
+                async for article in article_task(publisher, session_handler):
+                    await _guarded_put(article)
+            except Exception as err:
+                tb_str = "".join(traceback.TracebackException.from_exception(err).format())
+                await _guarded_put(
+                    RemoteException(
+                        f"There was a(n) {type(err).__name__!r} occurring in the event loop "
+                        f"while crawling {publisher.name}\n{tb_str}"
+                    )
+                )
+                logger.debug(f"Encountered remote exception in task of {publisher.name}: {err!r}")
+
+        async def _run_all() -> None:
+            session_handler = AsyncSessionHandler(max_connections=self.max_connections)
+            try:
+                self._publisher_tasks = {
+                    publisher.name: asyncio.ensure_future(_run_publisher(publisher, session_handler))
+                    for publisher in publishers
+                }
+                await asyncio.gather(*self._publisher_tasks.values(), return_exceptions=True)
+            finally:
+                for task in self._publisher_tasks.values():
+                    task.cancel()
+                await asyncio.gather(*self._publisher_tasks.values(), return_exceptions=True)
+                await session_handler.close_sessions()
+
+        loop = asyncio.new_event_loop()
+        # parsing is GIL-bound, so more threads only help while they await results of parse processes
+        parse_executor = ThreadPoolExecutor(max_workers=self.parse_workers or 1, thread_name_prefix="fundus-parse")
+        loop.set_default_executor(parse_executor)
+        main_task = loop.create_task(_run_all())
+        self._loop = loop
+
+        def _run_loop() -> None:
+            # CancelledError is a BaseException and would otherwise kill the pool's worker thread
+            try:
+                with contextlib.suppress(asyncio.CancelledError):
+                    loop.run_until_complete(main_task)
+            finally:
+                # finalize abandoned async generators, e.g. of cancelled publishers
+                loop.run_until_complete(loop.shutdown_asyncgens())
+                if pending := asyncio.all_tasks(loop):
+                    loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
+
+        pool = ThreadPool(processes=1)
+        try:
+            yield from pool_queue_iter(pool.apply_async(_run_loop), result_queue)
+        finally:
+            logger.debug(f"Shutting down {type(self).__name__!r} ...")
+            loop.call_soon_threadsafe(main_task.cancel)
+            pool.close()
+            pool.join()
+            parse_executor.shutdown(wait=True)
+            loop.close()
+            self._loop = None
+            self._publisher_tasks = {}
+            logger.debug("Shutdown done")
+
+    def _build_article_iterator(
+        self,
+        publishers: Tuple[Publisher, ...],
+        error_handling: Literal["suppress", "catch", "raise"],
+        extraction_filter: Optional[ExtractionFilter],
+        url_filter: Optional[URLFilter],
+        language_filter: Optional[List[str]],
+        skip_publishers_disallowing_training: bool = False,
+    ) -> Iterator[Article]:
+        article_task = partial(
+            self._fetch_articles_async,
+            error_handling=error_handling,
+            extraction_filter=extraction_filter,
+            url_filter=url_filter,
+            language_filter=language_filter,
+            skip_publishers_disallowing_training=skip_publishers_disallowing_training,
+        )
+        self._prefetch_robots(publishers)
+        with self._manage_checkpoint() as checkpoint, self._manage_source_cache() as source_cache:
+            # a single thread for checkpoint lookups, so disk round trips don't block the event loop
+            with self._manage_parse_pool(publishers) as parse_pool, ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="fundus-io"
+            ) as io_executor:
+                articles = self._async_crawl(
+                    publishers,
+                    partial(
+                        article_task,
+                        parse_pool=parse_pool,
+                        checkpoint=checkpoint,
+                        source_cache=source_cache,
+                        io_executor=io_executor,
+                    ),
+                )
+                yield from articles
+
+    async def crawl_async(self, *args: Any, **kwargs: Any) -> AsyncIterator[Article]:
+        """Asynchronous iterator over crawl().
+
+        Accepts the same arguments as crawl(). The crawl itself runs on the crawler's own event loop;
+        articles are handed over to the calling event loop without blocking it.
+
+        Returns:
+            AsyncIterator[Article]: An asynchronous iterator yielding objects of type Article.
+        """
+        loop = asyncio.get_running_loop()
+        articles = cast(Generator[Article, None, None], self.crawl(*args, **kwargs))
+        # a single worker keeps every step of the generator on the same thread
+        with ThreadPoolExecutor(max_workers=1, thread_name_prefix="async-crawler") as executor:
+            try:
+                while (article := await loop.run_in_executor(executor, next, articles, None)) is not None:
+                    yield article
+            finally:
+                await loop.run_in_executor(executor, articles.close)
 
 
 class CCNewsCrawler(CrawlerBase):
@@ -647,6 +1121,7 @@ class CCNewsCrawler(CrawlerBase):
         retries: int = 3,
         disable_tqdm: bool = False,
         server_address: str = "https://data.commoncrawl.org/",
+        robots_cache_dir: Union[None, str, Path] = None,
     ):
         """Initializes a crawler for the CC-NEWS dataset.
 
@@ -666,6 +1141,8 @@ class CCNewsCrawler(CrawlerBase):
                 retries, the crawler sleeps for <current-try> * 30 seconds. Defaults to 3.
             disable_tqdm: Disable the usage of tqdm within the crawler. Defaults to False.
             server_address: The CC-NEWS dataset server address. Defaults to 'https://data.commoncrawl.org/'.
+            robots_cache_dir: If set, robots.txt files read to skip publishers disallowing training are stored in
+                this directory and reused by later crawls. See Crawler. Defaults to None.
         """
 
         super().__init__(*publishers)
@@ -687,6 +1164,7 @@ class CCNewsCrawler(CrawlerBase):
         self.retries = retries
         self.disable_tqdm = disable_tqdm
         self.server_address = server_address
+        self.robots_cache_dir = robots_cache_dir
 
     def _fetch_articles(
         self,
@@ -700,7 +1178,7 @@ class CCNewsCrawler(CrawlerBase):
     ) -> Iterator[Article]:
         retries: int = 0
         while True:
-            source = CCNewsSource(*publishers, warc_path=warc_path)
+            source = CCNewsSource(*publishers, warc_path=warc_path, stats=self.stats)
             scraper = CCNewsScraper(source)
             try:
                 yield from scraper.scrape(error_handling, extraction_filter, url_filter, language_filter)
@@ -732,12 +1210,7 @@ class CCNewsCrawler(CrawlerBase):
         self, warc_paths: Tuple[str, ...], article_task: Callable[[str], Iterator[Article]]
     ) -> Iterator[Article]:
         # because logging configurations are overwritten when using 'spawn' as start method,
-        # we have to get current logging configurations and initialize them in the new process
-        if multiprocessing.get_start_method() == "spawn":
-            logging_config = get_current_config()
-            initializer = partial(logging.config.dictConfig, config=logging_config)
-        else:
-            initializer = None
+        initializer = get_process_initializer()
 
         # As one could think, because we're downloading a bunch of files, this task is IO-bound, but it is actually
         # process-bound. The reason is that we stream the data and process it on the fly rather than downloading all
@@ -746,11 +1219,21 @@ class CCNewsCrawler(CrawlerBase):
             processes=min(self.processes, len(warc_paths)),
             initializer=initializer,
         ) as pool:
-            result_queue: Queue[Union[Article, Exception]] = manager.Queue(maxsize=1000)
+            # holds articles, stats and exceptions
+            result_queue: Queue[Any] = manager.Queue(maxsize=1000)
+
+            # Worker processes record stats in their own copy of <self.stats>, so we periodically
+            # send them along with the articles and merge them into the stats of the main process.
+            def article_task_with_stats(warc_path: str) -> Iterator[Union[Article, CrawlStats]]:
+                for count, article in enumerate(article_task(warc_path), start=1):
+                    yield article
+                    if count % 100 == 0:
+                        yield self.stats.pop()
+                yield self.stats.pop()
 
             # Because multiprocessing.Pool does not support iterators as targets,
             # we wrap the article_task to write the articles to a queue instead of returning them directly.
-            wrapped_article_task: Callable[[str], None] = queue_wrapper(result_queue, article_task)
+            wrapped_article_task: Callable[[str], None] = queue_wrapper(result_queue, article_task_with_stats)
 
             # To avoid 503 errors we spread tasks to not start all at once
             spread_article_task = random_sleep(wrapped_article_task, (0, 3))
@@ -759,7 +1242,14 @@ class CCNewsCrawler(CrawlerBase):
             serialized_article_task = dill_wrapper(spread_article_task)
 
             # Finally, we build an iterator around the queue, exhausting the queue until the pool is finished.
-            yield from pool_queue_iter(pool.map_async(serialized_article_task, warc_paths), result_queue)
+            results: Iterator[Union[Article, CrawlStats]] = pool_queue_iter(
+                pool.map_async(serialized_article_task, warc_paths), result_queue
+            )
+            for result in results:
+                if isinstance(result, CrawlStats):
+                    self.stats.merge(result)
+                else:
+                    yield result
 
             logger.debug(f"Shutting down {type(self).__name__!r} ...")
 
@@ -828,32 +1318,19 @@ class CCNewsCrawler(CrawlerBase):
         **kwargs,
     ) -> Iterator[Article]:
         if skip_publishers_disallowing_training:
-            max_workers = self.processes if self.processes > 0 else min(len(publishers), 5)
             verified_publishers: List["Publisher"] = []
 
-            def run_disallow_training(publisher: Publisher) -> bool:
-                return publisher.disallows_training
+            with session_handler.context(timeout=10):
+                self._prefetch_robots(publishers)
 
-            with ThreadPoolExecutor(max_workers=max_workers) as executor, session_handler.context(timeout=10):
-                future_to_publisher = {
-                    executor.submit(run_disallow_training, publisher=publisher): publisher for publisher in publishers
-                }
-
-                warc_paths = tuple(self._get_warc_paths())
-
-                for future in as_completed(future_to_publisher.keys()):
-                    publisher = future_to_publisher[future]
-                    try:
-                        if not future.result():
-                            verified_publishers.append(publisher)
-                        else:
-                            logger.warning(f"Skipping publisher {publisher.name!r} because it disallows training.")
-                    except Exception as exc:
-                        logger.warning(f"Could not verify training policy for {publisher.name!r}: {exc}", exc_info=True)
-                publishers = tuple(verified_publishers)
+            for publisher in publishers:
+                if not publisher.disallows_training:
+                    verified_publishers.append(publisher)
+                else:
+                    logger.warning(f"Skipping publisher {publisher.name!r} because it disallows training.")
+            publishers = tuple(verified_publishers)
 
-        else:
-            warc_paths = tuple(self._get_warc_paths())
+        warc_paths = tuple(self._get_warc_paths())
 
         with get_proxy_tqdm(total=len(warc_paths), desc="Process WARC files", disable=self.disable_tqdm) as bar:
             article_task = partial(
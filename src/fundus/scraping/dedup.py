@@ -0,0 +1,196 @@
+import hashlib
+import math
+import sqlite3
+import sys
+import tempfile
+import threading
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Optional, Set, Tuple, Union
+
+__all__ = [
+    "URLDeduplicator",
+    "InMemoryDeduplicator",
+    "BloomFilterDeduplicator",
+    "DiskDeduplicator",
+]
+
+
+class URLDeduplicator(ABC):
+    """Base class for backends keeping track of already encountered URLs.
+
+    Backends are safe to use from multiple threads.
+    """
+
+    @abstractmethod
+    def add(self, url: str) -> bool:
+        """Adds <url> to the backend.
+
+        Returns:
+            bool: True if <url> was not encountered before, False otherwise.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def __contains__(self, url: object) -> bool:
+        raise NotImplementedError
+
+    @abstractmethod
+    def __len__(self) -> int:
+        """The number of added URLs. Probabilistic backends return an estimate."""
+        raise NotImplementedError
+
+    @property
+    @abstractmethod
+    def memory_footprint(self) -> int:
+        """The approximate number of bytes held in memory by the backend."""
+        raise NotImplementedError
+
+    def close(self) -> None:
+        """Frees resources held by the backend."""
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+
+class InMemoryDeduplicator(URLDeduplicator):
+    def __init__(self) -> None:
+        """Exact deduplication using a Python set. Memory grows with every added URL."""
+        self._urls: Set[str] = set()
+        self._lock = threading.Lock()
+        self._size = sys.getsizeof(self._urls)
+
+    def add(self, url: str) -> bool:
+        with self._lock:
+            if url in self._urls:
+                return False
+            self._urls.add(url)
+            self._size += sys.getsizeof(url)
+            return True
+
+    def __contains__(self, url: object) -> bool:
+        return url in self._urls
+
+    def __len__(self) -> int:
+        return len(self._urls)
+
+    @property
+    def memory_footprint(self) -> int:
+        return self._size - sys.getsizeof(set()) + sys.getsizeof(self._urls)
+
+
+class BloomFilterDeduplicator(URLDeduplicator):
+    def __init__(self, capacity: int = 10_000_000, error_rate: float = 0.001):
+        """Probabilistic deduplication with a fixed memory footprint using a Bloom filter.
+
+        The filter never reports a new URL as duplicate, until <capacity> URLs were added. Up to then,
+        a new URL is mistaken for an already encountered one with a probability of at most <error_rate>.
+        Such URLs are skipped. With the defaults, the filter takes about 18 MB.
+
+        Args:
+            capacity: The number of URLs the filter is sized for. Defaults to 10,000,000.
+            error_rate: The false positive rate at <capacity>. Defaults to 0.001.
+        """
+        if capacity < 1:
+            raise ValueError(f"<capacity> must be a positive integer, got {capacity}")
+        if not 0 < error_rate < 1:
+            raise ValueError(f"<error_rate> must be in (0, 1), got {error_rate}")
+
+        self.capacity = capacity
+        self.error_rate = error_rate
+
+        self.num_bits = math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+
+        self._bits = bytearray(math.ceil(self.num_bits / 8))
+        self._count = 0
+        self._lock = threading.Lock()
+
+    def _positions(self, url: str) -> Tuple[int, ...]:
+        # double hashing, see Kirsch and Mitzenmacher, "Less Hashing, Same Performance"
+        digest = hashlib.blake2b(url.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return tuple((h1 + i * h2) % self.num_bits for i in range(self.num_hashes))
+
+    def add(self, url: str) -> bool:
+        positions = self._positions(url)
+        with self._lock:
+            is_new = False
+            for position in positions:
+                byte, bit = divmod(position, 8)
+                if not self._bits[byte] & (1 << bit):
+                    self._bits[byte] |= 1 << bit
+                    is_new = True
+            if is_new:
+                self._count += 1
+            return is_new
+
+    def __contains__(self, url: object) -> bool:
+        if not isinstance(url, str):
+            return False
+        return all(self._bits[position // 8] & (1 << (position % 8)) for position in self._positions(url))
+
+    def __len__(self) -> int:
+        return self._count
+
+    @property
+    def memory_footprint(self) -> int:
+        return sys.getsizeof(self._bits)
+
+
+class DiskDeduplicator(URLDeduplicator):
+    def __init__(self, path: Union[None, str, Path] = None, cache_size: int = 2**23):
+        """Exact deduplication backed by a SQLite database on disk.
+
+        Args:
+            path: The database file. If None, a temporary file is used and deleted on close().
+                Using the same file across crawls lets them share encountered URLs. Defaults to None.
+            cache_size: Maximum number of bytes SQLite keeps in memory. Defaults to 8 MiB.
+        """
+        self._tmp_dir: "Optional[tempfile.TemporaryDirectory[str]]" = None
+        if path is None:
+            self._tmp_dir = tempfile.TemporaryDirectory(prefix="fundus-dedup-")
+            path = Path(self._tmp_dir.name) / "urls.sqlite"
+
+        self.path = Path(path)
+        self.cache_size = cache_size
+
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=OFF")
+        self._connection.execute(f"PRAGMA cache_size=-{max(1, cache_size // 1024)}")
+        self._connection.execute("CREATE TABLE IF NOT EXISTS urls (url TEXT PRIMARY KEY) WITHOUT ROWID")
+
+    def add(self, url: str) -> bool:
+        with self._lock:
+            cursor = self._connection.execute("INSERT OR IGNORE INTO urls VALUES (?)", (url,))
+            return cursor.rowcount > 0
+
+    def __contains__(self, url: object) -> bool:
+        with self._lock:
+            return self._connection.execute("SELECT 1 FROM urls WHERE url = ?", (url,)).fetchone() is not None
+
+    def __len__(self) -> int:
+        with self._lock:
+            row = self._connection.execute("SELECT COUNT(*) FROM urls").fetchone()
+        return int(row[0])
+
+    @property
+    def memory_footprint(self) -> int:
+        with self._lock:
+            page_size = self._connection.execute("PRAGMA page_size").fetchone()[0]
+            page_count = self._connection.execute("PRAGMA page_count").fetchone()[0]
+        # SQLite keeps at most <cache_size> bytes of the database in memory
+        return int(min(page_size * page_count, self.cache_size))
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
+        if self._tmp_dir is not None:
+            self._tmp_dir.cleanup()
@@ -0,0 +1,185 @@
+import codecs
+import re
+import threading
+from typing import Dict, Iterator, NamedTuple, Optional, Tuple
+
+import chardet
+
+from fundus.logging import create_logger
+
+logger = create_logger(__name__)
+
+_charset_re = re.compile(rb"charset\s*=\s*[\"']?\s*([^\"'\s;>]+)", re.IGNORECASE)
+_content_type_charset_re = re.compile(r"charset\s*=\s*[\"']?\s*([^\"'\s;]+)", re.IGNORECASE)
+
+# longest first, since the UTF-32 LE BOM starts with the UTF-16 LE BOM
+_boms: Tuple[Tuple[bytes, str], ...] = (
+    (codecs.BOM_UTF32_LE, "utf-32"),
+    (codecs.BOM_UTF32_BE, "utf-32"),
+    (codecs.BOM_UTF8, "utf-8-sig"),
+    (codecs.BOM_UTF16_LE, "utf-16"),
+    (codecs.BOM_UTF16_BE, "utf-16"),
+)
+
+# number of bytes statistical detection looks at
+_DETECTION_PREFIX = 16 * 1024
+
+
+class Decoded(NamedTuple):
+    text: str
+    encoding: str
+    # the tier the encoding was found by, i.e. "content-type", "bom", "meta", "utf-8", "fallback" or "chardet"
+    method: str
+
+
+def _detect_encoding_from_html(response: bytes) -> Optional[str]:
+    """Extract the charset declared in an HTML meta tag, scanning only the first 2048 bytes."""
+    if match := _charset_re.search(response[:2048]):
+        return match.group(1).decode("ascii", errors="replace")
+    return None
+
+
+def _detect_encoding_from_bom(content: bytes) -> Optional[str]:
+    for bom, encoding in _boms:
+        if content.startswith(bom):
+            return encoding
+    return None
+
+
+def _detect_encoding_from_content_type(content_type: Optional[str]) -> Optional[str]:
+    if content_type and (match := _content_type_charset_re.search(content_type)):
+        return match.group(1)
+    return None
+
+
+# size of the chunks detect() validates encodings with
+_VALIDATION_CHUNK = 64 * 1024
+
+
+def _try_decode(content: bytes, encoding: str) -> Optional[str]:
+    try:
+        return content.decode(encoding)
+    except (UnicodeDecodeError, LookupError):
+        return None
+
+
+def _is_decodable(content: bytes, encoding: str) -> bool:
+    """Like _try_decode(), but decodes chunk-wise and discards the text instead of building it."""
+    try:
+        decoder = codecs.getincrementaldecoder(encoding)()
+        for start in range(0, len(content), _VALIDATION_CHUNK):
+            decoder.decode(content[start : start + _VALIDATION_CHUNK])
+        decoder.decode(b"", final=True)
+    except (UnicodeDecodeError, LookupError):
+        return False
+    return True
+
+
+def _candidates(
+    content: bytes, content_type: Optional[str], fallback: Optional[str]
+) -> Iterator[Tuple[Optional[str], str]]:
+    yield _detect_encoding_from_content_type(content_type), "content-type"
+    yield _detect_encoding_from_bom(content), "bom"
+    yield _detect_encoding_from_html(content), "meta"
+    yield "utf-8", "utf-8"
+    yield fallback, "fallback"
+
+
+def _detect_with_chardet(content: bytes) -> str:
+    encoding = chardet.detect(content[:_DETECTION_PREFIX])["encoding"] or "utf-8"
+    logger.debug(f"Detected encoding from chardet: {encoding!r}")
+    try:
+        codecs.lookup(encoding)
+    except LookupError:
+        return "utf-8"
+    return encoding
+
+
+def detect(content: bytes, content_type: Optional[str] = None, fallback: Optional[str] = None) -> str:
+    """Detect the encoding of <content> using the same tiers as decode(), without decoding it.
+
+    Args:
+        content: The bytes to detect the encoding of.
+        content_type: See decode(). Defaults to None.
+        fallback: See decode(). Defaults to None.
+
+    Returns:
+        The encoding decode() would use for <content>.
+    """
+    for encoding, _ in _candidates(content, content_type, fallback):
+        if encoding is not None and _is_decodable(content, encoding):
+            return encoding
+    return _detect_with_chardet(content)
+
+
+def decode(content: bytes, content_type: Optional[str] = None, fallback: Optional[str] = None) -> Decoded:
+    """Decode <content> trying cheap tiers first and statistical detection last.
+
+    The encoding is taken from the first of the following that decodes <content> without errors:
+    the charset of <content_type>, a byte order mark, an HTML meta charset, UTF-8 and <fallback>.
+    Only if all of them fail, the encoding is detected by chardet from a bounded prefix of
+    <content> and undecodable bytes are replaced.
+
+    Args:
+        content: The bytes to decode.
+        content_type: The Content-Type header of the response <content> belongs to. Defaults to None.
+        fallback: An encoding to try before statistical detection, e.g. the one last detected for the
+            same publisher. Defaults to None.
+
+    Returns:
+        The decoded text, the encoding and the tier it was found by.
+    """
+    for encoding, method in _candidates(content, content_type, fallback):
+        if encoding is not None and (text := _try_decode(content, encoding)) is not None:
+            return Decoded(text, encoding, method)
+
+    encoding = _detect_with_chardet(content)
+    return Decoded(content.decode(encoding, errors="replace"), encoding, "chardet")
+
+
+def _detect_encoding_from_bytes(response: bytes) -> str:
+    """Detect the character encoding of an HTML response.
+
+    Used as the default_encoding of curl_cffi sessions, which decode the response themselves, so
+    only the encoding is detected. Uses the same tiers as decode(), except for the Content-Type
+    header, and defaults to UTF-8.
+
+    Args:
+        response: Raw response bytes to detect encoding for.
+
+    Returns:
+        Detected encoding string, guaranteed non-empty.
+    """
+    # see https://github.com/flairNLP/fundus/issues/446
+    return detect(response)
+
+
+class PublisherEncodings:
+    def __init__(self) -> None:
+        """Remembers the encoding chardet detected last per publisher.
+
+        Publishers serving documents without a valid charset usually do so with the same encoding,
+        so it is tried before running chardet again on their next document. Only encodings found
+        by chardet are remembered: the other tiers are cheap, and remembering e.g. a Latin-1
+        charset header would decode every later document failing UTF-8 as Latin-1, since it
+        accepts any bytes. Safe to use from multiple threads.
+        """
+        self._encodings: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def decode(self, publisher: str, content: bytes, content_type: Optional[str] = None) -> Decoded:
+        """Decodes <content> of <publisher>. See decode()."""
+        with self._lock:
+            fallback = self._encodings.get(publisher)
+        decoded = decode(content, content_type, fallback)
+        if decoded.method == "chardet":
+            with self._lock:
+                self._encodings[publisher] = decoded.encoding
+        return decoded
+
+    def get(self, publisher: str) -> Optional[str]:
+        with self._lock:
+            return self._encodings.get(publisher)
+
+
+publisher_encodings = PublisherEncodings()
@@ -1,5 +1,6 @@
 import re
-from typing import Any, Callable, Dict, Protocol
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Optional, Protocol
 
 from typing_extensions import ParamSpec
 
@@ -82,6 +83,39 @@ def regex_filter(regex: str) -> URLFilter:
     return url_filter
 
 
+def _as_utc(date: datetime) -> datetime:
+    # dates without timezone are assumed to be in UTC
+    return date if date.tzinfo is not None else date.replace(tzinfo=timezone.utc)
+
+
+class DateWindow:
+    def __init__(self, start: Optional[datetime] = None, end: Optional[datetime] = None) -> None:
+        """Time span used to skip URLs by the dates their URL source lists for them, before download.
+
+        Sitemaps and news maps list <lastmod> and <news:publication_date>, RSS feeds publication and
+        update dates. URLs with a date outside the window are skipped, URLs without one are not. Child
+        sitemaps of a sitemap index last modified before <start> are skipped as a whole, since they
+        can't list articles published later. Dates without timezone are assumed to be in UTC.
+
+        Args:
+            start: The earliest date to crawl. If None, the window is open towards the past. Defaults to None.
+            end: The latest date to crawl. If None, the window is open towards the future. Defaults to None.
+        """
+        self.start = _as_utc(start) if start is not None else None
+        self.end = _as_utc(end) if end is not None else None
+
+    def __contains__(self, date: datetime) -> bool:
+        date = _as_utc(date)
+        return (self.start is None or self.start <= date) and (self.end is None or date <= self.end)
+
+    def is_before(self, date: datetime) -> bool:
+        """Returns True if <date> lies before <start>."""
+        return self.start is not None and _as_utc(date) < self.start
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(start={self.start}, end={self.end})"
+
+
 class SupportsBool(Protocol):
     def __bool__(self) -> bool: ...
 
@@ -1,20 +1,44 @@
+import asyncio
+import threading
 import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Executor, Future, ThreadPoolExecutor, wait
 from dataclasses import dataclass
-from datetime import datetime
-from typing import Callable, Dict, Iterable, Iterator, List, Optional, Protocol, Union
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import (
+    Any,
+    AsyncIterator,
+    Callable,
+    Deque,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Protocol,
+    Tuple,
+    TypeVar,
+    Union,
+)
 from urllib.parse import urlparse
 
-import chardet
 import requests
+from curl_cffi.requests import Response
 from curl_cffi.requests.exceptions import ConnectionError, HTTPError, Timeout
-from fastwarc import ArchiveIterator, WarcRecord, WarcRecordType
+from fastwarc import ArchiveIterator, WarcRecordType
 
 from fundus.logging import create_logger
 from fundus.publishers.base_objects import Publisher, Robots
+from fundus.scraping.cache import SourceCache
+from fundus.scraping.checkpoint import Checkpoint, URLStatus
+from fundus.scraping.dedup import DiskDeduplicator, InMemoryDeduplicator, URLDeduplicator
 from fundus.scraping.delay import Delay
-from fundus.scraping.filter import URLFilter
-from fundus.scraping.session import _default_header, session_handler
-from fundus.scraping.url import URLSource, is_valid_url
+from fundus.scraping.encoding import publisher_encodings
+from fundus.scraping.filter import DateWindow, URLFilter
+from fundus.scraping.session import AsyncSessionHandler, _default_header, session_handler
+from fundus.scraping.stats import CrawlStats, Metric
+from fundus.scraping.url import URLRecord, URLSource, is_valid_url, normalize_url
 from fundus.utils.events import __EVENTS__
 
 __all__ = [
@@ -24,11 +48,14 @@ __all__ = [
     "WebSourceInfo",
     "HTMLSource",
     "WebSource",
+    "AsyncWebSource",
     "CCNewsSource",
 ]
 
 logger = create_logger(__name__)
 
+_T = TypeVar("_T")
+
 
 @dataclass(frozen=True)
 class HTML:
@@ -43,6 +70,11 @@ class HTML:
 class SourceInfo:
     publisher: str
 
+    @property
+    def label(self) -> str:
+        """Identifies the source in crawl stats."""
+        return ""
+
 
 @dataclass(frozen=True)
 class WarcSourceInfo(SourceInfo):
@@ -50,60 +82,236 @@ class WarcSourceInfo(SourceInfo):
     warc_headers: Dict[str, str]
     http_headers: Dict[str, str]
 
+    @property
+    def label(self) -> str:
+        return "cc-news"
+
 
 @dataclass(frozen=True)
 class WebSourceInfo(SourceInfo):
     type: str
     url: str
 
+    @property
+    def label(self) -> str:
+        return self.url
+
 
 class HTMLSource(Protocol):
     def fetch(self, url_filter: Optional[URLFilter] = None) -> Iterator[HTML]: ...
 
 
-class _Clock:
-    def __init__(
-        self, delay: Optional[Delay], sleep: Callable[[float], None] = time.sleep, warm_start: bool = True
-    ) -> None:
-        """Utility class for time-aligned delay.
+class _TokenBucket:
+    def __init__(self, delay: Optional[Delay], capacity: int = 1, sleep: Callable[[float], None] = time.sleep) -> None:
+        """Thread-safe token bucket limiting the rate of request starts.
 
-        Keeps track of the time passed since last call or init and waits at most the remaining delay.
+        The bucket holds up to <capacity> tokens and refills one token every <delay> seconds.
+        Every request start consumes one token. With the default capacity of one, consecutive
+        request starts are spaced by at least <delay> seconds, independent of how long requests
+        take to complete or how many of them are in flight. The first request starts immediately.
+
+        Implemented as a generic cell rate algorithm, so reservations can be handed out before
+        the actual wait, which lets threads and coroutines share the same bucket.
 
         Args:
-            delay: A customized delay.
+            delay: A customized delay. If None, the bucket never limits.
+            capacity: Number of requests that may start at once after the bucket filled up.
             sleep: A customized sleep function. Defaults to <time.sleep>.
-            warm_start: If true, skips first delay.
         """
         self.delay = delay
-        self.timestamp = time.time()
+        self.capacity = capacity
+        self.sleep = sleep
+        self._theoretical_arrival = time.monotonic()
+        self._lock = threading.Lock()
 
-        if warm_start and self.delay is not None:
-            self.timestamp -= self.delay()
+    def reserve(self) -> float:
+        """Consumes one token.
 
-        self.sleep = sleep
+        Returns:
+            The time in seconds to wait until the reserved token is available.
+        """
+        if self.delay is None:
+            return 0.0
+        with self._lock:
+            now = time.monotonic()
+            interval = self.delay()
+            arrival = max(self._theoretical_arrival, now)
+            self._theoretical_arrival = arrival + interval
+            return max(0.0, arrival - interval * (self.capacity - 1) - now)
+
+    def __call__(self) -> None:
+        """Blocks until a token is available and consumes it."""
+        if wait := self.reserve():
+            self.sleep(wait)
+
+
+def _parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parses a Retry-After header given in seconds or as HTTP date."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        date = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if date.tzinfo is None:
+        date = date.replace(tzinfo=timezone.utc)
+    return max(0.0, (date - datetime.now(timezone.utc)).total_seconds())
+
+
+class AdaptiveRate:
+    def __init__(
+        self,
+        max_interval: float = 60.0,
+        min_backoff: float = 1.0,
+        increase: float = 0.1,
+        max_retry_after: float = 300.0,
+    ) -> None:
+        """Additive-increase/multiplicative-decrease control of the request rate to a publisher host.
 
-    def __call__(self, blocking: bool = True) -> bool:
-        """Waits at most <delay> seconds since last called.
+        Every throttling response, i.e. 429 or 503, doubles the interval between request starts,
+        which is at least <min_backoff> and at most <max_interval> seconds. A Retry-After header
+        additionally pauses all requests for the given time, up to <max_retry_after> seconds. Every
+        healthy response then increases the rate by <increase> requests per second, until the
+        interval falls below the configured delay or a tenth of <min_backoff>. Thread-safe.
 
         Args:
-            blocking: If True, blocks until <delay> seconds have elapsed since last call.
-            If non-blocking returns False if less time has elapsed, else returns True.
+            max_interval: Maximum interval between request starts in seconds. Defaults to 60.
+            min_backoff: Interval after the first throttling response in seconds. Defaults to 1.
+            increase: Requests per second added per healthy response. Defaults to 0.1.
+            max_retry_after: Maximum pause honored from a Retry-After header in seconds. Defaults to 300.
+        """
+        self.max_interval = max_interval
+        self.min_backoff = min_backoff
+        self.increase = increase
+        self.max_retry_after = max_retry_after
+        # interval imposed on top of the configured delay, 0 if not throttled
+        self.interval = 0.0
+        self._last_base = 0.0
+        self._resume_at = 0.0
+        self._lock = threading.Lock()
+
+    def delay(self, base: float) -> float:
+        """Returns the interval between request starts given the configured delay <base>."""
+        with self._lock:
+            self._last_base = base
+            return max(base, self.interval)
+
+    def pause(self) -> float:
+        """Returns the remaining number of seconds all requests should wait because of a Retry-After."""
+        with self._lock:
+            return max(0.0, self._resume_at - time.monotonic())
+
+    def throttled(self, retry_after: Optional[float] = None) -> float:
+        """Backs off after a throttling response.
+
+        Returns:
+            The new interval between request starts.
+        """
+        with self._lock:
+            current = max(self.interval, self._last_base)
+            self.interval = min(self.max_interval, max(2 * current, self.min_backoff))
+            if retry_after is not None:
+                self._resume_at = max(self._resume_at, time.monotonic() + min(retry_after, self.max_retry_after))
+            return self.interval
+
+    def healthy(self) -> bool:
+        """Probes back up after a healthy response.
+
+        Returns:
+            True if the rate was increased.
+        """
+        with self._lock:
+            if not self.interval:
+                return False
+            interval = 1 / (1 / self.interval + self.increase)
+            self.interval = 0.0 if interval <= max(self._last_base, self.min_backoff / 10) else interval
+            return True
 
-        Returns: True if <delay> seconds have elapsed since last call. False otherwise.
 
+class CircuitBreaker:
+    def __init__(self, threshold: int = 20, cooldown: Optional[float] = None) -> None:
+        """Stops requesting a publisher that keeps failing.
+
+        After <threshold> consecutive failed requests, i.e. connection errors, timeouts or 4xx/5xx
+        responses, the breaker opens. If <cooldown> is None, it stays open and the publisher is
+        skipped for the rest of the crawl. Otherwise, URLs are skipped for <cooldown> seconds, after
+        which a single request probes the publisher: if it succeeds the breaker closes, if it fails
+        the breaker opens again, and if it ends without a verdict it must be released. Thread-safe.
+
+        Args:
+            threshold: Number of consecutive failures that open the breaker. Defaults to 20.
+            cooldown: Seconds to skip URLs before probing the publisher again. If None, the
+                publisher is skipped for good. Defaults to None.
         """
-        if self.delay is None:
+        if threshold < 1:
+            raise ValueError(f"<threshold> must be a positive integer, got {threshold}")
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.failures = 0
+        self._opened_at: Optional[float] = None
+        self._probing = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        """One of "closed", "open" or "half-open"."""
+        with self._lock:
+            if self._opened_at is None:
+                return "closed"
+            return "half-open" if self._probing else "open"
+
+    @property
+    def is_permanently_open(self) -> bool:
+        with self._lock:
+            return self._opened_at is not None and self.cooldown is None
+
+    def allow(self) -> bool:
+        """Returns True if a request may be sent."""
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            if self.cooldown is None or self._probing or time.monotonic() - self._opened_at < self.cooldown:
+                return False
+            self._probing = True
             return True
 
-        if delay := max(0.0, self.delay() - time.time() + self.timestamp):
-            if not blocking:
+    def success(self) -> bool:
+        """Records a successful request.
+
+        Returns:
+            True if this closed the breaker.
+        """
+        with self._lock:
+            self.failures = 0
+            if self._opened_at is None:
                 return False
-            self.sleep(delay)
-        self.reset()
-        return True
+            self._opened_at, self._probing = None, False
+            return True
+
+    def failure(self) -> bool:
+        """Records a failed request.
+
+        Returns:
+            True if this opened the breaker.
+        """
+        with self._lock:
+            self.failures += 1
+            if self._probing or (self._opened_at is None and self.failures >= self.threshold):
+                self._opened_at, self._probing = time.monotonic(), False
+                return True
+            return False
 
-    def reset(self):
-        self.timestamp = time.time()
+    def release(self) -> None:
+        """Ends a pending probe without a verdict, e.g. if the request was interrupted or throttled.
+
+        The breaker stays open and allows the next probe right away.
+        """
+        with self._lock:
+            self._probing = False
 
 
 class WebSource:
@@ -117,9 +325,35 @@ class WebSource:
         ignore_robots: bool = False,
         ignore_crawl_delay: bool = False,
         impersonate: bool = False,
+        max_in_flight: int = 1,
+        checkpoint: Optional[Checkpoint] = None,
+        seen_urls: Optional[URLDeduplicator] = None,
+        stats: Optional[CrawlStats] = None,
+        source_cache: Optional[SourceCache] = None,
+        rate: Optional[AdaptiveRate] = None,
+        max_retries: int = 3,
+        circuit_breaker: Optional[CircuitBreaker] = None,
+        date_window: Optional[DateWindow] = None,
     ):
+        if max_in_flight < 1:
+            raise ValueError(f"<max_in_flight> must be a positive integer, got {max_in_flight}")
+
         self.url_source = url_source
         self.publisher = publisher
+        self.max_in_flight = max_in_flight
+        self.checkpoint = checkpoint
+        self.source_cache = source_cache
+        # sources of the same publisher should share <rate>, since they request the same host
+        self.rate = rate if rate is not None else AdaptiveRate()
+        self.max_retries = max_retries
+        # sources of the same publisher should share <circuit_breaker>, since they request the same host
+        self.circuit_breaker = circuit_breaker
+        self.date_window = date_window
+        self._retries: Dict[str, int] = {}
+        self._requeued: Deque[str] = deque()
+        # sources of the same publisher should share <seen_urls> to skip URLs listed by multiple sources
+        self.seen_urls = seen_urls if seen_urls is not None else InMemoryDeduplicator()
+        self.stats = stats if stats is not None else CrawlStats()
         self.url_filter = url_filter
         self.query_parameters = query_parameters or {}
         self._impersonate_profile = publisher.impersonate if impersonate else None
@@ -139,7 +373,22 @@ class WebSource:
                     def delay() -> float:
                         return robots_delay
 
-        self.clock = _Clock(delay=delay, sleep=self._sleep)
+        def adaptive_delay() -> float:
+            return self.rate.delay(delay() if delay is not None else 0.0)
+
+        self.rate_limiter = _TokenBucket(delay=adaptive_delay, sleep=self._sleep)
+
+        self.source_info = (
+            WebSourceInfo(self.publisher.name, type(self.url_source).__name__, self.url_source.url)
+            if isinstance(self.url_source, URLSource)
+            else SourceInfo(self.publisher.name)
+        )
+
+    def _count(self, metric: str, value: int = 1) -> None:
+        self.stats.increment(self.publisher.name, self.source_info.label, metric, value)
+
+    def _observe(self, metric: str, seconds: float) -> None:
+        self.stats.observe(self.publisher.name, self.source_info.label, metric, seconds)
 
     @property
     def _is_stopped(self):
@@ -149,15 +398,35 @@ class WebSource:
     def _sleep(s: float):
         __EVENTS__.get("stop").wait(s)
 
-    def _fetch_html(self, url: str, url_filter: URLFilter) -> Optional[HTML]:
+    def _prepare_url(self, url: str, url_filter: URLFilter) -> Optional[str]:
+        """Checks <url> against all pre-download filters and appends query parameters.
+
+        Returns:
+            The URL to request or None if the URL should be skipped.
+        """
+        self._count(Metric.URLS_DISCOVERED)
+
         # check if URL is malformed
         if not is_valid_url(url):
             logger.debug(f"Skipped requested URL {url!r} because the URL is malformed")
+            self._count(Metric.URLS_FILTERED_URL_FILTER)
             return None
 
         # apply URL filter to requested URL
         if url_filter(url):
             logger.debug(f"Skipped requested URL {url!r} because of URL filter")
+            self._count(Metric.URLS_FILTERED_URL_FILTER)
+            return None
+
+        # check the date listed by the URL source
+        if (
+            self.date_window is not None
+            and isinstance(url, URLRecord)
+            and url.date is not None
+            and url.date not in self.date_window
+        ):
+            logger.debug(f"Skipped requested URL {url!r} because it is dated outside of {self.date_window}")
+            self._count(Metric.URLS_FILTERED_DATE)
             return None
 
         # check robots
@@ -165,9 +434,14 @@ class WebSource:
             self.robots is None or self.robots.can_fetch(self.publisher.request_header.get("user-agent", "*"), url)
         ):
             logger.debug(f"Skipped requested URL {url!r} because of robots.txt")
+            self._count(Metric.URLS_FILTERED_ROBOTS)
             return None
 
-        session = session_handler.get_session(self._impersonate_profile)
+        # check if URL was already requested
+        if not self.seen_urls.add(normalize_url(url)):
+            logger.debug(f"Skipped requested URL {url!r} because it was already requested")
+            self._count(Metric.URLS_FILTERED_DUPLICATE)
+            return None
 
         # prepare query parameters
         for key, value in self.query_parameters.items():
@@ -176,46 +450,175 @@ class WebSource:
             else:
                 url += "?" + key + "=" + value
 
-        # apply crawl-delay
-        self.clock()
+        # check checkpoint
+        if self.checkpoint is not None:
+            if self.checkpoint.is_done(self.publisher.name, url):
+                logger.debug(f"Skipped requested URL {url!r} because it was already processed in a previous crawl")
+                self._count(Metric.URLS_FILTERED_CHECKPOINT)
+                return None
+            self.checkpoint.mark(self.publisher.name, url, URLStatus.SEEN)
 
-        # fetch html
-        try:
-            response = session.get_with_interrupt(url, headers=self.publisher.request_header)
+        return url
 
-        except (HTTPError, ConnectionError, Timeout) as error:
-            logger.warning(f"Skipped requested URL {url!r} because of {error!r}")
-            if isinstance(error, HTTPError) and error.response.status_code >= 500:
-                logger.warning(f"Skipped {self.publisher.name!r} due to server errors: {error!r}")
-            return None
+    def _log_request_error(self, url: str, error: Exception) -> None:
+        self._count(Metric.REQUESTS_FAILED)
+        if self.checkpoint is not None:
+            self.checkpoint.mark(self.publisher.name, url, URLStatus.FAILED)
+        logger.warning(f"Skipped requested URL {url!r} because of {error!r}")
+        if isinstance(error, HTTPError) and error.response.status_code >= 500:
+            logger.warning(f"Skipped {self.publisher.name!r} due to server errors: {error!r}")
+
+    def _build_html(self, url: str, response: Response, url_filter: URLFilter) -> Optional[HTML]:
+        """Builds an HTML object from <response> if the responded URL passes <url_filter>."""
+        self._count(Metric.BYTES_DOWNLOADED, len(response.content))
 
         # apply URL filter to responded URL
         if url_filter(str(response.url)):
             logger.debug(f"Skipped responded URL {str(response.url)!r} because of URL filter")
+            self._count(Metric.URLS_FILTERED_URL_FILTER)
+            if self.checkpoint is not None:
+                self.checkpoint.mark(self.publisher.name, url, URLStatus.FETCHED)
             return None
 
-        html = response.text
+        start = time.perf_counter()
+        decoded = publisher_encodings.decode(
+            self.publisher.name, response.content, response.headers.get("content-type")
+        )
+        self._observe(Metric.DECODE_SECONDS, time.perf_counter() - start)
+        if decoded.method == "chardet":
+            self._count(Metric.DECODED_WITH_CHARDET)
 
         # check for redirects
         if response.history:
             logger.info(f"Got redirected {len(response.history)} time(s) from {url!r} -> {response.url!r}")
 
-        # create WebSourceInfo
-        source_info = (
-            WebSourceInfo(self.publisher.name, type(self.url_source).__name__, self.url_source.url)
-            if isinstance(self.url_source, URLSource)
-            else SourceInfo(self.publisher.name)
-        )
-
         # create HTML
         return HTML(
             requested_url=url,
             responded_url=str(response.url),
-            content=html,
+            content=decoded.text,
             crawl_date=datetime.now(),
-            source_info=source_info,
+            source_info=self.source_info,
         )
 
+    def _requeue_if_throttled(self, url: str, error: Exception) -> bool:
+        """Backs off if <error> is a throttling response and requeues <url> unless it ran out of retries.
+
+        Returns:
+            True if <url> was requeued.
+        """
+        if not (isinstance(error, HTTPError) and error.response is not None):
+            return False
+        if error.response.status_code not in (429, 503):
+            return False
+
+        retry_after = _parse_retry_after(error.response.headers.get("retry-after"))
+        interval = self.rate.throttled(retry_after)
+        self._count(Metric.REQUESTS_THROTTLED)
+        self._count(Metric.RATE_DECREASES)
+        logger.info(
+            f"Got throttled by {self.publisher.name!r} with status {error.response.status_code}. "
+            f"Backing off to one request every {interval:.2f} seconds"
+            + (f" after waiting {retry_after:.2f} seconds" if retry_after is not None else "")
+        )
+
+        if (retries := self._retries.get(url, 0)) >= self.max_retries:
+            return False
+        self._retries[url] = retries + 1
+        self._requeued.append(url)
+        self._count(Metric.URLS_REQUEUED)
+        return True
+
+    def _on_response(self, url: str) -> None:
+        self._retries.pop(url, None)
+        if self.rate.healthy():
+            self._count(Metric.RATE_INCREASES)
+        if self.circuit_breaker is not None and self.circuit_breaker.success():
+            logger.info(f"Closed circuit breaker of {self.publisher.name!r} after a successful request")
+
+    def _on_request_error(self, url: str, error: Exception) -> None:
+        if self._requeue_if_throttled(url, error):
+            # throttling is handled by backing off, only URLs running out of retries count as failed
+            self._release_probe()
+            return
+        self._retries.pop(url, None)
+        self._log_request_error(url, error)
+        if self.circuit_breaker is not None and self.circuit_breaker.failure():
+            self._count(Metric.CIRCUIT_BREAKER_TRIPS)
+            logger.warning(
+                f"Opened circuit breaker of {self.publisher.name!r} after "
+                f"{self.circuit_breaker.failures} consecutive failed requests. "
+                + (
+                    f"Skipping its URLs for {self.circuit_breaker.cooldown} seconds"
+                    if self.circuit_breaker.cooldown is not None
+                    else "Skipping the rest of its URLs"
+                )
+            )
+
+    def _release_probe(self) -> None:
+        if self.circuit_breaker is not None:
+            self.circuit_breaker.release()
+
+    def _is_circuit_open(self, url: str) -> bool:
+        """Returns True and records <url> as skipped if the circuit breaker does not allow a request."""
+        if self.circuit_breaker is None or self.circuit_breaker.allow():
+            return False
+        logger.debug(f"Skipped requested URL {url!r} because the circuit breaker of {self.publisher.name!r} is open")
+        self._count(Metric.URLS_SKIPPED_CIRCUIT_OPEN)
+        self._retries.pop(url, None)
+        return True
+
+    @property
+    def _is_exhausted(self) -> bool:
+        """True if the publisher should not be requested anymore."""
+        return self._is_stopped or (self.circuit_breaker is not None and self.circuit_breaker.is_permanently_open)
+
+    def _next_urls(self, urls: Iterator[str]) -> Iterator[Tuple[str, bool]]:
+        """Yields URLs to fetch, each with a flag whether it was requeued and therefore already prepared.
+
+        Requeued URLs take precedence over new ones from <urls>.
+        """
+        for url in urls:
+            while self._requeued:
+                yield self._requeued.popleft(), True
+            yield url, False
+        while self._requeued and not self._is_exhausted:
+            yield self._requeued.popleft(), True
+
+    def _fetch_html(self, url: str, url_filter: URLFilter, requeued: bool = False) -> Optional[HTML]:
+        # requeued URLs were prepared before
+        prepared_url = url if requeued else self._prepare_url(url, url_filter)
+        if prepared_url is None or self._is_circuit_open(prepared_url):
+            return None
+
+        session = session_handler.get_session(self._impersonate_profile)
+
+        try:
+            # apply Retry-After and crawl-delay
+            if pause := self.rate.pause():
+                self._observe(Metric.THROTTLE_WAIT_SECONDS, pause)
+                self._sleep(pause)
+            self.rate_limiter()
+
+            # fetch html
+            start = time.perf_counter()
+            try:
+                response = session.get_with_interrupt(prepared_url, headers=self.publisher.request_header)
+            finally:
+                self._observe(Metric.REQUEST_SECONDS, time.perf_counter() - start)
+
+        except (HTTPError, ConnectionError, Timeout) as error:
+            self._on_request_error(prepared_url, error)
+            return None
+
+        except BaseException:
+            # e.g. CrashThread, which must not leave the publisher's circuit breaker probing forever
+            self._release_probe()
+            raise
+
+        self._on_response(prepared_url)
+        return self._build_html(prepared_url, response, url_filter)
+
     def _build_url_filter(self, url_filter: Optional[URLFilter]) -> URLFilter:
         combined_filters: List[URLFilter] = ([self.url_filter] if self.url_filter else []) + (
             [url_filter] if url_filter else []
@@ -226,16 +629,19 @@ class WebSource:
 
         return combined_url_filter
 
-    def fetch(self, url_filter: Optional[URLFilter] = None) -> Iterator[HTML]:
+    def _iterate_urls(self) -> Iterator[str]:
         if isinstance(self.url_source, URLSource):
             url_iterator = self.url_source.fetch(
                 session_handler.get_session(self._impersonate_profile),
                 self.publisher.request_header,
+                self.source_cache,
+                throttle=self.rate_limiter,
+                date_window=self.date_window,
             )
         else:
             url_iterator = iter(self.url_source)
 
-        while not self._is_stopped:
+        while not self._is_exhausted:
             try:
                 # check iterator
                 if (url := next(url_iterator, None)) is None:
@@ -245,20 +651,251 @@ class WebSource:
                     f"Warning! URLSource {self.url_source!r} crashed because of an unexpected error: {error!r}"
                 )
                 return
+            yield url
+
+    def _fetch_concurrently(self, urls: Iterator[str], url_filter: URLFilter) -> Iterator[HTML]:
+        """Downloads up to <max_in_flight> URLs at once using a pool of worker threads.
 
+        Results are yielded in order of completion, so downloads continue while the caller
+        processes already finished ones.
+        """
+        parent_alias = __EVENTS__.get_alias(threading.get_ident(), None)
+
+        def fetch_in_worker(url: str, requeued: bool) -> Optional[HTML]:
+            if parent_alias is None:
+                return self._fetch_html(url, url_filter, requeued)
+            # share the events of the calling thread, so stopping the publisher also stops its workers
+            with __EVENTS__.context(f"{parent_alias}::{threading.current_thread().name}", share=parent_alias):
+                return self._fetch_html(url, url_filter, requeued)
+
+        def collect(done: Iterable["Future[Optional[HTML]]"]) -> Iterator[HTML]:
+            for future in done:
+                url = pending.pop(future)
+                try:
+                    if html := future.result():
+                        yield html
+                except Exception as error:
+                    logger.error(f"Warning! Skipped requested URL {url!r} because of an unexpected error {error!r}")
+
+        pending: Dict["Future[Optional[HTML]]", str] = {}
+        executor = ThreadPoolExecutor(max_workers=self.max_in_flight, thread_name_prefix=f"{self.publisher.name}-fetch")
+        try:
+            for url, requeued in self._next_urls(urls):
+                if len(pending) >= self.max_in_flight:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    yield from collect(done)
+                pending[executor.submit(fetch_in_worker, url, requeued)] = url
+
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                yield from collect(done)
+                # downloads finishing last may still requeue their URL
+                while self._requeued and not self._is_exhausted and len(pending) < self.max_in_flight:
+                    url = self._requeued.popleft()
+                    pending[executor.submit(fetch_in_worker, url, True)] = url
+        finally:
+            for future in pending:
+                future.cancel()
+            executor.shutdown(wait=True)
+
+    def fetch(self, url_filter: Optional[URLFilter] = None) -> Iterator[HTML]:
+        combined_filter = self._build_url_filter(url_filter)
+
+        if self.max_in_flight > 1:
+            yield from self._fetch_concurrently(self._iterate_urls(), combined_filter)
+            return
+
+        for url, requeued in self._next_urls(self._iterate_urls()):
             try:
-                if html := self._fetch_html(url, self._build_url_filter(url_filter)):
+                if html := self._fetch_html(url, combined_filter, requeued):
                     yield html
             except Exception as error:
                 logger.error(f"Warning! Skipped requested URL {url!r} because of an unexpected error {error!r}")
                 continue
 
 
+class AsyncWebSource(WebSource):
+    def __init__(
+        self,
+        url_source: Union[URLSource, Iterable[str]],
+        publisher: Publisher,
+        session_handler: AsyncSessionHandler,
+        url_filter: Optional[URLFilter] = None,
+        query_parameters: Optional[Dict[str, str]] = None,
+        delay: Optional[Delay] = None,
+        ignore_robots: bool = False,
+        ignore_crawl_delay: bool = False,
+        impersonate: bool = False,
+        max_in_flight: int = 1,
+        checkpoint: Optional[Checkpoint] = None,
+        seen_urls: Optional[URLDeduplicator] = None,
+        stats: Optional[CrawlStats] = None,
+        source_cache: Optional[SourceCache] = None,
+        rate: Optional[AdaptiveRate] = None,
+        max_retries: int = 3,
+        circuit_breaker: Optional[CircuitBreaker] = None,
+        date_window: Optional[DateWindow] = None,
+        io_executor: Optional[Executor] = None,
+    ):
+        """Asynchronous counterpart of WebSource used by the async crawl engine.
+
+        Downloads and crawl-delays are awaited on the running event loop instead of blocking a thread.
+        The publisher's robots.txt should already be loaded (see Robots.ensure_ready_async), since
+        initialization reads the crawl-delay synchronously. Lookups in <checkpoint> or a
+        DiskDeduplicator as <seen_urls> hit the disk and run in <io_executor>, defaulting to the
+        loop's default executor, so they don't stall other publishers on the loop.
+        """
+        super().__init__(
+            url_source=url_source,
+            publisher=publisher,
+            url_filter=url_filter,
+            query_parameters=query_parameters,
+            delay=delay,
+            ignore_robots=ignore_robots,
+            ignore_crawl_delay=ignore_crawl_delay,
+            impersonate=impersonate,
+            max_in_flight=max_in_flight,
+            checkpoint=checkpoint,
+            seen_urls=seen_urls,
+            stats=stats,
+            source_cache=source_cache,
+            rate=rate,
+            max_retries=max_retries,
+            circuit_breaker=circuit_breaker,
+            date_window=date_window,
+        )
+        self.session_handler = session_handler
+        self.io_executor = io_executor
+        self._blocking_io = checkpoint is not None or isinstance(self.seen_urls, DiskDeduplicator)
+
+    async def _run_io(self, func: Callable[..., _T], *args: Any) -> _T:
+        """Runs <func> in <io_executor> if it may block on disk I/O, otherwise right away."""
+        if not self._blocking_io:
+            return func(*args)
+        return await asyncio.get_running_loop().run_in_executor(self.io_executor, func, *args)
+
+    async def _tick(self) -> None:
+        if wait := self.rate_limiter.reserve():
+            await asyncio.sleep(wait)
+
+    async def _fetch_html_async(self, url: str, url_filter: URLFilter, requeued: bool = False) -> Optional[HTML]:
+        # requeued URLs were prepared before
+        prepared_url: Optional[str] = url
+        if not requeued:
+            prepared_url = await self._run_io(self._prepare_url, url, url_filter)
+        if prepared_url is None or self._is_circuit_open(prepared_url):
+            return None
+
+        session = self.session_handler.get_session(self._impersonate_profile)
+
+        try:
+            # apply Retry-After and crawl-delay
+            if pause := self.rate.pause():
+                self._observe(Metric.THROTTLE_WAIT_SECONDS, pause)
+                await asyncio.sleep(pause)
+            await self._tick()
+
+            # fetch html
+            start = time.perf_counter()
+            try:
+                response = await session.get_with_interrupt(prepared_url, headers=self.publisher.request_header)
+            finally:
+                self._observe(Metric.REQUEST_SECONDS, time.perf_counter() - start)
+
+        except (HTTPError, ConnectionError, Timeout) as error:
+            await self._run_io(self._on_request_error, prepared_url, error)
+            return None
+
+        except BaseException:
+            # e.g. a cancelled task, which must not leave the publisher's circuit breaker probing forever
+            self._release_probe()
+            raise
+
+        self._on_response(prepared_url)
+        return self._build_html(prepared_url, response, url_filter)
+
+    async def _iterate_urls_async(self) -> AsyncIterator[str]:
+        if isinstance(self.url_source, URLSource):
+            async for url in self.url_source.fetch_async(
+                self.session_handler.get_session(self._impersonate_profile),
+                self.publisher.request_header,
+                self.source_cache,
+                throttle=self._tick,
+                date_window=self.date_window,
+            ):
+                if self._is_exhausted:
+                    return
+                yield url
+        else:
+            for url in self.url_source:
+                if self._is_exhausted:
+                    return
+                yield url
+
+    async def fetch_async(self, url_filter: Optional[URLFilter] = None) -> AsyncIterator[HTML]:
+        url_iterator = self._iterate_urls_async().__aiter__()
+        combined_filter = self._build_url_filter(url_filter)
+        pending: Dict["asyncio.Task[Optional[HTML]]", str] = {}
+
+        def collect(done: Iterable["asyncio.Task[Optional[HTML]]"]) -> Iterator[HTML]:
+            for task in done:
+                url = pending.pop(task)
+                try:
+                    if html := task.result():
+                        yield html
+                except Exception as error:
+                    logger.error(f"Warning! Skipped requested URL {url!r} because of an unexpected error {error!r}")
+
+        def submit(url: str, requeued: bool) -> None:
+            pending[asyncio.ensure_future(self._fetch_html_async(url, combined_filter, requeued))] = url
+
+        try:
+            while True:
+                if len(pending) >= self.max_in_flight:
+                    done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                    for html in collect(done):
+                        yield html
+
+                # requeued URLs take precedence over new ones
+                if self._requeued and not self._is_exhausted:
+                    submit(self._requeued.popleft(), True)
+                    continue
+
+                try:
+                    url = await url_iterator.__anext__()
+                except StopAsyncIteration:
+                    break
+                except Exception as error:
+                    logger.error(
+                        f"Warning! URLSource {self.url_source!r} crashed because of an unexpected error: {error!r}"
+                    )
+                    break
+                submit(url, False)
+
+            while pending:
+                done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for html in collect(done):
+                    yield html
+                # downloads finishing last may still requeue their URL
+                while self._requeued and not self._is_exhausted and len(pending) < self.max_in_flight:
+                    submit(self._requeued.popleft(), True)
+        finally:
+            for task in pending:
+                task.cancel()
+
+
 class CCNewsSource:
-    def __init__(self, *publishers: Publisher, warc_path: str, headers: Optional[Dict[str, str]] = None):
+    def __init__(
+        self,
+        *publishers: Publisher,
+        warc_path: str,
+        headers: Optional[Dict[str, str]] = None,
+        stats: Optional[CrawlStats] = None,
+    ):
         self.publishers = publishers
         self.warc_path = warc_path
         self.headers = headers or _default_header
+        self.stats = stats if stats is not None else CrawlStats()
         self._publisher_mapping: Dict[str, Publisher] = {
             urlparse(domain).netloc: publisher
             for publisher in self.publishers
@@ -266,35 +903,6 @@ class CCNewsSource:
         }
 
     def fetch(self, url_filter: Optional[URLFilter] = None) -> Iterator[HTML]:
-        def extract_content(record: WarcRecord) -> Optional[str]:
-            warc_body: bytes = record.reader.read()
-
-            try:
-                return str(warc_body, encoding=record.http_charset)  # type: ignore[arg-type]
-            except (UnicodeDecodeError, TypeError):
-                encoding: Optional[str] = chardet.detect(warc_body)["encoding"]
-
-                if encoding is not None:
-                    logger.debug(
-                        f"Trying to decode record {record.record_id!r} from {target_url!r} "
-                        f"using detected encoding {encoding}."
-                    )
-
-                    try:
-                        return str(warc_body, encoding=encoding)
-                    except UnicodeDecodeError:
-                        logger.warning(
-                            f"Couldn't decode record {record.record_id!r} from {target_url!r} with "
-                            f"original charset {record.http_charset!r} using detected charset {encoding!r}."
-                        )
-                else:
-                    logger.warning(
-                        f"Couldn't detect charset for record {record.record_id!r} from {target_url!r} "
-                        f"with invalid original charset {record.http_charset!r}."
-                    )
-
-            return None
-
         with requests.Session() as session:
             response = session.get(self.warc_path, stream=True, headers=self.headers)
             response.raise_for_status()
@@ -305,30 +913,44 @@ class CCNewsSource:
 
                 target_url = str(warc_record.headers["WARC-Target-URI"])
 
-                if url_filter is not None and url_filter(target_url):
-                    logger.debug(f"Skipped WARC record with target URI {target_url!r} because of URL filter")
-                    continue
-
                 publisher_domain: str = urlparse(target_url).netloc
 
                 if publisher_domain not in self._publisher_mapping:
                     continue
 
                 publisher = self._publisher_mapping[publisher_domain]
+                self.stats.increment(publisher.name, "cc-news", Metric.URLS_DISCOVERED)
+
+                if url_filter is not None and url_filter(target_url):
+                    logger.debug(f"Skipped WARC record with target URI {target_url!r} because of URL filter")
+                    self.stats.increment(publisher.name, "cc-news", Metric.URLS_FILTERED_URL_FILTER)
+                    continue
 
                 if publisher.url_filter is not None and publisher.url_filter(target_url):
                     logger.debug(
                         f"Skipped WARC record with target URI {target_url!r} because of publisher specific URL filter"
                     )
+                    self.stats.increment(publisher.name, "cc-news", Metric.URLS_FILTERED_URL_FILTER)
                     continue
 
-                if (content := extract_content(warc_record)) is None:
-                    continue
+                warc_body: bytes = warc_record.reader.read()
+                self.stats.increment(publisher.name, "cc-news", Metric.BYTES_DOWNLOADED, len(warc_body))
+
+                start = time.perf_counter()
+                charset = warc_record.http_charset
+                decoded = publisher_encodings.decode(publisher.name, warc_body, charset and f"charset={charset}")
+                self.stats.observe(publisher.name, "cc-news", Metric.DECODE_SECONDS, time.perf_counter() - start)
+                if decoded.method == "chardet":
+                    logger.debug(
+                        f"Decoded record {warc_record.record_id!r} from {target_url!r} with invalid charset "
+                        f"{warc_record.http_charset!r} using detected charset {decoded.encoding!r}"
+                    )
+                    self.stats.increment(publisher.name, "cc-news", Metric.DECODED_WITH_CHARDET)
 
                 yield HTML(
                     requested_url=target_url,
                     responded_url=target_url,
-                    content=content,
+                    content=decoded.text,
                     crawl_date=warc_record.record_date,
                     source_info=WarcSourceInfo(
                         publisher=publisher.name,
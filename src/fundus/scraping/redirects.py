@@ -0,0 +1,145 @@
+import threading
+from collections import OrderedDict
+from typing import NamedTuple, Optional, Tuple
+from urllib.parse import urlsplit, urlunsplit
+
+from fundus.logging import create_logger
+
+logger = create_logger(__name__)
+
+# (impersonate profile, URL)
+_URLKey = Tuple[Optional[str], str]
+# (impersonate profile, scheme, host)
+_OriginKey = Tuple[Optional[str], str, str]
+
+
+class _OriginRule(NamedTuple):
+    scheme: str
+    netloc: str
+    append_slash: bool
+    observations: int
+
+
+def _appends_slash(path: str) -> bool:
+    # paths naming a file, e.g. /sitemap.xml, usually don't get a trailing slash
+    return not path.endswith("/") and "." not in path.rsplit("/", 1)[-1]
+
+
+class RedirectMap:
+    def __init__(self, max_size: int = 10_000, min_observations: int = 2) -> None:
+        """Permanent redirects learned from responses, used to request the redirect target right away.
+
+        Every 301 and 308 redirect is remembered for the redirected URL. If it only changes the
+        scheme and/or host, e.g. http:// to https:// or example.com to www.example.com, and possibly
+        appends a trailing slash, it is also remembered as a rule for the whole origin. Origin rules
+        are applied once <min_observations> consecutive redirects of that origin agreed on them, and
+        dropped as soon as a permanent redirect of the origin contradicts them.
+
+        Since publishers may redirect differently depending on the client, redirects are learned
+        and applied per impersonate profile. Safe to use from multiple threads.
+
+        Args:
+            max_size: Maximum number of URLs and origins to remember each. Once exceeded, the least
+                recently used ones are dropped. Defaults to 10,000.
+            min_observations: Number of agreeing redirects before an origin rule is applied.
+                Defaults to 2.
+        """
+        self.max_size = max_size
+        self.min_observations = min_observations
+        self.hits = 0
+
+        self._urls: "OrderedDict[_URLKey, str]" = OrderedDict()
+        self._origins: "OrderedDict[_OriginKey, _OriginRule]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._urls) + len(self._origins)
+
+    def learn(self, url: str, location: str, impersonate: Optional[str] = None) -> None:
+        """Remembers that <url> permanently redirects to <location>."""
+        if url == location:
+            return
+        source, target = urlsplit(url), urlsplit(location)
+        origin = (impersonate, source.scheme, source.netloc)
+
+        with self._lock:
+            self._urls[(impersonate, url)] = location
+            self._urls.move_to_end((impersonate, url))
+            # a previously learned redirect in the opposite direction is outdated
+            if self._urls.get((impersonate, location)) == url:
+                del self._urls[(impersonate, location)]
+            reverse = self._origins.get((impersonate, target.scheme, target.netloc))
+            if reverse is not None and (reverse.scheme, reverse.netloc) == (source.scheme, source.netloc):
+                del self._origins[(impersonate, target.scheme, target.netloc)]
+
+            if source.query != target.query or target.path not in (source.path, source.path + "/"):
+                # not a pattern we can generalize, so an existing rule for the origin is unreliable
+                self._origins.pop(origin, None)
+            else:
+                append_slash = target.path != source.path
+                rule = self._origins.get(origin)
+                if rule is not None and (rule.scheme, rule.netloc, rule.append_slash) == (
+                    target.scheme,
+                    target.netloc,
+                    append_slash,
+                ):
+                    rule = rule._replace(observations=rule.observations + 1)
+                else:
+                    rule = _OriginRule(target.scheme, target.netloc, append_slash, 1)
+                self._origins[origin] = rule
+                self._origins.move_to_end(origin)
+
+            while len(self._urls) > self.max_size:
+                self._urls.popitem(last=False)
+            while len(self._origins) > self.max_size:
+                self._origins.popitem(last=False)
+
+    def _rewrite_once(self, url: str, impersonate: Optional[str]) -> str:
+        # should only be called while holding the lock
+        if (location := self._urls.get((impersonate, url))) is not None:
+            self._urls.move_to_end((impersonate, url))
+            return location
+
+        parts = urlsplit(url)
+        rule = self._origins.get((impersonate, parts.scheme, parts.netloc))
+        if rule is None or rule.observations < self.min_observations:
+            return url
+        path = parts.path + "/" if rule.append_slash and _appends_slash(parts.path) else parts.path
+        return urlunsplit((rule.scheme, rule.netloc, path, parts.query, parts.fragment))
+
+    def rewrite(self, url: str, impersonate: Optional[str] = None, max_hops: int = 5) -> str:
+        """Returns the URL <url> is known to end up at after following permanent redirects or <url> itself.
+
+        Args:
+            url: The URL to rewrite.
+            impersonate: The impersonate profile the URL will be requested with. Defaults to None.
+            max_hops: Maximum number of learned redirects to follow. Defaults to 5.
+        """
+        with self._lock:
+            seen = {url}
+            current = url
+            for _ in range(max_hops):
+                if (location := self._rewrite_once(current, impersonate)) in seen:
+                    break
+                seen.add(location)
+                current = location
+            if current != url:
+                self.hits += 1
+            return current
+
+    def forget(self, url: str, impersonate: Optional[str] = None) -> None:
+        """Drops everything learned for <url> and its origin, e.g. because the rewritten URL failed."""
+        parts = urlsplit(url)
+        with self._lock:
+            self._urls.pop((impersonate, url), None)
+            self._origins.pop((impersonate, parts.scheme, parts.netloc), None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._urls.clear()
+            self._origins.clear()
+
+
+# shared by all sessions of a process
+permanent_redirects = RedirectMap()
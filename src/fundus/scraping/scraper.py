@@ -1,4 +1,12 @@
-from typing import Dict, Iterator, List, Literal, Optional, Type
+import asyncio
+import logging.config
+import time
+from collections import deque
+from concurrent.futures import Executor
+from datetime import datetime
+from functools import partial
+from multiprocessing.pool import ApplyResult, Pool
+from typing import Any, AsyncIterator, Deque, Dict, Iterator, List, Literal, Optional, Tuple, Type
 
 import more_itertools
 
@@ -6,22 +14,127 @@ from fundus.logging import create_logger
 from fundus.parser import ParserProxy
 from fundus.publishers.base_objects import Publisher
 from fundus.scraping.article import Article
+from fundus.scraping.cache import SourceCache
+from fundus.scraping.checkpoint import Checkpoint, URLStatus
+from fundus.scraping.dedup import InMemoryDeduplicator
 from fundus.scraping.delay import Delay
 from fundus.scraping.filter import (
+    DateWindow,
     ExtractionFilter,
     FilterResultWithMissingAttributes,
     URLFilter,
 )
-from fundus.scraping.html import CCNewsSource, HTMLSource, WebSource
+from fundus.scraping.html import (
+    HTML,
+    AdaptiveRate,
+    AsyncWebSource,
+    CCNewsSource,
+    CircuitBreaker,
+    HTMLSource,
+    WebSource,
+)
+from fundus.scraping.session import AsyncSessionHandler
+from fundus.scraping.stats import CrawlStats, Metric
 from fundus.scraping.url import URLSource
 
 logger = create_logger(__name__)
 
 
+# parsers of all crawled publishers, set once per parse worker process by _init_parse_worker()
+_worker_parsers: Dict[str, ParserProxy] = {}
+
+
+def _init_parse_worker(parsers: Dict[str, ParserProxy], logging_config: Dict[str, Any]) -> None:
+    """Initializer of parse worker processes, so tasks only have to carry the publisher's name."""
+    logging.config.dictConfig(logging_config)
+    _worker_parsers.update(parsers)
+
+
+def _parse_in_process(
+    publisher: str, crawl_date: datetime, content: str, error_handling: Literal["suppress", "catch", "raise"]
+) -> Tuple[Dict[str, Any], float]:
+    """Runs the parser of <publisher> on <content>. Used as target for parse worker processes.
+
+    Returns:
+        The extraction and the time it took in seconds.
+    """
+    start = time.perf_counter()
+    extraction = _worker_parsers[publisher](crawl_date).parse(content, error_handling)
+    return extraction, time.perf_counter() - start
+
+
 class BaseScraper:
-    def __init__(self, *sources: HTMLSource, parser_mapping: Dict[str, ParserProxy]):
+    def __init__(
+        self,
+        *sources: HTMLSource,
+        parser_mapping: Dict[str, ParserProxy],
+        checkpoint: Optional[Checkpoint] = None,
+        stats: Optional[CrawlStats] = None,
+    ):
         self.sources = sources
         self.parser_mapping = parser_mapping
+        self.checkpoint = checkpoint
+        self.stats = stats if stats is not None else CrawlStats()
+
+    def _extract_article(
+        self,
+        html: HTML,
+        error_handling: Literal["suppress", "catch", "raise"],
+        extraction_filter: Optional[ExtractionFilter] = None,
+        language_filter: Optional[List[str]] = None,
+        pending_extraction: Optional["ApplyResult[Tuple[Dict[str, Any], float]]"] = None,
+    ) -> Optional[Article]:
+        parser = self.parser_mapping[html.source_info.publisher]
+        publisher, source = html.source_info.publisher, html.source_info.label
+
+        try:
+            if pending_extraction is None:
+                start = time.perf_counter()
+                extraction = parser(html.crawl_date).parse(html.content, error_handling)
+                parse_time = time.perf_counter() - start
+            else:
+                extraction, parse_time = pending_extraction.get()
+            self.stats.observe(publisher, source, Metric.PARSE_SECONDS, parse_time)
+
+        except Exception as error:
+            if error_handling == "raise":
+                error_message = f"Run into an error processing article {html.requested_url!r}"
+                logger.error(error_message)
+                error.args = (str(error) + "\n\n" + error_message,)
+                raise error
+            elif error_handling == "catch":
+                return Article(html=html, exception=error)
+            elif error_handling == "suppress":
+                logger.info(f"Skipped article at {html.requested_url!r} because of: {error!r}")
+                self.stats.increment(publisher, source, Metric.ARTICLES_DROPPED_PARSE_ERROR)
+            else:
+                raise ValueError(f"Unknown value {error_handling!r} for parameter <error_handling>'")
+
+        else:
+            if extraction_filter and (filter_result := extraction_filter(extraction)):
+                self.stats.increment(publisher, source, Metric.ARTICLES_DROPPED_EXTRACTION_FILTER)
+                if isinstance(filter_result, FilterResultWithMissingAttributes):
+                    logger.debug(
+                        f"Skipped article at {html.requested_url!r} because attribute(s) "
+                        f"{', '.join(filter_result.missing_attributes)!r} is(are) missing"
+                    )
+                else:
+                    logger.debug(f"Skipped article at {html.requested_url!r} because of extraction filter")
+            else:
+                article = Article(html=html, **extraction)
+                if language_filter and article.lang not in language_filter:
+                    self.stats.increment(publisher, source, Metric.ARTICLES_DROPPED_LANGUAGE_FILTER)
+                    logger.debug(
+                        f"Skipped article at {html.requested_url!r} because article language: "
+                        f"{article.lang!r} is not in allowed languages: {language_filter!r}"
+                    )
+                else:
+                    return article
+
+        # skipped articles count as processed, articles handed to the caller are recorded by the crawler
+        if self.checkpoint is not None:
+            self.checkpoint.mark(html.source_info.publisher, html.requested_url, URLStatus.FETCHED)
+        return None
 
     def scrape(
         self,
@@ -29,45 +142,60 @@ class BaseScraper:
         extraction_filter: Optional[ExtractionFilter] = None,
         url_filter: Optional[URLFilter] = None,
         language_filter: Optional[List[str]] = None,
+        parse_pool: Optional[Pool] = None,
+        max_pending: int = 1,
     ) -> Iterator[Article]:
+        """Fetches HTML from all sources and extracts articles.
+
+        If <parse_pool> is given, parsing is offloaded to the pool's worker processes, while this thread
+        continues fetching. At most <max_pending> documents are parsed at once and articles are yielded
+        in the order their HTML was fetched.
+        """
+        if parse_pool is None:
+            for source in self.sources:
+                for html in source.fetch(url_filter=url_filter):
+                    if article := self._extract_article(html, error_handling, extraction_filter, language_filter):
+                        yield article
+            return
+
+        pending: Deque[Tuple[HTML, "ApplyResult[Tuple[Dict[str, Any], float]]"]] = deque()
+
+        def extract_next() -> Optional[Article]:
+            html, extraction = pending.popleft()
+            return self._extract_article(html, error_handling, extraction_filter, language_filter, extraction)
+
         for source in self.sources:
             for html in source.fetch(url_filter=url_filter):
-                parser = self.parser_mapping[html.source_info.publisher]
-
-                try:
-                    extraction = parser(html.crawl_date).parse(html.content, error_handling)
-
-                except Exception as error:
-                    if error_handling == "raise":
-                        error_message = f"Run into an error processing article {html.requested_url!r}"
-                        logger.error(error_message)
-                        error.args = (str(error) + "\n\n" + error_message,)
-                        raise error
-                    elif error_handling == "catch":
-                        yield Article(html=html, exception=error)
-                    elif error_handling == "suppress":
-                        logger.info(f"Skipped article at {html.requested_url!r} because of: {error!r}")
-                    else:
-                        raise ValueError(f"Unknown value {error_handling!r} for parameter <error_handling>'")
+                pending.append(
+                    (
+                        html,
+                        parse_pool.apply_async(
+                            _parse_in_process,
+                            (html.source_info.publisher, html.crawl_date, html.content, error_handling),
+                        ),
+                    )
+                )
+                if len(pending) >= max_pending and (article := extract_next()):
+                    yield article
+
+        while pending:
+            if article := extract_next():
+                yield article
 
-                else:
-                    if extraction_filter and (filter_result := extraction_filter(extraction)):
-                        if isinstance(filter_result, FilterResultWithMissingAttributes):
-                            logger.debug(
-                                f"Skipped article at {html.requested_url!r} because attribute(s) "
-                                f"{', '.join(filter_result.missing_attributes)!r} is(are) missing"
-                            )
-                        else:
-                            logger.debug(f"Skipped article at {html.requested_url!r} because of extraction filter")
-                    else:
-                        article = Article(html=html, **extraction)
-                        if language_filter and article.lang not in language_filter:
-                            logger.debug(
-                                f"Skipped article at {html.requested_url!r} because article language: "
-                                f"{article.lang!r} is not in allowed languages: {language_filter!r}"
-                            )
-                        else:
-                            yield article
+
+def _select_url_sources(
+    publisher: Publisher, restrict_sources_to: Optional[List[Type[URLSource]]] = None
+) -> Tuple[URLSource, ...]:
+    if restrict_sources_to:
+        return tuple(
+            more_itertools.flatten(
+                publisher.source_mapping[source_type]
+                for source_type in restrict_sources_to
+                if source_type in publisher.source_mapping
+            )
+        )
+    else:
+        return tuple(more_itertools.flatten(publisher.source_mapping.values()))
 
 
 class WebScraper(BaseScraper):
@@ -79,36 +207,127 @@ class WebScraper(BaseScraper):
         ignore_robots: bool = False,
         ignore_crawl_delay: bool = False,
         impersonate: bool = False,
+        max_in_flight: int = 1,
+        checkpoint: Optional[Checkpoint] = None,
+        stats: Optional[CrawlStats] = None,
+        source_cache: Optional[SourceCache] = None,
+        circuit_breaker: Optional[CircuitBreaker] = None,
+        date_window: Optional[DateWindow] = None,
     ):
-        if restrict_sources_to:
-            url_sources = tuple(
-                more_itertools.flatten(
-                    publisher.source_mapping[source_type]
-                    for source_type in restrict_sources_to
-                    if source_type in publisher.source_mapping
-                )
+        # shared by all sources, so URLs listed by multiple sources are only requested once
+        seen_urls = InMemoryDeduplicator()
+        # shared by all sources, since they request the same host
+        rate = AdaptiveRate()
+        html_sources = [
+            WebSource(
+                url_source=url_source,
+                publisher=publisher,
+                delay=delay,
+                url_filter=publisher.url_filter,
+                query_parameters=publisher.query_parameter,
+                ignore_robots=ignore_robots,
+                ignore_crawl_delay=ignore_crawl_delay,
+                impersonate=impersonate,
+                max_in_flight=max_in_flight,
+                checkpoint=checkpoint,
+                seen_urls=seen_urls,
+                stats=stats,
+                source_cache=source_cache,
+                rate=rate,
+                circuit_breaker=circuit_breaker,
+                date_window=date_window,
             )
-        else:
-            url_sources = tuple(more_itertools.flatten(publisher.source_mapping.values()))
+            for url_source in _select_url_sources(publisher, restrict_sources_to)
+        ]
+        parser_mapping: Dict[str, ParserProxy] = {publisher.name: publisher.parser}
+        super().__init__(*html_sources, parser_mapping=parser_mapping, checkpoint=checkpoint, stats=stats)
+
 
+class AsyncWebScraper(BaseScraper):
+    sources: Tuple[AsyncWebSource, ...]
+
+    def __init__(
+        self,
+        publisher: Publisher,
+        session_handler: AsyncSessionHandler,
+        restrict_sources_to: Optional[List[Type[URLSource]]] = None,
+        delay: Optional[Delay] = None,
+        ignore_robots: bool = False,
+        ignore_crawl_delay: bool = False,
+        impersonate: bool = False,
+        max_in_flight: int = 1,
+        checkpoint: Optional[Checkpoint] = None,
+        stats: Optional[CrawlStats] = None,
+        source_cache: Optional[SourceCache] = None,
+        circuit_breaker: Optional[CircuitBreaker] = None,
+        date_window: Optional[DateWindow] = None,
+        io_executor: Optional[Executor] = None,
+    ):
+        # shared by all sources, so URLs listed by multiple sources are only requested once
+        seen_urls = InMemoryDeduplicator()
+        # shared by all sources, since they request the same host
+        rate = AdaptiveRate()
         html_sources = [
-            WebSource(
+            AsyncWebSource(
                 url_source=url_source,
                 publisher=publisher,
+                session_handler=session_handler,
                 delay=delay,
                 url_filter=publisher.url_filter,
                 query_parameters=publisher.query_parameter,
                 ignore_robots=ignore_robots,
                 ignore_crawl_delay=ignore_crawl_delay,
                 impersonate=impersonate,
+                max_in_flight=max_in_flight,
+                checkpoint=checkpoint,
+                seen_urls=seen_urls,
+                stats=stats,
+                source_cache=source_cache,
+                rate=rate,
+                circuit_breaker=circuit_breaker,
+                date_window=date_window,
+                io_executor=io_executor,
             )
-            for url_source in url_sources
+            for url_source in _select_url_sources(publisher, restrict_sources_to)
         ]
         parser_mapping: Dict[str, ParserProxy] = {publisher.name: publisher.parser}
-        super().__init__(*html_sources, parser_mapping=parser_mapping)
+        super().__init__(*html_sources, parser_mapping=parser_mapping, checkpoint=checkpoint, stats=stats)
+
+    async def scrape_async(
+        self,
+        error_handling: Literal["suppress", "catch", "raise"],
+        extraction_filter: Optional[ExtractionFilter] = None,
+        url_filter: Optional[URLFilter] = None,
+        language_filter: Optional[List[str]] = None,
+        parse_pool: Optional[Pool] = None,
+    ) -> AsyncIterator[Article]:
+        """Fetches HTML from all sources and extracts articles without blocking the event loop.
+
+        Parsing is CPU-bound and would stall the downloads of all other publishers sharing the loop,
+        so articles are extracted in the loop's default thread executor. If <parse_pool> is given, the
+        parsing itself is offloaded to the pool's worker processes and the thread only awaits the result.
+        """
+        loop = asyncio.get_running_loop()
+        for source in self.sources:
+            async for html in source.fetch_async(url_filter=url_filter):
+                pending_extraction = None
+                if parse_pool is not None:
+                    pending_extraction = parse_pool.apply_async(
+                        _parse_in_process, (html.source_info.publisher, html.crawl_date, html.content, error_handling)
+                    )
+                extract = partial(
+                    self._extract_article,
+                    html,
+                    error_handling,
+                    extraction_filter,
+                    language_filter,
+                    pending_extraction,
+                )
+                if article := await loop.run_in_executor(None, extract):
+                    yield article
 
 
 class CCNewsScraper(BaseScraper):
     def __init__(self, source: CCNewsSource):
         parser_mapping: Dict[str, ParserProxy] = {publisher.name: publisher.parser for publisher in source.publishers}
-        super().__init__(source, parser_mapping=parser_mapping)
+        super().__init__(source, parser_mapping=parser_mapping, stats=source.stats)
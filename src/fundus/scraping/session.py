@@ -1,25 +1,31 @@
 from __future__ import annotations
 
-import re
+import asyncio
+import os
 import threading
+from concurrent.futures import CancelledError, Future
 from contextlib import contextmanager
-from queue import Empty, Queue
-from typing import Any, Dict, Iterator, List, NamedTuple, Optional, Union
+from pathlib import Path
+from typing import Any, Callable, Coroutine, Dict, Iterator, List, Optional, TypeVar, Union, cast
 from urllib.parse import urljoin
 
-import chardet
 import curl_cffi.requests
+from curl_cffi import AsyncCurl
 from curl_cffi.requests import BrowserTypeLiteral
 from curl_cffi.requests.exceptions import HTTPError, TooManyRedirects
 from typing_extensions import Self
 
 from fundus.logging import create_logger
+from fundus.scraping.cache import ResponseCache
+from fundus.scraping.encoding import _detect_encoding_from_bytes
+from fundus.scraping.redirects import RedirectMap, permanent_redirects
 from fundus.utils.events import __EVENTS__
 
 logger = create_logger(__name__)
 
+_T = TypeVar("_T")
+
 _default_header = {"user-agent": "Fundus/2.0 (contact: github.com/flairnlp/fundus)"}
-_charset_re = re.compile(rb"charset\s*=\s*[\"']?\s*([^\"'\s;>]+)", re.IGNORECASE)
 
 
 class CrashThread(BaseException):
@@ -28,148 +34,113 @@ class CrashThread(BaseException):
     pass
 
 
-class _RequestTask(NamedTuple):
-    url: str
-    kwargs: Any
-    result_queue: Queue[Union[curl_cffi.requests.Response, Exception]]
-
-
-def _detect_encoding_from_html(response: bytes) -> Optional[str]:
-    """Extract the charset declared in an HTML meta tag, scanning only the first 2048 bytes."""
-    if match := _charset_re.search(response[:2048]):
-        return match.group(1).decode("ascii", errors="replace")
-    return None
-
-
-def _detect_encoding_from_bytes(response: bytes) -> str:
-    """Detect the character encoding of an HTML response.
-
-    Checks the HTML meta charset tag first, then falls back to chardet,
-    then to UTF-8 if neither yields a result.
-
-    Args:
-        response: Raw response bytes to detect encoding for.
-
-    Returns:
-        Detected encoding string, guaranteed non-empty.
-    """
-    if encoding := _detect_encoding_from_html(response):
-        logger.debug(f"Detected encoding from HTML: {encoding!r}")
-    elif encoding := chardet.detect(response)["encoding"]:
-        logger.debug(f"Detected encoding from chardet: {encoding!r}")
+def _log_response(response: curl_cffi.requests.Response) -> None:
+    history: List[curl_cffi.requests.Response] = object.__getattribute__(response, "_history")
+    method = getattr(getattr(response, "request", None), "method", "GET")
+    if history:
+        hops = f"{history[0].url} → " + " → ".join(
+            f"{r.status_code} {next_r.url}" for r, next_r in zip(history, history[1:] + [response])
+        )
+        chain = f"{method} {hops} → {response.status_code}"
     else:
-        logger.debug("Unable to detect encoding from response. Defaulting to <utf-8>")
-    # see https://github.com/flairNLP/fundus/issues/446
-    return encoding or "utf-8"
+        chain = f"{method} {response.url} -> {response.status_code}"
+    logger.debug(f"{chain} ({response.elapsed}s)")
 
 
-class InterruptableSession(curl_cffi.requests.Session[curl_cffi.requests.Response]):
-    """Extends curl_cffi Session with interruptable requests via a persistent daemon thread.
+class InterruptableSession:
+    """Interruptable requests performed by the process-wide CurlTransport.
 
-    The daemon thread owns the curl handle for the lifetime of the session, enabling
-    connection reuse across requests. get_with_interrupt() submits work to the daemon
-    thread and polls for a stop event every second, raising CrashThread if interrupted.
+    The session holds its configuration and a lazily created session on the shared transport,
+    which drives the requests of all sessions from a single I/O thread. get_with_interrupt()
+    waits for the resulting future and cancels it as soon as the stop event of the calling
+    thread is set, raising CrashThread.
     """
 
-    def __init__(self, **kwargs: Any) -> None:
-        # use_thread_local_curl=True gives the worker thread its own curl handle, separate
-        # from the caller thread's handle closed in close(). Prevents close() from touching
-        # a handle that may still be in use by the worker.
-        kwargs.pop("use_thread_local_curl", None)
-        super().__init__(use_thread_local_curl=True, **kwargs)
+    def __init__(
+        self,
+        impersonate: Optional[BrowserTypeLiteral] = None,
+        cache: Optional[ResponseCache] = None,
+        **kwargs: Any,
+    ) -> None:
+        """
+        Args:
+            impersonate: Browser profile to impersonate, e.g. "chrome". Defaults to None.
+            cache: If set, get_with_interrupt() serves responses stored in <cache> and stores
+                successful responses in it. Defaults to None.
+            **kwargs: curl_cffi session parameters, e.g. timeout=10 or verify=False.
+        """
+        self.impersonate = impersonate
+        self.cache = cache
+        self.session_kwargs = kwargs
         self._closed = False
-        self._task_queue: Queue[Optional[_RequestTask]] = Queue()
-        self._worker_thread = threading.Thread(target=self._worker_loop, name=f"session-worker-{id(self)}", daemon=True)
-        self._worker_thread.start()
-
-    @staticmethod
-    def _log_response(response: curl_cffi.requests.Response) -> None:
-        history: List[curl_cffi.requests.Response] = object.__getattribute__(response, "_history")
-        method = getattr(getattr(response, "request", None), "method", "GET")
-        if history:
-            hops = f"{history[0].url} → " + " → ".join(
-                f"{r.status_code} {next_r.url}" for r, next_r in zip(history, history[1:] + [response])
-            )
-            chain = f"{method} {hops} → {response.status_code}"
-        else:
-            chain = f"{method} {response.url} -> {response.status_code}"
-        logger.debug(f"{chain} ({response.elapsed}s)")
+        self._lock = threading.Lock()
+        self._transport: Optional[CurlTransport] = None
+        self._session: Optional[AsyncInterruptableSession] = None
 
-    def _follow_redirects(self, url: str, **kwargs: Any) -> curl_cffi.requests.Response:
-        """Follow redirects manually, building a response history."""
-        history: List[curl_cffi.requests.Response] = []
-        current = url
+    def submit(self, url: str, **kwargs: Any) -> Future[curl_cffi.requests.Response]:
+        """Submit a GET request to the transport without waiting for it.
 
-        for _ in range(self.max_redirects):
-            response: curl_cffi.requests.Response = self.get(current, **kwargs, allow_redirects=False)
-
-            if not (300 <= response.status_code <= 399):
-                object.__setattr__(response, "_history", history)
-                return response
-
-            location = response.headers.get("location")
-            if not location:
-                raise HTTPError(f"Redirect {response.status_code} from {current!r} missing Location header")
-
-            history.append(response)
-            current = urljoin(str(response.url), location)
-
-        raise TooManyRedirects(f"Exceeded {self.max_redirects} maximum redirects following {url!r}")
-
-    def _worker_loop(self) -> None:
-        while True:
-            task = self._task_queue.get()
-            if task is None:
-                return
-            try:
-                task.result_queue.put(self._follow_redirects(task.url, **task.kwargs))
-            except Exception as error:
-                task.result_queue.put(error)
+        Redirects are followed and non-2xx responses resolve the future with an HTTPError. When
+        impersonating a browser, kwargs are dropped so curl_cffi can apply the full browser
+        fingerprint unmodified. Cancelling the future aborts the request.
+        """
+        if self._closed:
+            raise RuntimeError("Session is closed")
+        with self._lock:
+            transport = get_transport()
+            if self._session is None or self._transport is not transport:
+                self._transport = transport
+                self._session = transport.create_session(
+                    impersonate=self.impersonate, redirects=permanent_redirects, **self.session_kwargs
+                )
+            session = self._session
+        return transport.submit(session.get_with_interrupt(url, **kwargs))
 
     def get_with_interrupt(self, url: str, **kwargs: Any) -> curl_cffi.requests.Response:
         """Interruptable GET request.
 
-        Submits the request to the persistent daemon thread and polls every second
-        for a stop event. Raises CrashThread if interrupted. When impersonating a
-        browser, kwargs are dropped so curl_cffi can apply the full browser
-        fingerprint unmodified.
+        Blocks until the response arrives. If the stop event of the calling thread is set in
+        the meantime, the request is cancelled right away and CrashThread is raised. If the
+        session has a cache, responses stored in it are returned without a request.
         """
-        if self._closed:
-            raise RuntimeError("Session is closed")
-        request_kwargs: Dict[str, Any] = {} if self.impersonate else kwargs
-        response_queue: Queue[Union[curl_cffi.requests.Response, Exception]] = Queue()
-        self._task_queue.put(_RequestTask(url, request_kwargs, response_queue))
-
-        while True:
-            try:
-                response = response_queue.get(timeout=1)
-            except Empty:
-                if __EVENTS__.is_event_set("stop"):
-                    logger.debug(f"Interrupt request for {url!r}")
-                    raise CrashThread(f"Request to {url} was interrupted by stop event")
-            else:
-                if isinstance(response, Exception):
-                    raise response
-                self._log_response(response)
-                response.raise_for_status()
-                return response
+        if self.cache is not None and (cached := self.cache.get(url)) is not None:
+            logger.debug(f"GET {url} -> {cached.status_code} (cached)")
+            cached.default_encoding = self.session_kwargs.get("default_encoding", "utf-8")
+            return cached
+
+        future = self.submit(url, **kwargs)
+        remove_callback = __EVENTS__.add_callback("stop", future.cancel)
+        try:
+            response = future.result()
+        except CancelledError:
+            logger.debug(f"Interrupt request for {url!r}")
+            raise CrashThread(f"Request to {url} was interrupted by stop event")
+        finally:
+            remove_callback()
+
+        if self.cache is not None and 200 <= response.status_code < 300:
+            self.cache.store(url, response)
+        return response
 
     def close(self) -> None:
-        """Signal the worker thread to exit and close this thread's curl handle.
+        """Release the curl handles of this session.
 
-        Sending the sentinel is non-blocking — the daemon thread exits asynchronously
-        after finishing any in-flight request. Safe to call while a request is in flight.
+        Non-blocking and safe to call while a request is in flight. Once the request finished,
+        its handle is removed from the multi handle and, since the session is closed, closed by
+        AsyncSession.release_curl() instead of being returned to the session's pool.
         """
         self._closed = True
-        self._task_queue.put(None)
-        super().close()
+        with self._lock:
+            session, self._session = self._session, None
+        if session is not None and self._transport is not None:
+            self._transport.release_session(session)
 
 
 class SessionHandler:
     """Manages one InterruptableSession per thread via a thread-id registry.
 
-    Each thread gets its own session instance backed by a persistent daemon thread,
-    enabling connection reuse within a thread. Sessions are created lazily on first use.
+    Each thread gets its own session instance, all of them share the connections of the
+    process-wide CurlTransport. Sessions are created lazily on first use.
     If get_session() is called with a different impersonate profile than the existing
     session, the old session is closed and replaced.
     """
@@ -178,6 +149,7 @@ class SessionHandler:
 
     def __init__(self) -> None:
         self._session_kwargs: Dict[str, Any] = dict(self.DEFAULT_SESSION_KWARGS)
+        self._cache: Optional[ResponseCache] = None
         self._context_lock = threading.RLock()
         self._sessions: Dict[int, InterruptableSession] = {}
 
@@ -195,14 +167,22 @@ class SessionHandler:
             session.close()
             session = None
         if session is None:
-            session = InterruptableSession(
-                impersonate=impersonate,
-                default_encoding=_detect_encoding_from_bytes,
-                **self._session_kwargs,
-            )
+            session = self.create_session(impersonate)
             self._sessions[tid] = session
         return session
 
+    def create_session(self, impersonate: Optional[BrowserTypeLiteral] = None) -> InterruptableSession:
+        """Return a new session with the current kwargs that is not bound to a thread.
+
+        Useful to submit many requests at once from a single thread. The caller has to close it.
+        """
+        return InterruptableSession(
+            impersonate=impersonate,
+            cache=self._cache,
+            default_encoding=_detect_encoding_from_bytes,
+            **self._session_kwargs,
+        )
+
     def close_sessions(self) -> None:
         """Closes and removes all open sessions."""
         sessions, self._sessions = self._sessions, {}
@@ -211,13 +191,29 @@ class SessionHandler:
             session.close()
 
     @contextmanager
-    def context(self, **kwargs: Any) -> Iterator[Self]:
+    def context(
+        self,
+        cache_dir: Union[None, str, Path] = None,
+        cache_ttl: Optional[float] = None,
+        cache_max_size: Optional[int] = 2**30,
+        **kwargs: Any,
+    ) -> Iterator[Self]:
         """Context manager for temporarily overriding session kwargs.
 
         Merges kwargs with the defaults for the duration of the block, then
         restores the previous state on exit. Only one context may be active at a time.
 
+        Examples:
+            >>> # download articles once and serve them from disk afterward, e.g. while developing a parser
+            >>> with session_handler.context(cache_dir="response_cache"):
+            >>>     for article in crawler.crawl(max_articles=100):
+            >>>         print(article.title)
+
         Args:
+            cache_dir: If set, successful responses are stored in a ResponseCache within this directory
+                and served from it instead of being downloaded again. Defaults to None.
+            cache_ttl: See ResponseCache. Defaults to None.
+            cache_max_size: See ResponseCache. Defaults to 1 GiB.
             **kwargs: Any curl_cffi Session kwargs to override (e.g. timeout=10, verify=False).
 
         Raises:
@@ -231,16 +227,254 @@ class SessionHandler:
 
         prev_kwargs = self._session_kwargs
         prev_sessions = self._sessions
+        prev_cache = self._cache
         self._session_kwargs = {**self.DEFAULT_SESSION_KWARGS, **kwargs}
         self._sessions = {}
+        if cache_dir is not None:
+            self._cache = ResponseCache(cache_dir, ttl=cache_ttl, max_size=cache_max_size)
 
         try:
             yield self
         finally:
             self.close_sessions()
+            if self._cache is not prev_cache and self._cache is not None:
+                self._cache.close()
             self._session_kwargs = prev_kwargs
             self._sessions = prev_sessions
+            self._cache = prev_cache
             self._context_lock.release()
 
 
 session_handler = SessionHandler()
+
+
+class AsyncInterruptableSession(curl_cffi.requests.AsyncSession[curl_cffi.requests.Response]):
+    """Asynchronous session used by the async crawl engine and, through the CurlTransport, by InterruptableSession.
+
+    Requests run as coroutines on the event loop driving the session's AsyncCurl multi handle.
+    Interrupting a request is done by cancelling the awaiting task, so no polling is needed.
+    """
+
+    def __init__(
+        self,
+        *args: Any,
+        redirects: Optional[RedirectMap] = None,
+        cache: Optional[ResponseCache] = None,
+        **kwargs: Any,
+    ) -> None:
+        """
+        Args:
+            *args: curl_cffi AsyncSession parameters.
+            redirects: If set, permanent redirects are learned in <redirects> and URLs known to be
+                redirected are requested at their target right away. Defaults to None.
+            cache: If set, get_with_interrupt() serves responses stored in <cache> and stores
+                successful responses in it. Defaults to None.
+            **kwargs: curl_cffi AsyncSession parameters.
+        """
+        super().__init__(*args, **kwargs)
+        self.redirects = redirects
+        self.cache = cache
+
+    async def _follow_redirects(self, url: str, **kwargs: Any) -> curl_cffi.requests.Response:
+        """Follow redirects manually, building a response history."""
+        history: List[curl_cffi.requests.Response] = []
+        current = url if self.redirects is None else self.redirects.rewrite(url, self.impersonate)
+        if current != url:
+            logger.debug(f"Rewrote {url!r} to {current!r} because of a known permanent redirect")
+
+        for _ in range(self.max_redirects):
+            response: curl_cffi.requests.Response = await self.get(current, **kwargs, allow_redirects=False)
+
+            # 304 Not Modified answers a conditional request and has no Location
+            if not (300 <= response.status_code <= 399) or response.status_code == 304:
+                if response.status_code >= 400 and self.redirects is not None and current != url and not history:
+                    # the learned redirect might be outdated, so request the original URL once more
+                    logger.debug(f"Rewritten URL {current!r} failed with {response.status_code}, retrying {url!r}")
+                    self.redirects.forget(url, self.impersonate)
+                    current = url
+                    continue
+                object.__setattr__(response, "_history", history)
+                return response
+
+            location = response.headers.get("location")
+            if not location:
+                raise HTTPError(f"Redirect {response.status_code} from {current!r} missing Location header")
+
+            history.append(response)
+            target = urljoin(str(response.url), location)
+            if response.status_code in (301, 308) and self.redirects is not None:
+                self.redirects.learn(current, target, self.impersonate)
+            current = target
+
+        raise TooManyRedirects(f"Exceeded {self.max_redirects} maximum redirects following {url!r}")
+
+    async def get_with_interrupt(self, url: str, **kwargs: Any) -> curl_cffi.requests.Response:
+        """Cancellable GET request.
+
+        Kwargs are dropped when impersonating a browser, so curl_cffi can apply the full browser
+        fingerprint unmodified, and non-2xx responses raise an HTTPError. If the session has a
+        cache, responses stored in it are returned without a request. Cache lookups run in the
+        default executor of the event loop, so they don't block other requests.
+        """
+        loop = asyncio.get_running_loop()
+        if self.cache is not None and (cached := await loop.run_in_executor(None, self.cache.get, url)) is not None:
+            logger.debug(f"GET {url} -> {cached.status_code} (cached)")
+            cached.default_encoding = self.default_encoding
+            return cached
+
+        request_kwargs: Dict[str, Any] = {} if self.impersonate else kwargs
+        response = await self._follow_redirects(url, **request_kwargs)
+        _log_response(response)
+        response.raise_for_status()
+
+        if self.cache is not None and 200 <= response.status_code < 300:
+            await loop.run_in_executor(None, self.cache.store, url, response)
+        return response
+
+
+class _SharedAsyncCurl:
+    """Non-owning view of an AsyncCurl multi handle shared by multiple sessions.
+
+    Closing a curl_cffi AsyncSession also closes its multi handle. Sessions are given this view
+    instead of the multi handle itself, so AsyncSession.close() only closes the session's curl
+    handles, while the multi handle is closed by its owner. Handles of requests still in flight
+    when the session is closed are removed from the multi handle once they finished, and then
+    closed by AsyncSession.release_curl(), which no longer returns handles to the pool of a
+    closed session.
+    """
+
+    def __init__(self, async_curl: AsyncCurl) -> None:
+        self._async_curl = async_curl
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._async_curl, name)
+
+    async def close(self) -> None:
+        pass
+
+
+def _share(async_curl: AsyncCurl) -> AsyncCurl:
+    return cast(AsyncCurl, _SharedAsyncCurl(async_curl))
+
+
+class CurlTransport:
+    """Performs the requests of all InterruptableSessions of a process on one libcurl multi handle.
+
+    A single daemon thread runs an event loop driving the multi handle, so in-flight requests
+    don't occupy a thread each. Requests can be submitted from any thread and return futures;
+    cancelling a future aborts its request right away. Use get_transport() to get the transport
+    of the current process.
+    """
+
+    def __init__(self) -> None:
+        self.pid = os.getpid()
+        self._loop = asyncio.new_event_loop()
+        self._async_curl: Optional[AsyncCurl] = None
+        self._thread = threading.Thread(target=self._loop.run_forever, name="fundus-curl-transport", daemon=True)
+        self._thread.start()
+
+    @property
+    def is_alive(self) -> bool:
+        # the I/O thread does not survive forking
+        return self.pid == os.getpid() and self._thread.is_alive()
+
+    def _call(self, func: Callable[[], _T]) -> _T:
+        """Run <func> on the I/O thread and wait for its result."""
+
+        async def call() -> _T:
+            return func()
+
+        return asyncio.run_coroutine_threadsafe(call(), self._loop).result()
+
+    def create_session(self, **kwargs: Any) -> AsyncInterruptableSession:
+        """Create a session using the shared multi handle. Kwargs are passed to the session."""
+
+        def create() -> AsyncInterruptableSession:
+            if self._async_curl is None:
+                self._async_curl = AsyncCurl()
+            return AsyncInterruptableSession(async_curl=_share(self._async_curl), **kwargs)
+
+        return self._call(create)
+
+    def submit(self, coroutine: Coroutine[Any, Any, _T]) -> Future[_T]:
+        """Schedule <coroutine>, e.g. a request of a session created by this transport, on the I/O thread."""
+        return asyncio.run_coroutine_threadsafe(coroutine, self._loop)
+
+    def release_session(self, session: AsyncInterruptableSession) -> Future[None]:
+        """Close <session> on the I/O thread. The shared multi handle stays open."""
+        return asyncio.run_coroutine_threadsafe(session.close(), self._loop)
+
+    def close(self) -> None:
+        """Close the multi handle and stop the I/O thread. In-flight requests fail."""
+        if not self.is_alive:
+            return
+
+        async def shutdown() -> None:
+            if self._async_curl is not None:
+                await self._async_curl.close()
+                self._async_curl = None
+
+        asyncio.run_coroutine_threadsafe(shutdown(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+
+
+_transport: Optional[CurlTransport] = None
+_transport_lock = threading.Lock()
+
+
+def get_transport() -> CurlTransport:
+    """Return the CurlTransport of the current process, starting it if necessary."""
+    global _transport
+    with _transport_lock:
+        if _transport is None or not _transport.is_alive:
+            _transport = CurlTransport()
+        return _transport
+
+
+class AsyncSessionHandler:
+    """Manages one AsyncInterruptableSession per impersonate profile for a single event loop.
+
+    All sessions share one AsyncCurl multi handle, so every in-flight request of the async crawl
+    engine is driven by the same event loop. Session kwargs and the response cache are taken
+    from <session_handler>, so an active <session_handler.context()> applies to async sessions
+    as well.
+
+    Must be created and used from within a running event loop.
+    """
+
+    def __init__(self, max_connections: int = 100) -> None:
+        self.max_connections = max_connections
+        self._session_kwargs: Dict[str, Any] = dict(session_handler._session_kwargs)
+        self._cache = session_handler._cache
+        self._async_curl: Optional[AsyncCurl] = None
+        self._sessions: Dict[Optional[BrowserTypeLiteral], AsyncInterruptableSession] = {}
+
+    def get_session(self, impersonate: Optional[BrowserTypeLiteral] = None) -> AsyncInterruptableSession:
+        """Return the session for <impersonate>, creating it lazily if needed."""
+        if self._async_curl is None:
+            self._async_curl = AsyncCurl()
+        if (session := self._sessions.get(impersonate)) is None:
+            session = AsyncInterruptableSession(
+                async_curl=_share(self._async_curl),
+                max_clients=self.max_connections,
+                impersonate=impersonate,
+                redirects=permanent_redirects,
+                cache=self._cache,
+                default_encoding=_detect_encoding_from_bytes,
+                **self._session_kwargs,
+            )
+            self._sessions[impersonate] = session
+        return session
+
+    async def close_sessions(self) -> None:
+        """Closes all open sessions and the shared multi handle."""
+        sessions, self._sessions = self._sessions, {}
+        for impersonate, session in sessions.items():
+            logger.debug(f"Close async session (impersonate={impersonate!r})")
+            # the shared multi handle is closed below
+            await session.close()
+        if self._async_curl is not None:
+            await self._async_curl.close()
+            self._async_curl = None
@@ -0,0 +1,235 @@
+import bisect
+import json
+import math
+import os
+import threading
+from collections import Counter, defaultdict
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+
+class Metric:
+    """Names of the metrics recorded in CrawlStats."""
+
+    # counters
+    URLS_DISCOVERED = "urls_discovered"
+    URLS_FILTERED_URL_FILTER = "urls_filtered_url_filter"
+    URLS_FILTERED_ROBOTS = "urls_filtered_robots"
+    URLS_FILTERED_DUPLICATE = "urls_filtered_duplicate"
+    URLS_FILTERED_CHECKPOINT = "urls_filtered_checkpoint"
+    URLS_FILTERED_DATE = "urls_filtered_date"
+    REQUESTS_FAILED = "requests_failed"
+    REQUESTS_THROTTLED = "requests_throttled"
+    URLS_REQUEUED = "urls_requeued"
+    RATE_DECREASES = "rate_decreases"
+    RATE_INCREASES = "rate_increases"
+    CIRCUIT_BREAKER_TRIPS = "circuit_breaker_trips"
+    URLS_SKIPPED_CIRCUIT_OPEN = "urls_skipped_circuit_open"
+    BYTES_DOWNLOADED = "bytes_downloaded"
+    DECODED_WITH_CHARDET = "decoded_with_chardet"
+    ARTICLES_DROPPED_PARSE_ERROR = "articles_dropped_parse_error"
+    ARTICLES_DROPPED_EXTRACTION_FILTER = "articles_dropped_extraction_filter"
+    ARTICLES_DROPPED_LANGUAGE_FILTER = "articles_dropped_language_filter"
+    ARTICLES_DROPPED_DUPLICATE = "articles_dropped_duplicate"
+    ARTICLES_YIELDED = "articles_yielded"
+
+    # histograms
+    REQUEST_SECONDS = "request_seconds"
+    THROTTLE_WAIT_SECONDS = "throttle_wait_seconds"
+    DECODE_SECONDS = "decode_seconds"
+    PARSE_SECONDS = "parse_seconds"
+
+
+DEFAULT_BUCKETS: Tuple[float, ...] = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+_Key = Tuple[str, str]
+
+
+class Histogram:
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        """A histogram with fixed bucket boundaries, counting observations <= each boundary."""
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def merge(self, other: "Histogram") -> None:
+        if self.buckets != other.buckets:
+            raise ValueError("Cannot merge histograms with different buckets")
+        self.counts = [a + b for a, b in zip(self.counts, other.counts)]
+        self.sum += other.sum
+        self.count += other.count
+
+    def cumulative(self) -> Iterator[Tuple[float, int]]:
+        """Yields (upper bound, number of observations <= upper bound), ending with infinity."""
+        total = 0
+        for bound, count in zip(self.buckets + (math.inf,), self.counts):
+            total += count
+            yield bound, total
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "sum": self.sum,
+            "buckets": {("+Inf" if math.isinf(bound) else str(bound)): count for bound, count in self.cumulative()},
+        }
+
+
+class CrawlStats:
+    def __init__(self) -> None:
+        """Thread-safe metrics of a crawl, recorded per publisher and source.
+
+        Counters, e.g. the number of discovered URLs or downloaded bytes, and histograms, e.g. request
+        latencies or parse times, are keyed by publisher name and source. For web crawls the source is
+        the URL of the URLSource, for CC-NEWS crawls it is 'cc-news'.
+
+        Examples:
+            >>> crawler = Crawler(PublisherCollection.us)
+            >>> for article in crawler.crawl(max_articles=100):
+            >>>     pass
+            >>> crawler.stats.by_publisher()
+            >>> crawler.stats.export("stats.prom")
+        """
+        self._lock = threading.Lock()
+        self._counters: Dict[_Key, Counter[str]] = defaultdict(Counter)
+        self._histograms: Dict[_Key, Dict[str, Histogram]] = defaultdict(dict)
+
+    def increment(self, publisher: str, source: str, metric: str, value: int = 1) -> None:
+        with self._lock:
+            self._counters[(publisher, source)][metric] += value
+
+    def observe(self, publisher: str, source: str, metric: str, value: float) -> None:
+        with self._lock:
+            histograms = self._histograms[(publisher, source)]
+            if (histogram := histograms.get(metric)) is None:
+                histogram = histograms[metric] = Histogram()
+            histogram.observe(value)
+
+    def get(self, metric: str, publisher: Optional[str] = None, source: Optional[str] = None) -> float:
+        """Returns the sum of counter <metric>, optionally restricted to <publisher> and <source>.
+
+        For histograms, the sum of all observed values is returned.
+        """
+        with self._lock:
+            total: float = 0
+            for (p, s), counter in self._counters.items():
+                if (publisher is None or p == publisher) and (source is None or s == source):
+                    total += counter.get(metric, 0)
+            for (p, s), histograms in self._histograms.items():
+                if (publisher is None or p == publisher) and (source is None or s == source):
+                    if (histogram := histograms.get(metric)) is not None:
+                        total += histogram.sum
+            return total
+
+    def by_publisher(self) -> Dict[str, Dict[str, float]]:
+        """Returns counters and histogram sums aggregated per publisher."""
+        result: Dict[str, Dict[str, float]] = defaultdict(lambda: defaultdict(float))
+        with self._lock:
+            for (publisher, _), counter in self._counters.items():
+                for metric, value in counter.items():
+                    result[publisher][metric] += value
+            for (publisher, _), histograms in self._histograms.items():
+                for metric, histogram in histograms.items():
+                    result[publisher][metric] += histogram.sum
+        return {publisher: dict(metrics) for publisher, metrics in result.items()}
+
+    def merge(self, other: "CrawlStats") -> None:
+        """Adds the metrics of <other> to this instance."""
+        with other._lock:
+            counters = {key: Counter(counter) for key, counter in other._counters.items()}
+            histograms = dict(other._histograms)
+        with self._lock:
+            for key, counter in counters.items():
+                self._counters[key].update(counter)
+            for key, named_histograms in histograms.items():
+                for metric, histogram in named_histograms.items():
+                    if (own := self._histograms[key].get(metric)) is None:
+                        own = self._histograms[key][metric] = Histogram(histogram.buckets)
+                    own.merge(histogram)
+
+    def pop(self) -> "CrawlStats":
+        """Returns the metrics recorded so far and resets this instance.
+
+        Used to hand metrics recorded in worker processes over to the main process.
+        """
+        popped = CrawlStats()
+        with self._lock:
+            popped._counters, self._counters = self._counters, defaultdict(Counter)
+            popped._histograms, self._histograms = self._histograms, defaultdict(dict)
+        return popped
+
+    def __getstate__(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"counters": dict(self._counters), "histograms": dict(self._histograms)}
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__init__()  # type: ignore[misc]
+        self._counters.update(state["counters"])
+        self._histograms.update(state["histograms"])
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Returns all metrics as a JSON serializable dictionary: publisher -> source -> metric -> value."""
+        result: Dict[str, Dict[str, Dict[str, Any]]] = defaultdict(lambda: defaultdict(dict))
+        with self._lock:
+            for (publisher, source), counter in self._counters.items():
+                result[publisher][source].update(counter)
+            for (publisher, source), histograms in self._histograms.items():
+                for metric, histogram in histograms.items():
+                    result[publisher][source][metric] = histogram.to_dict()
+        return {publisher: dict(sources) for publisher, sources in result.items()}
+
+    def to_json(self, **kwargs: Any) -> str:
+        return json.dumps(self.to_dict(), **kwargs)
+
+    def to_prometheus(self, prefix: str = "fundus") -> str:
+        """Renders all metrics in the Prometheus text exposition format."""
+
+        def escape(value: str) -> str:
+            return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+        def labels(key: _Key, **extra: str) -> str:
+            pairs = [("publisher", key[0]), ("source", key[1])] + list(extra.items())
+            return "{" + ",".join(f'{name}="{escape(value)}"' for name, value in pairs) + "}"
+
+        counter_lines: Dict[str, List[str]] = defaultdict(list)
+        histogram_lines: Dict[str, List[str]] = defaultdict(list)
+        with self._lock:
+            for key, counter in sorted(self._counters.items()):
+                for metric, value in counter.items():
+                    counter_lines[metric].append(f"{prefix}_{metric}_total{labels(key)} {value}")
+            for key, histograms in sorted(self._histograms.items()):
+                for metric, histogram in histograms.items():
+                    name = f"{prefix}_{metric}"
+                    for bound, count in histogram.cumulative():
+                        le = "+Inf" if math.isinf(bound) else str(bound)
+                        histogram_lines[metric].append(f"{name}_bucket{labels(key, le=le)} {count}")
+                    histogram_lines[metric].append(f"{name}_sum{labels(key)} {histogram.sum}")
+                    histogram_lines[metric].append(f"{name}_count{labels(key)} {histogram.count}")
+
+        lines: List[str] = []
+        for metric, metric_lines in sorted(counter_lines.items()):
+            lines.append(f"# TYPE {prefix}_{metric}_total counter")
+            lines.extend(metric_lines)
+        for metric, metric_lines in sorted(histogram_lines.items()):
+            lines.append(f"# TYPE {prefix}_{metric} histogram")
+            lines.extend(metric_lines)
+        return "\n".join(lines) + "\n"
+
+    def export(self, path: Union[str, Path]) -> None:
+        """Writes all metrics to <path>.
+
+        Files ending with `.prom` are written in the Prometheus text format, e.g. for node_exporter's
+        textfile collector, all others as JSON. The file is replaced atomically, so it is safe to export
+        repeatedly while a collector reads it.
+        """
+        path = Path(path)
+        content = self.to_prometheus() if path.suffix == ".prom" else self.to_json(indent=4)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f".{path.name}.tmp")
+        tmp_path.write_text(content, encoding="utf-8")
+        os.replace(tmp_path, path)
@@ -1,11 +1,22 @@
+import asyncio
 import bz2
 import gzip
+import io
 import itertools
 import lzma
+import threading
+import time
 from abc import ABC, abstractmethod
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
 from functools import cached_property, partial
 from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
     Callable,
     ClassVar,
     Dict,
@@ -15,28 +26,47 @@ from typing import (
     Optional,
     Pattern,
     Set,
+    Tuple,
+    TypeVar,
+    Union,
 )
 from urllib.parse import unquote, urlparse
 
-import feedparser
 import lxml.html
+from curl_cffi.requests import Response
 from curl_cffi.requests.exceptions import ConnectionError, HTTPError, Timeout
-from lxml.etree import XMLParser, XPath
+from dateutil.parser import isoparse
+from lxml.etree import XMLPullParser, XMLSyntaxError
 
 from fundus.logging import create_logger
-from fundus.scraping.filter import URLFilter, inverse
-from fundus.scraping.session import InterruptableSession, _default_header, session_handler
+from fundus.scraping.cache import CachedResponse, SourceCache
+from fundus.scraping.filter import DateWindow, URLFilter, inverse
+from fundus.scraping.session import (
+    AsyncInterruptableSession,
+    InterruptableSession,
+    _default_header,
+    session_handler,
+)
+from fundus.utils.events import __EVENTS__
 
 logger = create_logger(__name__)
 
+_T = TypeVar("_T")
+
 
 class CompressionFormat:
     def __init__(
-        self, name: str, decompression: Optional[Callable[[bytes], bytes]] = None, *, byte_mask: Optional[bytes] = None
+        self,
+        name: str,
+        decompression: Optional[Callable[[bytes], bytes]] = None,
+        *,
+        byte_mask: Optional[bytes] = None,
+        stream: Optional[Callable[[io.BytesIO], io.BufferedIOBase]] = None,
     ) -> None:
         self.name = name
         self.decompression = decompression
         self.byte_mask = byte_mask
+        self.stream = stream
 
     def match(self, compressed_content: bytes) -> bool:
         if self.byte_mask:
@@ -48,6 +78,12 @@ class CompressionFormat:
             raise NotImplementedError(f"Decompression not implemented for {self.name!r}")
         return self.decompression(compressed_content)
 
+    def open(self, compressed_content: bytes) -> io.BufferedIOBase:
+        """Returns a file object decompressing <compressed_content> while it is read."""
+        if self.stream is None:
+            raise NotImplementedError(f"Streaming decompression not implemented for {self.name!r}")
+        return self.stream(io.BytesIO(compressed_content))
+
     def __repr__(self):
         if self.decompression is None:
             return f"{self.name} -- Not implemented"
@@ -55,10 +91,12 @@ class CompressionFormat:
 
 
 class CompressionFormats:
-    GZIP = CompressionFormat("gzip", gzip.decompress, byte_mask=b"\x1f\x8b")
-    BZ2 = CompressionFormat("bz2", bz2.decompress, byte_mask=b"\x42\x5a")
+    GZIP = CompressionFormat(
+        "gzip", gzip.decompress, byte_mask=b"\x1f\x8b", stream=lambda file: gzip.GzipFile(fileobj=file)
+    )
+    BZ2 = CompressionFormat("bz2", bz2.decompress, byte_mask=b"\x42\x5a", stream=bz2.BZ2File)
     ZIP = CompressionFormat("zip", byte_mask=b"PK\x03\x04")
-    LZMA = CompressionFormat("lzma", lzma.decompress, byte_mask=b"\x28\xb5\x2f\xfd")
+    LZMA = CompressionFormat("lzma", lzma.decompress, byte_mask=b"\x28\xb5\x2f\xfd", stream=lzma.LZMAFile)
 
     @classmethod
     def iter_formats(cls) -> Iterator[CompressionFormat]:
@@ -81,18 +119,33 @@ class _ArchiveDecompressor:
             "application/x-gzip": CompressionFormats.GZIP,
             "gzip": CompressionFormats.GZIP,
         }
+        self.stream_mapping: Dict[str, Callable[[bytes], io.BufferedIOBase]] = {
+            "application/octet-stream": self._open_octet_stream,
+            "application/x-gzip": CompressionFormats.GZIP.open,
+            "gzip": CompressionFormats.GZIP.open,
+        }
 
-    def _decompress_octet_stream(self, compressed_content: bytes) -> bytes:
+    @staticmethod
+    def _identify(compressed_content: bytes) -> CompressionFormat:
         if (compression_format := CompressionFormats.identify(compressed_content)) is None:
             logger.debug("Could not identify compression format")
             raise NotImplementedError
+        return compression_format
+
+    def _decompress_octet_stream(self, compressed_content: bytes) -> bytes:
+        return self._identify(compressed_content)(compressed_content)
 
-        return compression_format(compressed_content)
+    def _open_octet_stream(self, compressed_content: bytes) -> io.BufferedIOBase:
+        return self._identify(compressed_content).open(compressed_content)
 
     def decompress(self, content: bytes, file_format: "str") -> bytes:
         decompress_function = self.archive_mapping[file_format]
         return decompress_function(content)
 
+    def open(self, content: bytes, file_format: str) -> io.BufferedIOBase:
+        """Like decompress(), but returns a file object decompressing <content> while it is read."""
+        return self.stream_mapping[file_format](content)
+
     @cached_property
     def supported_file_formats(self) -> List[str]:
         return list(self.archive_mapping.keys())
@@ -107,6 +160,71 @@ def clean_url(url: str) -> str:
     return unquote(url)
 
 
+class URLRecord(str):
+    """A URL along with the dates its URL source lists for it.
+
+    Behaves like the plain URL string, so it can be used wherever URLs are expected.
+    """
+
+    lastmod: Optional[datetime]
+    publication_date: Optional[datetime]
+
+    def __new__(
+        cls, url: str, lastmod: Optional[datetime] = None, publication_date: Optional[datetime] = None
+    ) -> "URLRecord":
+        record = super().__new__(cls, url)
+        record.lastmod = lastmod
+        record.publication_date = publication_date
+        return record
+
+    @property
+    def date(self) -> Optional[datetime]:
+        """The publication date if listed, otherwise the date of the last modification."""
+        return self.publication_date or self.lastmod
+
+
+def _parse_date(value: Optional[str]) -> Optional[datetime]:
+    if not value:
+        return None
+    try:
+        return isoparse(value.strip())
+    except (ValueError, OverflowError):
+        logger.debug(f"Couldn't parse date {value!r}")
+        return None
+
+
+def _parse_rfc822_date(value: str) -> Optional[datetime]:
+    # the date format of RSS 2.0, e.g. Sat, 07 Sep 2002 00:00:01 GMT
+    try:
+        return parsedate_to_datetime(value.strip())
+    except (TypeError, ValueError, IndexError):
+        logger.debug(f"Couldn't parse date {value!r}")
+        return None
+
+
+def _to_record(url: str, lastmod: Optional[datetime], publication_date: Optional[datetime]) -> str:
+    # plain strings for URLs without dates keep memory usage of large sitemaps low
+    if lastmod is None and publication_date is None:
+        return url
+    return URLRecord(url, lastmod, publication_date)
+
+
+def normalize_url(url: str) -> str:
+    """Normalizes <url> for comparison.
+
+    Lowercases scheme and host, drops default ports and fragments and removes surrounding whitespace.
+    Path and query are kept, since they usually identify the article.
+    """
+    parsed = urlparse(url.strip())
+    scheme = parsed.scheme.lower()
+    netloc = (parsed.hostname or "").lower()
+    if parsed.port and (scheme, parsed.port) not in (("http", 80), ("https", 443)):
+        netloc += f":{parsed.port}"
+    if parsed.username or parsed.password:
+        netloc = parsed.netloc.rsplit("@", 1)[0] + "@" + netloc
+    return parsed._replace(scheme=scheme, netloc=netloc, path=parsed.path or "/", fragment="").geturl()
+
+
 @dataclass
 class URLSource(Iterable[str], ABC):
     url: str
@@ -117,7 +235,14 @@ class URLSource(Iterable[str], ABC):
             logger.error(f"{type(self).__name__} initialized with invalid URL {self.url}")
 
     @abstractmethod
-    def fetch(self, session: InterruptableSession, headers: Dict[str, str]) -> Iterator[str]:
+    def fetch(
+        self,
+        session: InterruptableSession,
+        headers: Dict[str, str],
+        cache: Optional[SourceCache] = None,
+        throttle: Optional[Callable[[], None]] = None,
+        date_window: Optional[DateWindow] = None,
+    ) -> Iterator[str]:
         """Fetch URLs using the provided session and headers.
 
         Args:
@@ -125,9 +250,57 @@ class URLSource(Iterable[str], ABC):
             headers: Request headers to include. Note that when the session was created
                 with an impersonate profile, headers may be dropped in favour of the
                 browser fingerprint (see InterruptableSession.get_with_interrupt).
+            cache: If set, requests are conditional and unchanged documents are read
+                from the cache instead. Defaults to None.
+            throttle: If set, called before every request following the first one, e.g. of
+                child sitemaps, to apply the publisher's rate limit. Defaults to None.
+            date_window: If set, sources listing modification dates of their parts, like sitemap
+                indexes, skip parts modified before the window. URLs are yielded regardless of their
+                date, see URLRecord. Defaults to None.
         """
         raise NotImplementedError
 
+    def fetch_async(
+        self,
+        session: AsyncInterruptableSession,
+        headers: Dict[str, str],
+        cache: Optional[SourceCache] = None,
+        throttle: Optional[Callable[[], Awaitable[None]]] = None,
+        date_window: Optional[DateWindow] = None,
+    ) -> AsyncIterator[str]:
+        """Asynchronous counterpart of fetch() used by the async crawl engine.
+
+        Args:
+            session: The async HTTP session to use for requests.
+            headers: Request headers to include. The same restrictions as for fetch() apply.
+            cache: See fetch(). Defaults to None.
+            throttle: Like in fetch(), but awaited. Defaults to None.
+            date_window: See fetch(). Defaults to None.
+        """
+        raise NotImplementedError(f"{type(self).__name__!r} does not support asynchronous fetching")
+
+    @staticmethod
+    def _request(
+        session: InterruptableSession, url: str, headers: Dict[str, str], cache: Optional[SourceCache]
+    ) -> Union[Response, CachedResponse]:
+        if cache is None:
+            return session.get_with_interrupt(url, headers=headers)
+        cached = cache.get(url)
+        response = session.get_with_interrupt(url, headers={**headers, **cached.validators} if cached else headers)
+        return cache.revalidate(url, response, cached)
+
+    @staticmethod
+    async def _request_async(
+        session: AsyncInterruptableSession, url: str, headers: Dict[str, str], cache: Optional[SourceCache]
+    ) -> Union[Response, CachedResponse]:
+        if cache is None:
+            return await session.get_with_interrupt(url, headers=headers)
+        cached = cache.get(url)
+        response = await session.get_with_interrupt(
+            url, headers={**headers, **cached.validators} if cached else headers
+        )
+        return cache.revalidate(url, response, cached)
+
     def __iter__(self) -> Iterator[str]:
         """Iterate URLs using a default session and headers.
 
@@ -154,26 +327,155 @@ class URLSource(Iterable[str], ABC):
 
 @dataclass
 class RSSFeed(URLSource):
-    def fetch(self, session: InterruptableSession, headers: Dict[str, str]) -> Iterator[str]:
+    _feed_tags: ClassVar[Tuple[str, ...]] = ("rss", "RDF", "feed")
+    _chunk_size: ClassVar[int] = 64 * 1024
+
+    def _extract_urls(self, response: Union[Response, CachedResponse]) -> Iterator[str]:
+        extracted = False
         try:
-            response = session.get_with_interrupt(self.url, headers=headers)
+            for url in self._parse_feed(response.content):
+                extracted = True
+                yield url
+        except (XMLSyntaxError, ValueError) as error:
+            if extracted:
+                logger.warning(f"Warning! Couldn't parse the rest of rss feed {self.url!r} because of {error!r}")
+                return
+            logger.debug(f"Falling back to feedparser for rss feed {self.url!r} because of {error!r}")
 
-        except (HTTPError, ConnectionError, Timeout) as err:
-            logger.warning(f"Warning! Couldn't parse rss feed {self.url!r} because of {err}")
-            return
-        except Exception as error:
-            logger.error(f"Warning! Couldn't parse rss feed {self.url!r} because of an unexpected error {error!r}")
-            return
+        if not extracted:
+            yield from self._extract_urls_with_feedparser(response.text)
 
-        html = response.text
-        rss_feed = feedparser.parse(html)
+    def _parse_feed(self, content: bytes) -> Iterator[str]:
+        """Reads the URLs of an RSS 2.0, RSS 1.0 or Atom feed while parsing it.
+
+        Raises:
+            ValueError: If the document is no feed.
+        """
+        parser = XMLPullParser(
+            events=("start", "end"),
+            tag=[f"{{*}}{tag}" for tag in (*self._feed_tags, "item", "entry")],
+            recover=True,
+            strip_cdata=False,
+            resolve_entities=False,
+            no_network=True,
+        )
+        is_feed = False
+
+        def read_events() -> Iterator[str]:
+            nonlocal is_feed
+            for event, element in parser.read_events():
+                if event == "start":
+                    is_feed = is_feed or lxml.etree.QName(element).localname in self._feed_tags
+                    continue
+                if not is_feed:
+                    raise ValueError("Document is no RSS or Atom feed")
+                if lxml.etree.QName(element).localname in self._feed_tags:
+                    continue
+                if url := self._read_entry(element):
+                    yield url
+                # free the entry and the ones already read before it
+                element.clear()
+                if (parent := element.getparent()) is not None:
+                    while element.getprevious() is not None:
+                        del parent[0]
+
+        stream = io.BytesIO(content)
+        while chunk := stream.read(self._chunk_size):
+            parser.feed(chunk)
+            yield from read_events()
+        parser.close()
+        yield from read_events()
+        if not is_feed:
+            raise ValueError("Document is no RSS or Atom feed")
+
+    @staticmethod
+    def _read_entry(entry: lxml.etree._Element) -> Optional[str]:
+        link: Optional[str] = None
+        for node in entry.iterfind("{*}link"):
+            # Atom links and atom:link in RSS items carry the URL as attribute
+            if (href := node.get("href")) is not None:
+                if node.get("rel", "alternate") == "alternate":
+                    link = href
+                    break
+            elif node.text and node.text.strip():
+                link = node.text
+                break
+        if link is None:
+            guid = entry.find("{*}guid")
+            if guid is not None and guid.get("isPermaLink", "true") == "true" and guid.text and guid.text.strip():
+                link = guid.text
+        if link is None:
+            return None
+
+        if (pub_date := entry.findtext("{*}pubDate")) is not None:
+            publication_date = _parse_rfc822_date(pub_date)
+        else:
+            publication_date = _parse_date(entry.findtext("{*}published"))
+        # like feedparser, treat the dc:date of RSS 1.0 as date of the last update
+        updated = _parse_date(entry.findtext("{*}updated") or entry.findtext("{*}date"))
+        return _to_record(clean_url(link.strip()), updated, publication_date)
+
+    def _extract_urls_with_feedparser(self, content: str) -> Iterator[str]:
+        # feedparser is slow to import and only needed for documents the lxml parser can't read
+        import feedparser
+
+        rss_feed = feedparser.parse(content)
         if exception := rss_feed.get("bozo_exception"):
             logger.warning(f"Warning! Couldn't parse rss feed {self.url!r} because of {exception}")
             return
         else:
-            urls = filter(bool, (entry.get("link") for entry in rss_feed["entries"]))
-            for url in urls:
-                yield clean_url(url)
+            for entry in rss_feed["entries"]:
+                if url := entry.get("link"):
+                    # feedparser falls back to the publication date for a missing update date, with a warning
+                    yield _to_record(
+                        clean_url(url),
+                        self._parse_struct_time(dict.get(entry, "updated_parsed")),
+                        self._parse_struct_time(dict.get(entry, "published_parsed")),
+                    )
+
+    @staticmethod
+    def _parse_struct_time(value: Optional[time.struct_time]) -> Optional[datetime]:
+        # feedparser normalizes dates to UTC
+        return datetime(*value[:6], tzinfo=timezone.utc) if value is not None else None
+
+    def _log_request_error(self, error: Exception) -> None:
+        if isinstance(error, (HTTPError, ConnectionError, Timeout)):
+            logger.warning(f"Warning! Couldn't parse rss feed {self.url!r} because of {error}")
+        else:
+            logger.error(f"Warning! Couldn't parse rss feed {self.url!r} because of an unexpected error {error!r}")
+
+    def fetch(
+        self,
+        session: InterruptableSession,
+        headers: Dict[str, str],
+        cache: Optional[SourceCache] = None,
+        throttle: Optional[Callable[[], None]] = None,
+        date_window: Optional[DateWindow] = None,
+    ) -> Iterator[str]:
+        try:
+            response = self._request(session, self.url, headers, cache)
+        except Exception as error:
+            self._log_request_error(error)
+            return
+
+        yield from self._extract_urls(response)
+
+    async def fetch_async(
+        self,
+        session: AsyncInterruptableSession,
+        headers: Dict[str, str],
+        cache: Optional[SourceCache] = None,
+        throttle: Optional[Callable[[], Awaitable[None]]] = None,
+        date_window: Optional[DateWindow] = None,
+    ) -> AsyncIterator[str]:
+        try:
+            response = await self._request_async(session, self.url, headers, cache)
+        except Exception as error:
+            self._log_request_error(error)
+            return
+
+        for url in self._extract_urls(response):
+            yield url
 
 
 @dataclass
@@ -182,68 +484,288 @@ class Sitemap(URLSource):
     reverse: bool = False
     sitemap_filter: URLFilter = lambda url: not bool(url)
     sort_predicate: Optional[Pattern[str]] = None
+    prefetch: int = 0
 
     _decompressor: ClassVar[_ArchiveDecompressor] = _ArchiveDecompressor()
-    _sitemap_selector: ClassVar[XPath] = XPath("//*[local-name()='sitemap']/*[local-name()='loc']")
-    _url_selector: ClassVar[XPath] = XPath("//*[local-name()='url']/*[local-name()='loc']")
-    _parser = XMLParser(strip_cdata=False, recover=True)
+    # the sitemap protocol limits a sitemap to 50,000 URLs
+    _reverse_buffer_size: ClassVar[int] = 50_000
+    _chunk_size: ClassVar[int] = 64 * 1024
+
+    @staticmethod
+    def _log_request_error(sitemap_url: str, error: Exception) -> None:
+        if isinstance(error, (HTTPError, ConnectionError, Timeout)):
+            logger.warning(f"Warning! Couldn't reach sitemap {sitemap_url!r} because of {error!r}")
+        else:
+            logger.error(f"Warning! Couldn't reach sitemap {sitemap_url!r} because of an unexpected error {error!r}")
 
-    def fetch(self, session: InterruptableSession, headers: Dict[str, str]) -> Iterator[str]:
-        def yield_recursive(sitemap_url: str) -> Iterator[str]:
-            if not is_valid_url(sitemap_url):
-                logger.info(f"Skipped sitemap {sitemap_url!r} because the URL is malformed")
+    def _open(self, sitemap_url: str, response: Union[Response, CachedResponse]) -> Optional[io.BufferedIOBase]:
+        content = response.content
+        if (content_type := response.headers.get("content-type")) in self._decompressor.supported_file_formats:
             try:
-                response = session.get_with_interrupt(url=sitemap_url, headers=headers)
+                return self._decompressor.open(content, content_type)
+            except NotImplementedError:
+                logger.warning(f"No matching decompression found for {sitemap_url!r}")
+                return None
+        if not content or content.isspace():
+            logger.warning(f"Warning! Empty sitemap at {sitemap_url!r}")
+            return None
+        return io.BytesIO(content)
+
+    def _iter_entries(
+        self, sitemap_url: str, response: Union[Response, CachedResponse]
+    ) -> Iterator[Tuple[str, str, Optional[str], Optional[str]]]:
+        """Parses a downloaded sitemap incrementally.
+
+        The content is decompressed and parsed in chunks, and every <url> and <sitemap> element is
+        freed once its <loc> was read, so neither the document nor its tree are held in memory.
+
+        Args:
+            sitemap_url: The URL of the sitemap.
+            response: The response to parse.
+
+        Yields:
+            Tuples of the local name of the entry, i.e. url or sitemap, its location, and, if listed,
+            its <lastmod> and <news:publication_date>.
+        """
+        if (stream := self._open(sitemap_url, response)) is None:
+            return
 
-            except (HTTPError, ConnectionError, Timeout) as error:
-                logger.warning(f"Warning! Couldn't reach sitemap {sitemap_url!r} because of {error!r}")
+        parser = XMLPullParser(events=("end",), tag=("{*}url", "{*}sitemap"), strip_cdata=False, recover=True)
+        empty = True
+        with stream:
+            try:
+                while chunk := stream.read(self._chunk_size):
+                    empty = empty and chunk.isspace()
+                    parser.feed(chunk)
+                    yield from self._read_events(parser)
+                if empty:
+                    logger.warning(f"Warning! Empty sitemap at {sitemap_url!r}")
+                    return
+                parser.close()
+            except (OSError, EOFError, lzma.LZMAError, XMLSyntaxError) as error:
+                # in case we somehow end up with corrupted or non xml content
+                logger.warning(f"Warning! Couldn't parse sitemap {sitemap_url!r} because of {error!r}")
                 return
-            except Exception as error:
-                logger.error(
-                    f"Warning! Couldn't reach sitemap {sitemap_url!r} because of an unexpected error {error!r}"
+            yield from self._read_events(parser)
+
+    @staticmethod
+    def _read_events(parser: XMLPullParser) -> Iterator[Tuple[str, str, Optional[str], Optional[str]]]:
+        for _, element in parser.read_events():
+            loc = element.find("{*}loc")
+            if loc is not None and loc.text is not None:
+                yield (
+                    lxml.etree.QName(element).localname,
+                    loc.text,
+                    element.findtext("{*}lastmod"),
+                    element.findtext("{*}news/{*}publication_date"),
                 )
-                return
+            # free the entry and the ones already read before it
+            element.clear()
+            if (parent := element.getparent()) is not None:
+                while element.getprevious() is not None:
+                    del parent[0]
+
+    def _parse_sitemap(
+        self,
+        sitemap_url: str,
+        response: Union[Response, CachedResponse],
+        sitemap_locs: List[str],
+        date_window: Optional[DateWindow] = None,
+    ) -> Iterator[str]:
+        """Parses a downloaded sitemap.
+
+        Article URLs are yielded while the sitemap is parsed, unless <self.reverse> is set, in which case
+        they are buffered and yielded in reverse once the sitemap is parsed. The buffer holds up to
+        50,000 URLs, the maximum allowed by the sitemap protocol; larger sitemaps are reversed in parts.
 
-            content = response.content.strip()
-            if (content_type := response.headers.get("content-type")) in self._decompressor.supported_file_formats:
-                try:
-                    content = self._decompressor.decompress(content, content_type)
-                except NotImplementedError:
-                    logger.warning(f"No matching decompression found for {sitemap_url!r}")
-                    return
-            if not content:
-                logger.warning(f"Warning! Empty sitemap at {sitemap_url!r}")
+        Args:
+            sitemap_url: The URL of the sitemap.
+            response: The response to parse.
+            sitemap_locs: A list child sitemap URLs are added to, in the order they should be processed.
+                Child sitemaps are only considered if the sitemap lists no article URLs.
+            date_window: If set, child sitemaps last modified before the window are skipped. Defaults to None.
+
+        Yields:
+            The article URLs in the order they should be processed, as URLRecord if dates are listed.
+        """
+        has_urls = False
+        buffer: List[str] = []
+        children: List[str] = []
+        for name, loc, lastmod, publication_date in self._iter_entries(sitemap_url, response):
+            if name == "url":
+                has_urls = True
+                url = _to_record(clean_url(loc), _parse_date(lastmod), _parse_date(publication_date))
+                if not self.reverse:
+                    yield url
+                    continue
+                buffer.append(url)
+                if len(buffer) >= self._reverse_buffer_size:
+                    logger.warning(
+                        f"Sitemap {sitemap_url!r} exceeds {self._reverse_buffer_size} URLs and is only reversed in parts"
+                    )
+                    yield from reversed(buffer)
+                    buffer.clear()
+            elif self.recursive and not has_urls:
+                modified = _parse_date(lastmod)
+                if date_window is not None and modified is not None and date_window.is_before(modified):
+                    logger.debug(f"Skipped sitemap {loc!r} because it was last modified before {date_window.start}")
+                    continue
+                children.append(_to_record(loc, modified, None))
+        yield from reversed(buffer)
+
+        if has_urls or not children:
+            return
+
+        if self.sort_predicate is not None:
+
+            def _extract_predicate(text: str, pattern: Pattern[str]) -> str:
+                if match := pattern.search(text):
+                    return match.group()
+                raise NotImplementedError("<sort_predicate> must match in all sitemap URLs")
+
+            children = sorted(
+                children,
+                key=partial(_extract_predicate, pattern=self.sort_predicate),
+                reverse=True,
+            )
+
+        filtered_locs = list(filter(inverse(self.sitemap_filter), children))
+        sitemap_locs.extend(reversed(filtered_locs) if self.reverse else filtered_locs)
+
+    def _lookahead(self, locs: List[str], submit: Callable[[str], _T]) -> Iterator[Tuple[str, Optional[_T]]]:
+        """Yields <locs>, each with its request submitted up to <self.prefetch> child sitemaps in advance.
+
+        The request of a child sitemap is only submitted once the child sitemap <self.prefetch> positions
+        before it is reached, so the look-ahead is bounded and the order of <locs> is preserved. With a
+        <self.prefetch> of 0, the request is None and has to be made by the caller.
+        """
+        remaining = iter(locs)
+        window = deque((loc, submit(loc)) for loc in itertools.islice(remaining, self.prefetch))
+        for loc in remaining:
+            if not window:
+                yield loc, None
+                continue
+            window.append((loc, submit(loc)))
+            yield window.popleft()
+        yield from window
+
+    def fetch(
+        self,
+        session: InterruptableSession,
+        headers: Dict[str, str],
+        cache: Optional[SourceCache] = None,
+        throttle: Optional[Callable[[], None]] = None,
+        date_window: Optional[DateWindow] = None,
+    ) -> Iterator[str]:
+        parent_alias = __EVENTS__.get_alias(threading.get_ident(), None)
+        executor: Optional[ThreadPoolExecutor] = None
+        pending: Set["Future[Any]"] = set()
+
+        def request(sitemap_url: str) -> Union[Response, CachedResponse]:
+            if throttle is not None:
+                throttle()
+            return self._request(session, sitemap_url, headers, cache)
+
+        def request_in_worker(sitemap_url: str) -> Union[Response, CachedResponse]:
+            if parent_alias is None:
+                return request(sitemap_url)
+            # share the events of the calling thread, so stopping the publisher also stops prefetching
+            with __EVENTS__.context(f"{parent_alias}::{threading.current_thread().name}", share=parent_alias):
+                return request(sitemap_url)
+
+        def submit(sitemap_url: str) -> "Future[Union[Response, CachedResponse]]":
+            nonlocal executor
+            if executor is None:
+                executor = ThreadPoolExecutor(max_workers=self.prefetch, thread_name_prefix="sitemap-prefetch")
+            future = executor.submit(request_in_worker, sitemap_url)
+            pending.add(future)
+            return future
+
+        def yield_recursive(
+            sitemap_url: str, prefetched: "Optional[Future[Union[Response, CachedResponse]]]" = None
+        ) -> Iterator[str]:
+            if not is_valid_url(sitemap_url):
+                logger.info(f"Skipped sitemap {sitemap_url!r} because the URL is malformed")
+            try:
+                if prefetched is None:
+                    response = self._request(session, sitemap_url, headers, cache)
+                else:
+                    pending.discard(prefetched)
+                    response = prefetched.result()
+            except Exception as error:
+                self._log_request_error(sitemap_url, error)
                 return
-            tree = lxml.etree.fromstring(content, parser=self._parser)
-            if tree is None:
-                # in case we somehow end up with non xml content
-                logger.warning(f"Warning! Couldn't parse sitemap {sitemap_url!r}")  # type: ignore[unreachable]
+
+            sitemap_locs: List[str] = []
+            yield from self._parse_sitemap(sitemap_url, response, sitemap_locs, date_window)
+            # the response is not needed anymore while child sitemaps are processed
+            del response
+            for loc, future in self._lookahead(sitemap_locs, submit):
+                if future is None and throttle is not None:
+                    throttle()
+                yield from yield_recursive(loc, future)
+
+        try:
+            yield from yield_recursive(self.url)
+        finally:
+            for future in pending:
+                future.cancel()
+            if executor is not None:
+                executor.shutdown(wait=False)
+
+    async def fetch_async(
+        self,
+        session: AsyncInterruptableSession,
+        headers: Dict[str, str],
+        cache: Optional[SourceCache] = None,
+        throttle: Optional[Callable[[], Awaitable[None]]] = None,
+        date_window: Optional[DateWindow] = None,
+    ) -> AsyncIterator[str]:
+        pending: Set["asyncio.Task[Union[Response, CachedResponse]]"] = set()
+
+        async def request(sitemap_url: str) -> Union[Response, CachedResponse]:
+            if throttle is not None:
+                await throttle()
+            return await self._request_async(session, sitemap_url, headers, cache)
+
+        def submit(sitemap_url: str) -> "asyncio.Task[Union[Response, CachedResponse]]":
+            task = asyncio.ensure_future(request(sitemap_url))
+            # child sitemaps that are never reached shouldn't log their errors as never retrieved
+            task.add_done_callback(lambda done: done.cancelled() or done.exception())
+            pending.add(task)
+            return task
+
+        async def yield_recursive(
+            sitemap_url: str, prefetched: "Optional[asyncio.Task[Union[Response, CachedResponse]]]" = None
+        ) -> AsyncIterator[str]:
+            if not is_valid_url(sitemap_url):
+                logger.info(f"Skipped sitemap {sitemap_url!r} because the URL is malformed")
+            try:
+                if prefetched is None:
+                    response = await self._request_async(session, sitemap_url, headers, cache)
+                else:
+                    pending.discard(prefetched)
+                    response = await prefetched
+            except Exception as error:
+                self._log_request_error(sitemap_url, error)
                 return
-            urls = [node.text for node in self._url_selector(tree)]
-            if urls:
-                for new_url in reversed(urls) if self.reverse else urls:
-                    yield clean_url(new_url)
-            elif self.recursive:
-                sitemap_locs = [node.text for node in self._sitemap_selector(tree)]
-
-                if self.sort_predicate is not None:
-
-                    def _extract_predicate(text: str, pattern: Pattern[str]) -> str:
-                        if match := pattern.search(text):
-                            return match.group()
-                        raise NotImplementedError("<sort_predicate> must match in all sitemap URLs")
-
-                    sitemap_locs = sorted(
-                        sitemap_locs,
-                        key=partial(_extract_predicate, pattern=self.sort_predicate),
-                        reverse=True,
-                    )
 
-                filtered_locs = list(filter(inverse(self.sitemap_filter), sitemap_locs))
-                for loc in reversed(filtered_locs) if self.reverse else filtered_locs:
-                    yield from yield_recursive(loc)
+            sitemap_locs: List[str] = []
+            for url in self._parse_sitemap(sitemap_url, response, sitemap_locs, date_window):
+                yield url
+            del response
+            for loc, task in self._lookahead(sitemap_locs, submit):
+                if task is None and throttle is not None:
+                    await throttle()
+                async for url in yield_recursive(loc, task):
+                    yield url
 
-        yield from yield_recursive(self.url)
+        try:
+            async for url in yield_recursive(self.url):
+                yield url
+        finally:
+            for task in pending:
+                task.cancel()
 
 
 @dataclass
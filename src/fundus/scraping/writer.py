@@ -0,0 +1,185 @@
+import gzip
+import io
+import json
+import re
+import time
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import IO, Any, Dict, Literal, Optional, Union
+
+from fundus.logging import create_logger
+from fundus.scraping.article import Article
+
+logger = create_logger(__name__)
+
+Compression = Literal["gzip", "zstd"]
+
+_compression_suffixes: Dict[str, Compression] = {".gz": "gzip", ".zst": "zstd"}
+
+
+def is_jsonlines_path(path: Union[str, Path]) -> bool:
+    """Returns True if <path> refers to a, possibly compressed, JSON Lines file."""
+    suffixes = Path(path).suffixes
+    if suffixes and suffixes[-1] in _compression_suffixes:
+        suffixes = suffixes[:-1]
+    return bool(suffixes) and suffixes[-1] == ".jsonl"
+
+
+class ArticleWriter(ABC):
+    """Base class for sinks writing articles while they are crawled."""
+
+    @abstractmethod
+    def write(self, article: Article) -> None:
+        raise NotImplementedError
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+
+class JSONLinesWriter(ArticleWriter):
+    def __init__(
+        self,
+        path: Union[str, Path],
+        compression: Optional[Compression] = None,
+        max_bytes: Optional[int] = None,
+        max_articles: Optional[int] = None,
+        flush_every: int = 100,
+        flush_interval: float = 10.0,
+        append: bool = True,
+    ):
+        """Streams articles to a JSON Lines file, one article per line.
+
+        Each line holds the publisher and the default serialization of an article, i.e.
+        {"publisher": ..., "article": {...}}. Articles are written as they are crawled, so memory usage
+        stays flat and a crashed crawl keeps all articles written up to the last flush.
+
+        If <max_bytes> or <max_articles> is set, the output is rotated into numbered files, e.g.
+        articles-00000.jsonl.gz, articles-00001.jsonl.gz, ...
+
+        By default, articles are appended to an existing file and rotated output continues with the part
+        after the highest existing one, so restarting a crawl, e.g. resuming it from a checkpoint, keeps
+        the articles written before. Compressed files then consist of multiple gzip members or zstd
+        frames, which are read as one stream by common tools.
+
+        Args:
+            path: The file to write to. Parent directories are created if necessary.
+            compression: Either "gzip" or "zstd". If None, it is inferred from the suffix of <path>
+                (.gz or .zst). Using zstd requires the `zstandard` package. Defaults to None.
+            max_bytes: Rotate to a new file after this many uncompressed bytes. Defaults to None.
+            max_articles: Rotate to a new file after this many articles. Defaults to None.
+            flush_every: Flush to disk every <flush_every> articles. Defaults to 100.
+            flush_interval: Flush to disk at least every <flush_interval> seconds. Defaults to 10.0.
+            append: If False, existing files are overwritten and rotation starts at part 0.
+                Defaults to True.
+        """
+        self.path = Path(path)
+        self.compression = compression or _compression_suffixes.get(self.path.suffix)
+        if self.compression not in (None, "gzip", "zstd"):
+            raise ValueError(f"Unknown compression {self.compression!r}, use 'gzip' or 'zstd'")
+
+        self.max_bytes = max_bytes
+        self.max_articles = max_articles
+        self.flush_every = flush_every
+        self.flush_interval = flush_interval
+        self.append = append
+
+        self._file: Optional[IO[str]] = None
+        self._part = self._next_free_part() if append and self._rotating else 0
+        self._bytes_in_part = 0
+        self._articles_in_part = 0
+        self._unflushed = 0
+        self._last_flush = time.monotonic()
+
+    @property
+    def _rotating(self) -> bool:
+        return self.max_bytes is not None or self.max_articles is not None
+
+    def _part_path(self) -> Path:
+        if not self._rotating:
+            return self.path
+        name = self.path.name
+        stem, dot, suffixes = name.partition(".")
+        return self.path.with_name(f"{stem}-{self._part:05d}{dot}{suffixes}")
+
+    def _next_free_part(self) -> int:
+        stem, dot, suffixes = self.path.name.partition(".")
+        pattern = re.compile(rf"{re.escape(stem)}-(\d+){re.escape(dot + suffixes)}")
+        parts = [
+            int(match.group(1))
+            for path in self.path.parent.glob(f"{stem}-*")
+            if (match := pattern.fullmatch(path.name))
+        ]
+        return max(parts) + 1 if parts else 0
+
+    def _open(self) -> IO[str]:
+        path = self._part_path()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        logger.info(f"Writing crawled articles to {str(path)!r}")
+
+        if self.compression == "gzip":
+            return gzip.open(path, "at" if self.append else "wt", encoding="utf-8")
+        elif self.compression == "zstd":
+            try:
+                import zstandard
+            except ImportError as error:
+                raise ImportError(
+                    "Writing zstd compressed files requires the `zstandard` package. "
+                    "Install it with `pip install fundus[zstd]`."
+                ) from error
+            raw = open(path, "ab" if self.append else "wb")
+            return io.TextIOWrapper(zstandard.ZstdCompressor().stream_writer(raw, closefd=True), encoding="utf-8")
+        else:
+            return open(path, "a" if self.append else "w", encoding="utf-8")
+
+    def _rotate(self) -> None:
+        self.close()
+        self._part += 1
+        self._bytes_in_part = 0
+        self._articles_in_part = 0
+
+    def write(self, article: Article) -> None:
+        if (
+            self._rotating
+            and self._articles_in_part
+            and (
+                (self.max_articles is not None and self._articles_in_part >= self.max_articles)
+                or (self.max_bytes is not None and self._bytes_in_part >= self.max_bytes)
+            )
+        ):
+            self._rotate()
+
+        if self._file is None:
+            self._file = self._open()
+
+        line = json.dumps(self._serialize(article), ensure_ascii=False) + "\n"
+        self._file.write(line)
+
+        self._bytes_in_part += len(line.encode("utf-8"))
+        self._articles_in_part += 1
+        self._unflushed += 1
+        if self._unflushed >= self.flush_every or time.monotonic() - self._last_flush >= self.flush_interval:
+            self.flush()
+
+    @staticmethod
+    def _serialize(article: Article) -> Any:
+        return {"publisher": article.publisher, "article": article.to_json()}
+
+    def flush(self) -> None:
+        if self._file is not None:
+            self._file.flush()
+        self._unflushed = 0
+        self._last_flush = time.monotonic()
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
@@ -1,7 +1,7 @@
 import contextlib
 import json
 import threading
-from typing import Callable, Dict, List, Optional, TypeVar, Union, overload
+from typing import Any, Callable, Dict, List, Optional, TypeVar, Union, overload
 
 from bidict import bidict
 
@@ -16,6 +16,45 @@ __DEFAULT_EVENTS__: List[str] = ["stop"]
 _sentinel = object()
 
 
+class Event(threading.Event):
+    """A threading.Event that runs callbacks once it is set."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._callbacks: List[Callable[[], Any]] = []
+        self._callbacks_lock = threading.Lock()
+
+    def set(self) -> None:
+        super().set()
+        with self._callbacks_lock:
+            callbacks, self._callbacks = self._callbacks, []
+        for callback in callbacks:
+            callback()
+
+    def add_callback(self, callback: Callable[[], Any]) -> Callable[[], None]:
+        """Run <callback> once the event is set, or right away if it already is.
+
+        Callbacks run in the thread setting the event and should therefore return quickly.
+
+        Args:
+            callback: The function to call.
+
+        Returns:
+            A function removing <callback> again, e.g. once it is no longer needed.
+        """
+        with self._callbacks_lock:
+            if not self.is_set():
+                self._callbacks.append(callback)
+                return lambda: self._remove_callback(callback)
+        callback()
+        return lambda: None
+
+    def _remove_callback(self, callback: Callable[[], Any]) -> None:
+        with self._callbacks_lock:
+            if callback in self._callbacks:
+                self._callbacks.remove(callback)
+
+
 class ThreadEventDict(Dict[str, threading.Event]):
     """A dictionary that creates threading.Event() objects on demand for certain keys.
 
@@ -41,7 +80,7 @@ class ThreadEventDict(Dict[str, threading.Event]):
                 should be automatically created when accessed.
             event_factory: An optional callable used to create new Event objects.
                 Receives the event name and returns a threading.Event. If None,
-                a plain threading.Event() is used.
+                a plain Event() is used.
         """
         super().__init__()
         self._default_events = default_events or []
@@ -67,7 +106,7 @@ class ThreadEventDict(Dict[str, threading.Event]):
             return super().__getitem__(item)
         except KeyError as e:
             if item in self._default_events:
-                event = threading.Event() if not self._event_factory else self._event_factory(item)
+                event = Event() if not self._event_factory else self._event_factory(item)
                 self[item] = event
                 return event
             raise e
@@ -109,7 +148,7 @@ class EventDict:
         """
 
         def event_factory(name: str) -> threading.Event:
-            new = threading.Event()
+            new = Event()
             if name in self._futures:
                 new.set()
             return new
@@ -175,7 +214,7 @@ class EventDict:
             return f"{thread_id:<6} ({alias})"
         return f"({alias})"
 
-    def _alias(self, alias: str, key: Optional[int] = None):
+    def _alias(self, alias: str, key: Optional[int] = None, share: Optional[str] = None):
         """Register an alias for a given thread identifier.
 
         Events are stored under the alias (canonical key).  If the alias is
@@ -190,10 +229,14 @@ class EventDict:
             alias: The alias to assign.
             key: The thread identifier to associate with this alias.
                 Defaults to the current thread's identifier.
+            share: If set, the alias shares the events of alias ``share``
+                instead of getting its own.
         """
         ident = key if key is not None else self._get_identifier()
         logger.debug(f"Register alias {alias} -> {ident}")
-        if alias not in self._aliases:
+        if share is not None:
+            self._events[alias] = self._events[share]
+        elif alias not in self._aliases:
             # New or re-registration: create fresh events under the alias key.
             self._events[alias] = ThreadEventDict(self.default_events, self._event_factory)
         self._aliases[alias] = ident
@@ -311,8 +354,28 @@ class EventDict:
         with self._lock:
             return self._events[self._resolve(key)][event].is_set()
 
+    def add_callback(self, event: str, callback: Callable[[], Any], key: Optional[str] = None) -> Callable[[], None]:
+        """Run <callback> once an event is set for the specified alias.
+
+        If the event is already set, <callback> runs right away. Callbacks run in the
+        thread setting the event, so they should return quickly.
+
+        Args:
+            event: The name of the event.
+            callback: The function to call.
+            key: Alias or ``None`` (defaults to the current thread's alias).
+
+        Returns:
+            A function removing <callback> again.
+        """
+        with self._lock:
+            target = self._events[self._resolve(key)][event]
+        if not isinstance(target, Event):
+            raise TypeError(f"Event {event!r} does not support callbacks")
+        return target.add_callback(callback)
+
     @contextlib.contextmanager
-    def context(self, alias: str, key: Optional[int] = None):
+    def context(self, alias: str, key: Optional[int] = None, share: Optional[str] = None):
         """Context manager that registers an alias for the duration of a block.
 
         On entry the alias is bound to the current (or given) thread ID so that
@@ -322,14 +385,20 @@ class EventDict:
         thread finishes.  Stale state is cleared on the next :meth:`reset` or
         when the alias is re-registered via a new ``context()`` call.
 
+        Helper threads working on behalf of another entity (e.g. download workers
+        of a publisher) can pass ``share`` to use that entity's events, so that
+        setting ``"stop"`` for the publisher also stops its helpers.
+
         Args:
             alias: The alias name to register.
             key: Thread identifier to associate with the alias. Defaults to the
                 current thread's identifier.
+            share: An already registered alias whose events should be shared
+                instead of creating new ones. Defaults to None.
         """
         try:
             with self._lock:
-                self._alias(alias, key)
+                self._alias(alias, key, share)
             yield
         finally:
             with self._lock:
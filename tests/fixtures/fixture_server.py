@@ -0,0 +1,141 @@
+import threading
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+import pytest
+
+from fundus import RSSFeed, Sitemap
+from fundus.parser import BaseParser, ParserProxy, attribute
+from fundus.publishers.base_objects import Publisher
+
+Route = Tuple[int, Dict[str, str], bytes]
+
+
+class LocalPublisherServer:
+    """A local HTTP server standing in for a publisher.
+
+    Serves a robots.txt, an RSS feed, a sitemap index with one child sitemap and a handful
+    of article pages. Routes can be overwritten or added through <routes>, every request
+    path is counted in <requests>.
+    """
+
+    def __init__(self, n_articles: int = 6):
+        self.requests: Counter[str] = Counter()
+        self.routes: Dict[str, Callable[[], Route]] = {}
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._build_handler())
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+        article_paths = [f"/article/{i}" for i in range(n_articles)]
+        half = n_articles // 2
+        self.add_route("/robots.txt", b"User-agent: *\nDisallow: /private\n", "text/plain")
+        self.add_route(
+            "/feed",
+            (
+                "<rss><channel>"
+                + "".join(f"<item><link>{self.url(path)}</link></item>" for path in article_paths[:half])
+                + "</channel></rss>"
+            ).encode(),
+            "application/rss+xml",
+        )
+        self.add_route(
+            "/sitemap.xml",
+            f"<sitemapindex><sitemap><loc>{self.url('/sitemap-1.xml')}</loc></sitemap></sitemapindex>".encode(),
+            "application/xml",
+        )
+        self.add_route(
+            "/sitemap-1.xml",
+            (
+                "<urlset>"
+                + "".join(f"<url><loc>{self.url(path)}</loc></url>" for path in article_paths[half:])
+                + "</urlset>"
+            ).encode(),
+            "application/xml",
+        )
+        for path in article_paths:
+            self.add_route(
+                path, f"<html><head><title>{path}</title></head><body><p>Text</p></body></html>".encode(), "text/html"
+            )
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host.decode() if isinstance(host, bytes) else host}:{port}"
+
+    def url(self, path: str) -> str:
+        return self.base_url + path
+
+    def add_route(
+        self,
+        path: str,
+        body: bytes,
+        content_type: str = "text/html",
+        status: int = 200,
+        headers: Optional[Dict[str, str]] = None,
+    ) -> None:
+        self.routes[path] = lambda: (status, {"content-type": content_type, **(headers or {})}, body)
+
+    def _build_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args) -> None:
+                pass
+
+            def do_GET(self) -> None:
+                server.requests[self.path] += 1
+                headers: Dict[str, str]
+                if (route := server.routes.get(self.path)) is None:
+                    status, headers, body = 404, {}, b""
+                else:
+                    status, headers, body = route()
+                    if "etag" in headers and self.headers.get("if-none-match") == headers["etag"]:
+                        status, body = 304, b""
+                self.send_response(status)
+                for key, value in headers.items():
+                    self.send_header(key, value)
+                self.send_header("content-length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        return Handler
+
+    def __enter__(self) -> "LocalPublisherServer":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *args) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+
+class TitleParserProxy(ParserProxy):
+    class V1(BaseParser):
+        @attribute
+        def title(self) -> Optional[str]:
+            return self.precomputed.doc.findtext(".//title")
+
+
+@pytest.fixture
+def local_publisher_server() -> Iterator[LocalPublisherServer]:
+    with LocalPublisherServer() as server:
+        yield server
+
+
+@pytest.fixture
+def local_publishers(local_publisher_server) -> Callable[[int], List[Publisher]]:
+    def build(n: int = 1) -> List[Publisher]:
+        return [
+            Publisher(
+                name=f"local_publisher_{i}",
+                domain=local_publisher_server.url("/"),
+                parser=TitleParserProxy,
+                sources=[
+                    RSSFeed(local_publisher_server.url("/feed")),
+                    Sitemap(local_publisher_server.url("/sitemap.xml")),
+                ],
+            )
+            for i in range(n)
+        ]
+
+    return build
@@ -0,0 +1,200 @@
+import os
+
+from curl_cffi.requests import Headers, Response
+
+from fundus import AsyncCrawler, RSSFeed, Sitemap
+from fundus.publishers.base_objects import prefetch_robots
+from fundus.scraping.cache import CachedRobots, ResponseCache, RobotsCache, SourceCache
+from fundus.scraping.session import SessionHandler, _default_header, session_handler
+
+
+def _add_sitemaps(server, etag: str = '"v1"', articles=("/article/3", "/article/4")) -> None:
+    server.add_route(
+        "/sitemap.xml",
+        f"<sitemapindex><sitemap><loc>{server.url('/sitemap-1.xml')}</loc></sitemap></sitemapindex>".encode(),
+        "application/xml",
+        headers={"etag": '"index"'},
+    )
+    server.add_route(
+        "/sitemap-1.xml",
+        ("<urlset>" + "".join(f"<url><loc>{server.url(path)}</loc></url>" for path in articles) + "</urlset>").encode(),
+        "application/xml",
+        headers={"etag": etag},
+    )
+
+
+def _fetch(source, cache):
+    return list(source.fetch(session_handler.get_session(), _default_header, cache))
+
+
+class TestSourceCache:
+    def test_unchanged_sitemaps_are_read_from_cache(self, local_publisher_server, tmp_path):
+        _add_sitemaps(local_publisher_server)
+        sitemap = Sitemap(local_publisher_server.url("/sitemap.xml"))
+
+        with SourceCache(tmp_path) as cache:
+            first = _fetch(sitemap, cache)
+            assert cache.hits == 0
+
+        # the cache persists across instances
+        with SourceCache(tmp_path) as cache:
+            second = _fetch(sitemap, cache)
+            assert cache.hits == 2
+
+        assert first == second == [local_publisher_server.url("/article/3"), local_publisher_server.url("/article/4")]
+        assert local_publisher_server.requests["/sitemap-1.xml"] == 2
+
+    def test_changed_sitemap_is_downloaded(self, local_publisher_server, tmp_path):
+        sitemap = Sitemap(local_publisher_server.url("/sitemap.xml"))
+
+        with SourceCache(tmp_path) as cache:
+            _add_sitemaps(local_publisher_server, etag='"v1"', articles=["/article/3"])
+            assert _fetch(sitemap, cache) == [local_publisher_server.url("/article/3")]
+
+            _add_sitemaps(local_publisher_server, etag='"v2"', articles=["/article/3", "/article/4"])
+            assert len(_fetch(sitemap, cache)) == 2
+            # only the index was unchanged
+            assert cache.hits == 1
+
+            cached = cache.get(local_publisher_server.url("/sitemap-1.xml"))
+            assert cached is not None
+            assert cached.validators == {"If-None-Match": '"v2"'}
+
+    def test_rss_feed(self, local_publisher_server, tmp_path):
+        feed = "<rss><channel><item><link>https://example.com/ä</link></item></channel></rss>"
+        local_publisher_server.add_route(
+            "/feed.xml", feed.encode("utf-8"), "application/rss+xml; charset=utf-8", headers={"etag": '"feed"'}
+        )
+        rss_feed = RSSFeed(local_publisher_server.url("/feed.xml"))
+
+        with SourceCache(tmp_path) as cache:
+            assert _fetch(rss_feed, cache) == _fetch(rss_feed, cache) == ["https://example.com/ä"]
+            assert cache.hits == 1
+
+    def test_responses_without_validators_are_not_stored(self, local_publisher_server, tmp_path):
+        with SourceCache(tmp_path) as cache:
+            # the default routes of the fixture server send neither ETag nor Last-Modified
+            _fetch(Sitemap(local_publisher_server.url("/sitemap.xml")), cache)
+            assert cache.get(local_publisher_server.url("/sitemap.xml")) is None
+            assert cache.misses == 2
+
+
+def _response(url: str, content: bytes, content_type: str = "text/html") -> Response:
+    response = Response()
+    response.url = url
+    response.content = content
+    response.headers = Headers({"content-type": content_type})
+    return response
+
+
+class TestResponseCache:
+    def test_round_trip(self, tmp_path):
+        with ResponseCache(tmp_path) as cache:
+            assert cache.get("https://example.com/a") is None
+            cache.store(
+                "https://example.com/a",
+                _response("https://example.com/b", "<p>ä</p>".encode("latin-1"), "text/html; charset=latin-1"),
+            )
+
+        with ResponseCache(tmp_path) as cache:
+            response = cache.get("https://example.com/a")
+            assert response is not None
+            assert response.url == "https://example.com/b"
+            assert response.status_code == 200
+            assert response.headers.get("content-type") == "text/html; charset=latin-1"
+            assert response.text == "<p>ä</p>"
+            assert (cache.hits, cache.misses) == (1, 0)
+
+    def test_identical_bodies_are_stored_once(self, tmp_path):
+        content = os.urandom(1024)
+        with ResponseCache(tmp_path) as cache:
+            cache.store("https://example.com/a", _response("https://example.com/a", content))
+            size = cache.size
+            cache.store("https://example.com/b", _response("https://example.com/b", content))
+            assert cache.size == size
+
+            # replaced bodies are dropped once no response uses them anymore
+            cache.store("https://example.com/a", _response("https://example.com/a", b"new"))
+            cache.store("https://example.com/b", _response("https://example.com/b", b"new"))
+            assert cache.size < size
+
+    def test_ttl(self, tmp_path):
+        with ResponseCache(tmp_path, ttl=-1) as cache:
+            cache.store("https://example.com/a", _response("https://example.com/a", b"content"))
+            assert cache.get("https://example.com/a") is None
+
+    def test_least_recently_used_responses_are_evicted(self, tmp_path):
+        # random content does not compress
+        with ResponseCache(tmp_path, max_size=2500) as cache:
+            cache.store("https://example.com/a", _response("https://example.com/a", os.urandom(1000)))
+            cache.store("https://example.com/b", _response("https://example.com/b", os.urandom(1000)))
+            assert cache.get("https://example.com/a") is not None
+            cache.store("https://example.com/c", _response("https://example.com/c", os.urandom(1000)))
+
+            assert cache.get("https://example.com/b") is None
+            assert cache.get("https://example.com/a") is not None
+            assert cache.get("https://example.com/c") is not None
+            assert cache.size <= 2500
+
+    def test_session_handler_context(self, local_publisher_server, tmp_path):
+        handler = SessionHandler()
+        url = local_publisher_server.url("/article/0")
+
+        for _ in range(2):
+            with handler.context(cache_dir=tmp_path):
+                response = handler.get_session().get_with_interrupt(url)
+                assert "<title>/article/0</title>" in response.text
+
+        assert local_publisher_server.requests["/article/0"] == 1
+        # outside the context, responses are neither served from nor stored in the cache
+        assert handler.get_session().cache is None
+
+    def test_async_crawler(self, local_publisher_server, local_publishers, tmp_path):
+        crawler = AsyncCrawler(*local_publishers(1), delay=0.0)
+
+        for _ in range(2):
+            with session_handler.context(cache_dir=tmp_path):
+                articles = list(crawler.crawl(only_complete=False))
+                assert len(articles) == 6
+
+        assert all(local_publisher_server.requests[f"/article/{i}"] == 1 for i in range(6))
+
+
+class TestRobotsCache:
+    def test_entries_expire(self, tmp_path):
+        robots = CachedRobots("User-agent: *\nDisallow: /private", False, False)
+        with RobotsCache(tmp_path, ttl=60) as cache:
+            cache.store("https://example.com/robots.txt", robots)
+            cache.store("https://example.org/robots.txt", robots, {"cache-control": "public, max-age=0"})
+            cache.store("https://example.net/robots.txt", robots, {"expires": "Wed, 21 Oct 2015 07:28:00 GMT"})
+
+        # reopened, e.g. by another process
+        with RobotsCache(tmp_path) as cache:
+            assert cache.get("https://example.com/robots.txt") == robots
+            assert cache.get("https://example.org/robots.txt") is None
+            assert cache.get("https://example.net/robots.txt") is None
+            assert (cache.hits, cache.misses) == (1, 2)
+
+    def test_prefetch_reads_robots_from_cache(self, local_publisher_server, local_publishers, tmp_path):
+        for _ in range(2):
+            # fresh publishers, so the robots.txt file is read again
+            publishers = local_publishers(2)
+            with RobotsCache(tmp_path) as cache:
+                prefetch_robots([publisher.robots for publisher in publishers], cache)
+
+            assert all(publisher.robots.ready for publisher in publishers)
+            assert not publishers[0].robots.can_fetch("*", local_publisher_server.url("/private/article"))
+
+        # both publishers share their robots.txt
+        assert local_publisher_server.requests["/robots.txt"] == 1
+
+    def test_prefetch_remembers_missing_robots(self, local_publisher_server, local_publishers, tmp_path):
+        del local_publisher_server.routes["/robots.txt"]
+        for _ in range(2):
+            publisher = local_publishers(1)[0]
+            with RobotsCache(tmp_path) as cache:
+                prefetch_robots([publisher.robots], cache)
+
+            assert publisher.robots.robots_file_parser.allow_all
+
+        assert local_publisher_server.requests["/robots.txt"] == 1
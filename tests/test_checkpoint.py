@@ -0,0 +1,29 @@
+from fundus.scraping.checkpoint import Checkpoint, URLStatus
+
+
+class TestCheckpoint:
+    def test_persists_across_instances(self, tmp_path):
+        with Checkpoint(tmp_path) as checkpoint:
+            checkpoint.mark("publisher", "https://example.com/a", URLStatus.FETCHED)
+            checkpoint.mark("publisher", "https://example.com/b", URLStatus.FAILED)
+            checkpoint.mark("publisher", "https://example.com/c", URLStatus.SEEN)
+
+        with Checkpoint(tmp_path) as checkpoint:
+            assert checkpoint.is_done("publisher", "https://example.com/a")
+            # failed downloads may be transient and are retried
+            assert checkpoint.status("publisher", "https://example.com/b") == URLStatus.FAILED
+            assert not checkpoint.is_done("publisher", "https://example.com/b")
+            # interrupted downloads are retried
+            assert checkpoint.status("publisher", "https://example.com/c") == URLStatus.SEEN
+            assert not checkpoint.is_done("publisher", "https://example.com/c")
+            # records are kept per publisher
+            assert checkpoint.status("other_publisher", "https://example.com/a") is None
+
+    def test_count(self, tmp_path):
+        with Checkpoint(tmp_path, flush_every=1000) as checkpoint:
+            for i in range(3):
+                checkpoint.mark("publisher", f"https://example.com/{i}", URLStatus.FETCHED)
+            checkpoint.mark("publisher", "https://example.com/0", URLStatus.FAILED)
+
+            assert checkpoint.count("publisher", URLStatus.FETCHED) == 2
+            assert checkpoint.count("publisher", URLStatus.FAILED) == 1
@@ -1,8 +1,32 @@
+import asyncio
+import threading
+import time
+from collections import Counter, defaultdict
+from datetime import datetime, timedelta, timezone
+from multiprocessing.pool import Pool
+from typing import Any, Dict, List
+from urllib.parse import urlparse
+
 import pytest
 
-from fundus import Crawler, NewsMap, RSSFeed
+from fundus import AsyncCrawler, Crawler, NewsMap, RSSFeed, Sitemap
+from fundus.parser import ParserProxy
 from fundus.publishers.base_objects import Publisher
-from fundus.scraping.html import WebSource
+from fundus.scraping.checkpoint import Checkpoint
+from fundus.scraping.dedup import BloomFilterDeduplicator
+from fundus.scraping.html import (
+    HTML,
+    AdaptiveRate,
+    AsyncWebSource,
+    CircuitBreaker,
+    WebSource,
+    _parse_retry_after,
+    _TokenBucket,
+)
+from fundus.scraping.scraper import AsyncWebScraper
+from fundus.scraping.session import AsyncSessionHandler, CrashThread
+from fundus.scraping.stats import Metric
+from tests.fixtures.fixture_server import TitleParserProxy
 
 
 class TestPipeline:
@@ -89,3 +113,514 @@ class TestImpersonate:
             impersonate=True,
         )
         assert source._impersonate_profile == publisher.impersonate
+
+
+class TestAsyncCrawler:
+    def test_crawl_matches_threaded_crawler(self, local_publishers):
+        publishers = local_publishers(2)
+        threaded = Crawler(*publishers, delay=0.0).crawl(only_complete=False, only_unique=False)
+        asynchronous = AsyncCrawler(*publishers, delay=0.0).crawl(only_complete=False, only_unique=False)
+
+        def key(article):
+            return article.publisher, article.html.requested_url
+
+        assert sorted(map(key, asynchronous)) == sorted(map(key, threaded))
+
+    def test_max_articles_per_publisher(self, local_publishers):
+        crawler = AsyncCrawler(*local_publishers(3), delay=0.0)
+        articles = list(crawler.crawl(only_complete=False, max_articles_per_publisher=2, timeout=120))
+
+        assert len(articles) == 6
+        assert all(count == 2 for count in Counter(article.publisher for article in articles).values())
+
+    def test_crawl_async(self, local_publishers):
+        crawler = AsyncCrawler(*local_publishers(2), delay=0.0)
+
+        async def collect():
+            return [article async for article in crawler.crawl_async(only_complete=False, max_articles=4)]
+
+        assert len(asyncio.run(collect())) == 4
+
+    def test_does_not_spawn_thread_per_publisher(self, local_publishers):
+        def count_threads() -> int:
+            # exclude request threads of the local server
+            return sum("process_request" not in thread.name for thread in threading.enumerate())
+
+        crawler = AsyncCrawler(*local_publishers(20), delay=0.0)
+        threads_before = count_threads()
+        max_threads = threads_before
+
+        for _ in crawler.crawl(only_complete=False, only_unique=False):
+            max_threads = max(max_threads, count_threads())
+
+        # the event loop thread, the bookkeeping threads of its pool and one thread parsing articles
+        assert max_threads - threads_before <= 5
+
+    @pytest.mark.parametrize("parse_workers", [None, 2])
+    def test_parse_outside_event_loop_thread(self, local_publishers, monkeypatch, parse_workers):
+        parse_threads = set()
+        extract_article = AsyncWebScraper._extract_article
+
+        def record_thread(self, *args, **kwargs):
+            parse_threads.add(threading.current_thread().name)
+            return extract_article(self, *args, **kwargs)
+
+        monkeypatch.setattr(AsyncWebScraper, "_extract_article", record_thread)
+        publishers = local_publishers(2)
+        crawler = AsyncCrawler(*publishers, delay=0.0, parse_workers=parse_workers)
+        articles = list(crawler.crawl(only_complete=False, only_unique=False))
+
+        assert all(article.title == urlparse(article.html.requested_url).path for article in articles)
+        assert parse_threads and all(name.startswith("fundus-parse") for name in parse_threads)
+
+    def test_checkpoint_lookups_outside_event_loop_thread(self, local_publishers, monkeypatch, tmp_path):
+        lookup_threads = set()
+        is_done = Checkpoint.is_done
+
+        def record_thread(self, *args, **kwargs):
+            lookup_threads.add(threading.current_thread().name)
+            return is_done(self, *args, **kwargs)
+
+        monkeypatch.setattr(Checkpoint, "is_done", record_thread)
+        crawler = AsyncCrawler(*local_publishers(2), delay=0.0, state_dir=tmp_path)
+
+        assert len(list(crawler.crawl(only_complete=False, only_unique=False))) == 12
+        assert lookup_threads and all(name.startswith("fundus-io") for name in lookup_threads)
+
+
+class TestMaxInFlight:
+    @pytest.mark.parametrize("crawler_type", [Crawler, AsyncCrawler])
+    def test_concurrent_downloads_yield_all_articles(self, local_publishers, crawler_type):
+        publishers = local_publishers(2)
+        sequential = Crawler(*publishers, delay=0.0).crawl(only_complete=False, only_unique=False)
+        concurrent = crawler_type(*publishers, delay=0.0, max_in_flight_per_publisher=4).crawl(
+            only_complete=False, only_unique=False
+        )
+
+        def key(article):
+            return article.publisher, article.html.requested_url
+
+        assert sorted(map(key, concurrent)) == sorted(map(key, sequential))
+
+    def test_max_articles_per_publisher(self, local_publishers):
+        crawler = Crawler(*local_publishers(2), delay=0.0, max_in_flight_per_publisher=4)
+        articles = list(crawler.crawl(only_complete=False, max_articles_per_publisher=2, timeout=120))
+
+        assert Counter(article.publisher for article in articles) == {"local_publisher_0": 2, "local_publisher_1": 2}
+
+    def test_token_bucket_spaces_request_starts(self):
+        sleeps: List[float] = []
+        bucket = _TokenBucket(delay=lambda: 10.0, sleep=sleeps.append)
+
+        for _ in range(3):
+            bucket()
+
+        # the first request starts immediately, every further one waits for the next token
+        assert len(sleeps) == 2
+        assert sleeps[0] == pytest.approx(10.0, abs=0.1)
+        assert sleeps[1] == pytest.approx(20.0, abs=0.1)
+
+    def test_adaptive_rate_backs_off_and_probes_back_up(self):
+        rate = AdaptiveRate(min_backoff=1.0, increase=1.0)
+
+        assert rate.delay(0.5) == 0.5
+        assert rate.throttled() == 1.0
+        assert rate.throttled() == 2.0
+        assert rate.delay(0.5) == 2.0
+
+        # 1 / (1/2 + 1) seconds
+        assert rate.healthy()
+        assert rate.interval == pytest.approx(2 / 3)
+        # falls below the configured delay
+        assert rate.healthy()
+        assert rate.interval == 0.0
+        assert not rate.healthy()
+        assert rate.delay(0.5) == 0.5
+
+    def test_adaptive_rate_honors_retry_after(self):
+        rate = AdaptiveRate(max_retry_after=5.0)
+
+        assert rate.pause() == 0.0
+        rate.throttled(retry_after=60.0)
+        assert rate.pause() == pytest.approx(5.0, abs=0.1)
+
+    def test_parse_retry_after(self):
+        assert _parse_retry_after(None) is None
+        assert _parse_retry_after("120") == 120.0
+        assert _parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+        assert _parse_retry_after("soon") is None
+
+    def test_invalid_max_in_flight(self, local_publishers):
+        publisher = local_publishers(1)[0]
+        with pytest.raises(ValueError):
+            WebSource(["https://example.com"], publisher, max_in_flight=0)
+
+
+class TestParseWorkers:
+    def test_parse_in_worker_processes(self, local_publishers):
+        publishers = local_publishers(2)
+        in_thread = Crawler(*publishers, delay=0.0).crawl(only_complete=False, only_unique=False)
+        in_process = Crawler(*publishers, delay=0.0, parse_workers=2).crawl(only_complete=False, only_unique=False)
+
+        def by_publisher(articles):
+            urls = defaultdict(list)
+            for article in articles:
+                assert article.title == urlparse(article.html.requested_url).path
+                urls[article.publisher].append(article.html.requested_url)
+            return urls
+
+        # articles of a publisher keep the order they were downloaded in
+        assert by_publisher(in_process) == by_publisher(in_thread)
+
+    def test_tasks_only_carry_publisher_name(self, local_publishers, monkeypatch):
+        task_args = []
+        apply_async = Pool.apply_async
+
+        def record_args(self, func, args=(), *rest, **kwargs):
+            task_args.append(args)
+            return apply_async(self, func, args, *rest, **kwargs)
+
+        monkeypatch.setattr(Pool, "apply_async", record_args)
+        articles = list(Crawler(*local_publishers(1), delay=0.0, parse_workers=1).crawl(only_complete=False))
+
+        assert len(task_args) == len(articles) == 6
+        assert all(args[0] == "local_publisher_0" for args in task_args)
+        assert not any(isinstance(arg, ParserProxy) for args in task_args for arg in args)
+
+    def test_invalid_parse_workers(self, local_publishers):
+        with pytest.raises(ValueError):
+            Crawler(*local_publishers(1), parse_workers=0)
+
+
+class TestCheckpoint:
+    @pytest.mark.parametrize("crawler_type", [Crawler, AsyncCrawler])
+    def test_resume_crawl(self, local_publisher_server, local_publishers, tmp_path, crawler_type):
+        publishers = local_publishers(1)
+
+        first = list(
+            crawler_type(*publishers, delay=0.0, state_dir=tmp_path).crawl(only_complete=False, max_articles=2)
+        )
+        rest = list(crawler_type(*publishers, delay=0.0, state_dir=tmp_path).crawl(only_complete=False))
+
+        assert len(first) == 2
+        assert len(rest) == 4
+        assert not {article.html.requested_url for article in first} & {article.html.requested_url for article in rest}
+        # consumed articles are not downloaded again
+        assert all(local_publisher_server.requests[urlparse(article.html.requested_url).path] == 1 for article in first)
+
+    @pytest.mark.parametrize("crawler_type", [Crawler, AsyncCrawler])
+    def test_resume_after_max_articles_per_publisher(self, local_publishers, tmp_path, crawler_type):
+        publishers = local_publishers(1)
+
+        first = list(
+            crawler_type(*publishers, delay=0.0, state_dir=tmp_path).crawl(
+                only_complete=False, max_articles_per_publisher=2
+            )
+        )
+        rest = list(crawler_type(*publishers, delay=0.0, state_dir=tmp_path).crawl(only_complete=False))
+
+        # articles dropped after reaching the maximum were never received, so they are not skipped
+        assert len(first) == 2
+        assert len(rest) == 4
+
+    @pytest.mark.parametrize("crawler_type", [Crawler, AsyncCrawler])
+    def test_retry_failed_urls(self, local_publisher_server, local_publishers, tmp_path, crawler_type):
+        publishers = local_publishers(1)
+        article = local_publisher_server.routes["/article/0"]
+        local_publisher_server.add_route("/article/0", b"", status=404)
+
+        first = list(crawler_type(*publishers, delay=0.0, state_dir=tmp_path).crawl(only_complete=False))
+        local_publisher_server.routes["/article/0"] = article
+        rest = list(crawler_type(*publishers, delay=0.0, state_dir=tmp_path).crawl(only_complete=False))
+
+        assert len(first) == 5
+        assert [urlparse(article.html.requested_url).path for article in rest] == ["/article/0"]
+
+
+class TestOnlyUnique:
+    def test_custom_deduplicator(self, local_publishers):
+        publishers = local_publishers(2)
+        bloom = BloomFilterDeduplicator(capacity=1_000)
+
+        articles = list(Crawler(*publishers, delay=0.0).crawl(only_complete=False, only_unique=bloom))
+
+        # both publishers serve the same URLs
+        assert len(articles) == 6
+        assert len(bloom) == 6
+
+    @pytest.mark.parametrize("crawler_type", [Crawler, AsyncCrawler])
+    def test_skip_urls_listed_by_multiple_sources(self, local_publisher_server, crawler_type):
+        # a second feed listing the same articles with fragments
+        local_publisher_server.add_route(
+            "/feed-copy",
+            (
+                "<rss><channel>"
+                + "".join(
+                    f"<item><link>{local_publisher_server.url(f'/article/{i}')}#top</link></item>" for i in range(3)
+                )
+                + "</channel></rss>"
+            ).encode(),
+            "application/rss+xml",
+        )
+        publisher = Publisher(
+            name="local_publisher",
+            domain=local_publisher_server.url("/"),
+            parser=TitleParserProxy,
+            sources=[RSSFeed(local_publisher_server.url("/feed")), RSSFeed(local_publisher_server.url("/feed-copy"))],
+        )
+
+        articles = list(crawler_type(publisher, delay=0.0).crawl(only_complete=False, only_unique=False))
+
+        assert len(articles) == 3
+        assert all(local_publisher_server.requests[f"/article/{i}"] == 1 for i in range(3))
+
+
+class TestStats:
+    @pytest.mark.parametrize("crawler_type", [Crawler, AsyncCrawler])
+    def test_crawl_stats(self, local_publishers, crawler_type):
+        publishers = local_publishers(2)
+        crawler = crawler_type(*publishers, delay=0.0)
+
+        articles = list(crawler.crawl(only_complete=False))
+
+        # both publishers serve the same URLs
+        assert len(articles) == 6
+        assert crawler.stats.get(Metric.ARTICLES_YIELDED) == 6
+        assert crawler.stats.get(Metric.ARTICLES_DROPPED_DUPLICATE) == 6
+        assert crawler.stats.get(Metric.URLS_DISCOVERED, publisher="local_publisher_0") == 6
+        assert crawler.stats.get(Metric.BYTES_DOWNLOADED) > 0
+        assert set(crawler.stats.by_publisher()) == {"local_publisher_0", "local_publisher_1"}
+
+
+class TestDateWindow:
+    @pytest.mark.parametrize("crawler_type", [Crawler, AsyncCrawler])
+    def test_skip_urls_outside_date_window(self, local_publisher_server, local_publishers, crawler_type):
+        today = datetime.now(timezone.utc).date().isoformat()
+        local_publisher_server.add_route(
+            "/sitemap.xml",
+            (
+                "<sitemapindex>"
+                f"<sitemap><loc>{local_publisher_server.url('/sitemap-old.xml')}</loc>"
+                "<lastmod>2000-01-01</lastmod></sitemap>"
+                f"<sitemap><loc>{local_publisher_server.url('/sitemap-1.xml')}</loc><lastmod>{today}</lastmod></sitemap>"
+                "</sitemapindex>"
+            ).encode(),
+            "application/xml",
+        )
+        local_publisher_server.add_route(
+            "/sitemap-1.xml",
+            (
+                '<urlset xmlns:news="http://www.google.com/schemas/sitemap-news/0.9">'
+                f"<url><loc>{local_publisher_server.url('/article/3')}</loc>"
+                f"<news:news><news:publication_date>{today}T00:00:00Z</news:publication_date></news:news></url>"
+                f"<url><loc>{local_publisher_server.url('/article/4')}</loc><lastmod>2000-01-01T12:00:00+02:00</lastmod></url>"
+                f"<url><loc>{local_publisher_server.url('/article/5')}</loc></url>"
+                "</urlset>"
+            ).encode(),
+            "application/xml",
+        )
+        crawler = crawler_type(*local_publishers(1), delay=0.0, restrict_sources_to=[Sitemap])
+
+        articles = crawler.crawl(only_complete=False, date_window=timedelta(days=2))
+
+        assert sorted(article.html.requested_url for article in articles) == [
+            local_publisher_server.url("/article/3"),
+            local_publisher_server.url("/article/5"),
+        ]
+        assert local_publisher_server.requests["/article/4"] == 0
+        assert local_publisher_server.requests["/sitemap-old.xml"] == 0
+        assert crawler.stats.get(Metric.URLS_FILTERED_DATE) == 1
+
+
+class TestSourceCache:
+    @pytest.mark.parametrize("crawler_type", [Crawler, AsyncCrawler])
+    def test_crawl_with_source_cache(self, local_publisher_server, local_publishers, tmp_path, crawler_type):
+        local_publisher_server.add_route(
+            "/feed",
+            f"<rss><channel><item><link>{local_publisher_server.url('/article/0')}</link></item></channel></rss>".encode(),
+            "application/rss+xml",
+            headers={"etag": '"feed"'},
+        )
+        publishers = local_publishers(1)
+
+        def crawl():
+            crawler = crawler_type(*publishers, delay=0.0, source_cache_dir=tmp_path, restrict_sources_to=[RSSFeed])
+            return [article.html.requested_url for article in crawler.crawl(only_complete=False)]
+
+        assert crawl() == crawl() == [local_publisher_server.url("/article/0")]
+        assert local_publisher_server.requests["/article/0"] == 2
+        assert (tmp_path / "sources.sqlite").exists()
+
+
+class TestThrottling:
+    @pytest.mark.parametrize("crawler_type", [Crawler, AsyncCrawler])
+    def test_throttled_urls_are_requeued(self, local_publisher_server, local_publishers, crawler_type):
+        responses = iter([(429, {"retry-after": "0"}, b"")])
+        ok = local_publisher_server.routes["/article/1"]
+        local_publisher_server.routes["/article/1"] = lambda: next(responses, None) or ok()
+        crawler = crawler_type(*local_publishers(1), delay=0.0, restrict_sources_to=[RSSFeed])
+
+        articles = list(crawler.crawl(only_complete=False))
+
+        assert sorted(article.html.requested_url for article in articles) == [
+            local_publisher_server.url(f"/article/{i}") for i in range(3)
+        ]
+        assert local_publisher_server.requests["/article/1"] == 2
+        assert crawler.stats.get(Metric.REQUESTS_THROTTLED) == 1
+        assert crawler.stats.get(Metric.URLS_REQUEUED) == 1
+        assert crawler.stats.get(Metric.RATE_DECREASES) == 1
+        assert crawler.stats.get(Metric.REQUESTS_FAILED) == 0
+
+    def test_throttled_urls_are_dropped_after_max_retries(self, local_publisher_server, local_publishers):
+        local_publisher_server.add_route("/article/1", b"", status=503)
+        publisher = local_publishers(1)[0]
+        source = WebSource(
+            [local_publisher_server.url("/article/1")],
+            publisher,
+            delay=lambda: 0.0,
+            rate=AdaptiveRate(min_backoff=0.01),
+            max_retries=2,
+        )
+
+        assert list(source.fetch()) == []
+        assert local_publisher_server.requests["/article/1"] == 3
+        assert source.stats.get(Metric.URLS_REQUEUED) == 2
+        assert source.stats.get(Metric.REQUESTS_FAILED) == 1
+
+    def test_retries_are_forgotten_after_other_errors(self, local_publisher_server, local_publishers):
+        responses = iter([(429, {"retry-after": "0"}, b"")])
+        local_publisher_server.routes["/article/1"] = lambda: next(responses, None) or (404, {}, b"")
+        source = WebSource(
+            [local_publisher_server.url("/article/1")],
+            local_publishers(1)[0],
+            delay=lambda: 0.0,
+            rate=AdaptiveRate(min_backoff=0.01),
+        )
+
+        assert list(source.fetch()) == []
+        assert local_publisher_server.requests["/article/1"] == 2
+        assert source._retries == {}
+
+    @pytest.mark.parametrize("asynchronous", [False, True])
+    def test_requeued_urls_are_dropped_once_exhausted(self, local_publisher_server, local_publishers, asynchronous):
+        def throttle_late():
+            # finishes after the failing request opened the circuit breaker
+            time.sleep(0.2)
+            return 429, {"retry-after": "0"}, b""
+
+        local_publisher_server.add_route("/article/0", b"", status=404)
+        local_publisher_server.routes["/article/1"] = throttle_late
+        urls = [local_publisher_server.url(f"/article/{i}") for i in range(2)]
+        kwargs: Dict[str, Any] = dict(
+            delay=lambda: 0.0,
+            rate=AdaptiveRate(min_backoff=0.01),
+            max_in_flight=2,
+            circuit_breaker=CircuitBreaker(threshold=1),
+        )
+        publisher = local_publishers(1)[0]
+
+        source: WebSource
+        if asynchronous:
+            source = async_source = AsyncWebSource(urls, publisher, AsyncSessionHandler(), **kwargs)
+
+            async def crawl() -> List[HTML]:
+                return [html async for html in async_source.fetch_async()]
+
+            assert asyncio.run(crawl()) == []
+        else:
+            source = WebSource(urls, publisher, **kwargs)
+            assert list(source.fetch()) == []
+
+        assert local_publisher_server.requests["/article/1"] == 1
+        assert source.stats.get(Metric.URLS_SKIPPED_CIRCUIT_OPEN) == 0
+
+
+class TestCircuitBreaker:
+    def test_opens_after_consecutive_failures(self):
+        breaker = CircuitBreaker(threshold=2)
+
+        assert not breaker.failure()
+        assert not breaker.success()
+        assert not breaker.failure()
+        assert breaker.failure()
+        assert breaker.state == "open"
+        assert breaker.is_permanently_open
+        assert not breaker.allow()
+
+    def test_probes_after_cooldown(self):
+        breaker = CircuitBreaker(threshold=1, cooldown=0.0)
+
+        assert breaker.failure()
+        assert not breaker.is_permanently_open
+        # only a single probe at a time
+        assert breaker.allow()
+        assert breaker.state == "half-open"
+        assert not breaker.allow()
+        # a failed probe opens the breaker again
+        assert breaker.failure()
+        assert breaker.allow()
+        assert breaker.success()
+        assert breaker.state == "closed"
+
+    def test_release_ends_probe(self):
+        breaker = CircuitBreaker(threshold=1, cooldown=0.0)
+
+        assert breaker.failure()
+        assert breaker.allow()
+        breaker.release()
+        assert breaker.state == "open"
+        assert breaker.allow()
+
+    def test_interrupted_probe_is_released(self, local_publisher_server, local_publishers):
+        breaker = CircuitBreaker(threshold=1, cooldown=0.0)
+        source = WebSource([], local_publishers(1)[0], circuit_breaker=breaker)
+        breaker.failure()
+
+        def interrupt() -> None:
+            raise CrashThread
+
+        source.rate_limiter = interrupt  # type: ignore[assignment]
+        with pytest.raises(CrashThread):
+            source._fetch_html(local_publisher_server.url("/article/0"), lambda url: False)
+
+        assert breaker.state == "open"
+        assert breaker.allow()
+
+    @pytest.mark.parametrize("crawler_type", [Crawler, AsyncCrawler])
+    def test_throttling_does_not_trip_breaker(self, local_publisher_server, local_publishers, crawler_type):
+        responses = iter([(429, {"retry-after": "0"}, b"")])
+        ok = local_publisher_server.routes["/article/0"]
+        local_publisher_server.routes["/article/0"] = lambda: next(responses, None) or ok()
+        crawler = crawler_type(
+            *local_publishers(1), delay=0.0, restrict_sources_to=[RSSFeed], circuit_breaker_threshold=1
+        )
+
+        assert len(list(crawler.crawl(only_complete=False))) == 3
+        assert crawler.stats.get(Metric.REQUESTS_THROTTLED) == 1
+        assert crawler.stats.get(Metric.CIRCUIT_BREAKER_TRIPS) == 0
+
+    @pytest.mark.parametrize("crawler_type", [Crawler, AsyncCrawler])
+    def test_skips_failing_publisher(self, local_publisher_server, local_publishers, crawler_type):
+        for i in range(3):
+            local_publisher_server.add_route(f"/article/{i}", b"", status=404)
+        crawler = crawler_type(
+            *local_publishers(1), delay=0.0, restrict_sources_to=[RSSFeed], circuit_breaker_threshold=2
+        )
+
+        assert list(crawler.crawl(only_complete=False)) == []
+        assert local_publisher_server.requests["/article/2"] == 0
+        assert crawler.stats.get(Metric.CIRCUIT_BREAKER_TRIPS) == 1
+        assert crawler.stats.get(Metric.REQUESTS_FAILED) == 2
+
+
+class TestRobotsCache:
+    @pytest.mark.parametrize("crawler_type", [Crawler, AsyncCrawler])
+    def test_crawl_with_robots_cache(self, local_publisher_server, local_publishers, tmp_path, crawler_type):
+        for _ in range(2):
+            crawler = crawler_type(
+                *local_publishers(2), delay=0.0, robots_cache_dir=tmp_path, restrict_sources_to=[RSSFeed]
+            )
+            assert len(list(crawler.crawl(only_complete=False, only_unique=False))) == 6
+
+        assert local_publisher_server.requests["/robots.txt"] == 1
+        assert (tmp_path / "robots.sqlite").exists()
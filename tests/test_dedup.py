@@ -0,0 +1,44 @@
+import pytest
+
+from fundus.scraping.dedup import (
+    BloomFilterDeduplicator,
+    DiskDeduplicator,
+    InMemoryDeduplicator,
+)
+
+
+@pytest.fixture(params=[InMemoryDeduplicator, BloomFilterDeduplicator, DiskDeduplicator])
+def deduplicator(request):
+    with request.param() as backend:
+        yield backend
+
+
+class TestDeduplicator:
+    def test_add(self, deduplicator):
+        assert deduplicator.add("https://example.com/a")
+        assert deduplicator.add("https://example.com/b")
+        assert not deduplicator.add("https://example.com/a")
+
+        assert "https://example.com/a" in deduplicator
+        assert "https://example.com/c" not in deduplicator
+        assert len(deduplicator) == 2
+        assert deduplicator.memory_footprint > 0
+
+    def test_bloom_filter_memory_is_bounded(self):
+        bloom = BloomFilterDeduplicator(capacity=10_000, error_rate=0.01)
+        footprint = bloom.memory_footprint
+
+        urls = [f"https://example.com/article/{i}" for i in range(10_000)]
+        new = sum(bloom.add(url) for url in urls)
+
+        assert bloom.memory_footprint == footprint
+        # a false positive marks a new URL as duplicate, the error rate bounds how often that happens
+        assert new >= len(urls) * (1 - 0.01)
+        assert all(url in bloom for url in urls)
+
+    def test_disk_deduplicator_is_persistent(self, tmp_path):
+        with DiskDeduplicator(tmp_path / "urls.sqlite") as deduplicator:
+            deduplicator.add("https://example.com/a")
+
+        with DiskDeduplicator(tmp_path / "urls.sqlite") as deduplicator:
+            assert not deduplicator.add("https://example.com/a")
@@ -201,3 +201,32 @@ class TestEvents:
 
             assert events.is_event_set("stop", "active") is True
             assert events.is_event_set("stop", "inactive") is False
+
+    def test_shared_events(self):
+        events = EventDict(default_events=["stop"])
+        events.alias("publisher", 1)
+
+        with events.context("publisher::worker", share="publisher"):
+            assert not events.is_event_set("stop")
+            events.set_event("stop", "publisher")
+            assert events.is_event_set("stop")
+
+        assert events.is_event_set("stop", "publisher::worker")
+
+    def test_callbacks(self):
+        events = EventDict(default_events=["success"])
+        events.alias("thread-1", 1)
+        calls = []
+
+        remove = events.add_callback("success", lambda: calls.append("kept"), "thread-1")
+        events.add_callback("success", lambda: calls.append("removed"), "thread-1")()
+        assert calls == []
+
+        events.set_event("success", "thread-1")
+        assert calls == ["kept"]
+
+        # callbacks run once and run right away if the event is already set
+        events.set_event("success", "thread-1")
+        events.add_callback("success", lambda: calls.append("late"), "thread-1")
+        assert calls == ["kept", "late"]
+        remove()
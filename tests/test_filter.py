@@ -1,5 +1,7 @@
+from datetime import datetime, timedelta, timezone
+
 from fundus import Requires
-from fundus.scraping.filter import RequiresAll
+from fundus.scraping.filter import DateWindow, RequiresAll
 
 
 class TestExtractionFilter:
@@ -39,3 +41,24 @@ class TestExtractionFilter:
 
         extraction = {"a": "Some Stuff", "c": True}
         assert not RequiresAll(eval_booleans=True)(extraction)
+
+
+class TestDateWindow:
+    def test_contains(self):
+        start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+        window = DateWindow(start=start, end=start + timedelta(days=1))
+
+        assert start in window
+        assert start + timedelta(hours=12) in window
+        assert start - timedelta(seconds=1) not in window
+        assert start + timedelta(days=2) not in window
+        # dates without timezone are assumed to be in UTC
+        assert datetime(2024, 1, 1, 12) in window
+        assert datetime(2024, 1, 1, 1, tzinfo=timezone(timedelta(hours=2))) not in window
+
+    def test_open_window(self):
+        window = DateWindow(start=datetime(2024, 1, 1))
+
+        assert datetime(2100, 1, 1) in window
+        assert window.is_before(datetime(2023, 12, 31))
+        assert not DateWindow(end=datetime(2024, 1, 1)).is_before(datetime(1970, 1, 1))
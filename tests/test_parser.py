@@ -13,6 +13,7 @@ from fundus.parser.base_parser import (
     RegisteredFunction,
     attribute,
 )
+from fundus.parser.profiling import ParseProfile, profile_parsing
 from fundus.parser.utility import generic_author_parsing
 from fundus.publishers import PublisherCollection
 from fundus.publishers.base_objects import Publisher
@@ -196,6 +197,58 @@ class TestParserProxy:
         assert parser3 != parser2 != parser1
 
 
+class TestProfiling:
+    def test_profile_parsing(self, parser_with_attr_title):
+        parser = parser_with_attr_title()
+        html = "<html><head><title>title</title></head></html>"
+
+        parser.parse(html)
+        with profile_parsing() as profile:
+            parser.parse(html)
+            parser.parse(html)
+        parser.parse(html)
+
+        entries = {entry.function: entry for entry in profile.entries()}
+        assert set(entries) == {"<setup>", "__meta", "__ld", "free_access", "title"}
+        assert all(entry.calls == 2 for entry in entries.values())
+        assert entries["title"].parser == "ParserWithAttrTitle"
+        assert "title" in profile.table()
+
+    def test_failing_attribute_is_recorded(self):
+        class ParserWithFailingAttr(BaseParser):
+            @attribute
+            def title(self) -> str:
+                raise ValueError
+
+        with profile_parsing() as profile:
+            with pytest.raises(ValueError):
+                ParserWithFailingAttr().parse("<html></html>")
+
+        assert {entry.function: entry.calls for entry in profile.entries()}["title"] == 1
+
+    def test_proxy_profiling(self, proxy_with_two_versions_and_different_attrs, parser_with_attr_title):
+        parser_proxy = proxy_with_two_versions_and_different_attrs()
+
+        with parser_proxy.profiling() as profile:
+            for versioned_parser in parser_proxy:
+                parser_proxy(versioned_parser.VALID_UNTIL).parse("<html></html>")
+            parser_with_attr_title().parse("<html></html>")
+
+        assert {entry.parser.rpartition(".")[2] for entry in profile.entries()} == {"Earlier", "Later"}
+        by_function = {entry.function: entry.calls for entry in profile.entries(by="function")}
+        assert by_function["free_access"] == 2
+
+    def test_nested_profiles(self, parser_with_attr_title):
+        outer = ParseProfile()
+        with profile_parsing(outer):
+            with profile_parsing() as inner:
+                parser_with_attr_title().parse("<html></html>")
+            parser_with_attr_title().parse("<html></html>")
+
+        assert {entry.function: entry.calls for entry in outer.entries()}["title"] == 2
+        assert {entry.function: entry.calls for entry in inner.entries()}["title"] == 1
+
+
 # enforce test coverage for test parsing
 # because this is also used for the generate_parser_test_files script we export it here
 attributes_required_to_cover = {"title", "authors", "topics", "publishing_date", "body", "images"}
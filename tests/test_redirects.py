@@ -0,0 +1,105 @@
+import asyncio
+
+from fundus.scraping.redirects import RedirectMap
+from fundus.scraping.session import AsyncInterruptableSession
+
+
+class TestRedirectMap:
+    def test_rewrites_redirected_urls(self):
+        redirects = RedirectMap()
+        redirects.learn("https://example.com/a", "https://example.com/b")
+
+        assert redirects.rewrite("https://example.com/a") == "https://example.com/b"
+        assert redirects.rewrite("https://example.com/c") == "https://example.com/c"
+
+    def test_learns_origin_rules(self):
+        redirects = RedirectMap(min_observations=2)
+        redirects.learn("http://example.com/a", "https://www.example.com/a/")
+        # a single redirect is not enough evidence for the whole origin
+        assert redirects.rewrite("http://example.com/b") == "http://example.com/b"
+
+        redirects.learn("http://example.com/b", "https://www.example.com/b/")
+        assert redirects.rewrite("http://example.com/c?page=2") == "https://www.example.com/c/?page=2"
+        # no trailing slash is appended to file names
+        assert redirects.rewrite("http://example.com/sitemap.xml") == "https://www.example.com/sitemap.xml"
+
+    def test_contradicting_redirect_drops_origin_rule(self):
+        redirects = RedirectMap(min_observations=1)
+        redirects.learn("http://example.com/a", "https://example.com/a")
+        redirects.learn("http://example.com/b", "https://example.com/elsewhere")
+
+        assert redirects.rewrite("http://example.com/c") == "http://example.com/c"
+
+    def test_follows_chained_redirects(self):
+        redirects = RedirectMap()
+        redirects.learn("http://example.com/a", "https://example.com/a")
+        redirects.learn("https://example.com/a", "https://example.com/b")
+        # the opposite direction replaces the outdated redirect instead of looping
+        redirects.learn("https://example.com/b", "https://example.com/a")
+
+        assert redirects.rewrite("http://example.com/a") == "https://example.com/a"
+        assert redirects.rewrite("https://example.com/b") == "https://example.com/a"
+
+    def test_redirects_are_learned_per_impersonate_profile(self):
+        redirects = RedirectMap()
+        redirects.learn("https://example.com/a", "https://m.example.com/a", impersonate="safari_ios")
+
+        assert redirects.rewrite("https://example.com/a") == "https://example.com/a"
+        assert redirects.rewrite("https://example.com/a", impersonate="safari_ios") == "https://m.example.com/a"
+
+    def test_size_is_bounded(self):
+        redirects = RedirectMap(max_size=2)
+        for i in range(4):
+            redirects.learn(f"https://example-{i}.com/a", f"https://example-{i}.com/b")
+
+        assert len(redirects) == 2
+        assert redirects.rewrite("https://example-0.com/a") == "https://example-0.com/a"
+        assert redirects.rewrite("https://example-3.com/a") == "https://example-3.com/b"
+
+
+class TestRedirectingSession:
+    @staticmethod
+    def get(redirects: RedirectMap, url: str):
+        async def run():
+            session = AsyncInterruptableSession(redirects=redirects)
+            try:
+                return await session._follow_redirects(url)
+            finally:
+                await session.close()
+
+        return asyncio.run(run())
+
+    def test_permanent_redirects_are_skipped(self, local_publisher_server):
+        local_publisher_server.add_route(
+            "/old", b"", status=301, headers={"location": local_publisher_server.url("/article/0")}
+        )
+        redirects = RedirectMap()
+
+        for _ in range(2):
+            response = self.get(redirects, local_publisher_server.url("/old"))
+            assert response.url == local_publisher_server.url("/article/0")
+
+        assert local_publisher_server.requests["/old"] == 1
+        assert local_publisher_server.requests["/article/0"] == 2
+
+    def test_temporary_redirects_are_not_learned(self, local_publisher_server):
+        local_publisher_server.add_route(
+            "/old", b"", status=302, headers={"location": local_publisher_server.url("/article/0")}
+        )
+        redirects = RedirectMap()
+
+        for _ in range(2):
+            self.get(redirects, local_publisher_server.url("/old"))
+
+        assert local_publisher_server.requests["/old"] == 2
+        assert len(redirects) == 0
+
+    def test_failing_rewrite_falls_back_to_requested_url(self, local_publisher_server):
+        redirects = RedirectMap()
+        redirects.learn(local_publisher_server.url("/article/0"), local_publisher_server.url("/gone"))
+
+        response = self.get(redirects, local_publisher_server.url("/article/0"))
+
+        assert response.status_code == 200
+        assert local_publisher_server.requests["/gone"] == 1
+        assert redirects.rewrite(local_publisher_server.url("/article/0")) == local_publisher_server.url("/article/0")
@@ -0,0 +1,89 @@
+import random
+
+import pytest
+from robots import RobotFileParser
+
+from fundus.publishers.base_objects import Robots
+
+ROBOTS_TXT = """
+User-agent: *
+Disallow: /private
+Allow: /private/public
+Disallow: /*.pdf$
+Disallow: /search?
+Disallow: /*/print
+Allow: /exact$
+Disallow: /exact
+
+User-agent: fundus
+Disallow: /
+Allow: /news/
+"""
+
+
+def _robots(content: str) -> Robots:
+    robots = Robots("https://example.com/robots.txt")
+    robots.robots_file_parser.parse(content.splitlines())
+    robots.ready = True
+    return robots
+
+
+def _reference(content: str) -> RobotFileParser:
+    parser = RobotFileParser("https://example.com/robots.txt")
+    parser.parse(content.splitlines())
+    return parser
+
+
+class TestCompiledRobots:
+    @pytest.mark.parametrize(
+        "path, allowed",
+        [
+            ("/", True),
+            ("/private/article", False),
+            ("/private/public/article", True),
+            ("/files/report.pdf", False),
+            ("/files/report.pdf?download=1", True),
+            ("/search?q=news", False),
+            ("/2024/article/print", False),
+            ("/exact", True),
+            ("/exact/article", False),
+            ("/news//article", True),
+        ],
+    )
+    def test_can_fetch(self, path, allowed):
+        robots, reference = _robots(ROBOTS_TXT), _reference(ROBOTS_TXT)
+        url = f"https://example.com{path}"
+
+        assert robots.can_fetch("*", url) is reference.can_fetch("*", url) is allowed
+
+    def test_matches_robotspy(self):
+        rng = random.Random(0)
+        segments = ["news", "private", "public", "a.pdf", "search?q", "print", "exact", "", "%2Fx"]
+        # robotspy gives ? a special meaning in some wildcard rules, which is left to robotspy itself
+        rule_segments = [segment for segment in segments if "?" not in segment] + ["*"]
+        content = "User-agent: *\n" + "\n".join(
+            f"{rng.choice(['Allow', 'Disallow'])}: /"
+            + "/".join(rng.choices(rule_segments, k=rng.randint(1, 3)))
+            + rng.choice(["", "", "$"])
+            for _ in range(30)
+        )
+        robots, reference = _robots(content), _reference(content)
+        assert robots._compile("*") is not None
+
+        for _ in range(2000):
+            url = "https://example.com/" + "/".join(rng.choices(segments, k=rng.randint(0, 5)))
+            assert robots.can_fetch("*", url) is reference.can_fetch("*", url), url
+
+    def test_user_agent_groups(self):
+        robots = _robots(ROBOTS_TXT)
+
+        assert robots.can_fetch("fundus", "https://example.com/news/article")
+        assert not robots.can_fetch("fundus", "https://example.com/private/public/article")
+
+    def test_allow_and_disallow_all(self):
+        robots = _robots(ROBOTS_TXT)
+
+        robots.robots_file_parser.disallow_all = True
+        assert not robots.can_fetch("*", "https://example.com/")
+        robots.robots_file_parser.allow_all = True
+        assert robots.can_fetch("*", "https://example.com/private")
@@ -1,26 +1,28 @@
+import asyncio
+import codecs
 import threading
 import time
-from queue import Queue
 from threading import Thread
-from typing import Union
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
-import curl_cffi
 import pytest
+from curl_cffi import Curl
 from curl_cffi.requests.exceptions import HTTPError, TooManyRedirects
 
 from fundus.scraping.session import (
+    AsyncInterruptableSession,
+    AsyncSessionHandler,
     CrashThread,
     InterruptableSession,
     SessionHandler,
-    _RequestTask,
+    get_transport,
 )
 from fundus.utils.events import __EVENTS__
 from tests.exceptions import Success
 
 
 def _mock_response(status_code: int = 200) -> MagicMock:
-    """Build a mock curl_cffi response that satisfies InterruptableSession._log_response."""
+    """Build a mock curl_cffi response that satisfies _log_response."""
     response = MagicMock()
     response._history = []  # object.__getattribute__ reads directly from __dict__
     response.status_code = status_code
@@ -57,11 +59,12 @@ class TestContext:
 
         with session_handler.context(timeout=1):
             with session_handler.context(timeout=2):
-                assert session_handler.get_session().timeout == 2
+                assert session_handler.get_session().session_kwargs["timeout"] == 2
 
-            assert session_handler.get_session().timeout == 1
+            assert session_handler.get_session().session_kwargs["timeout"] == 1
 
-        assert session_handler.get_session().timeout == SessionHandler.DEFAULT_SESSION_KWARGS["timeout"]
+        default_timeout = SessionHandler.DEFAULT_SESSION_KWARGS["timeout"]
+        assert session_handler.get_session().session_kwargs["timeout"] == default_timeout
 
     def test_thread_safety(self):
         session_handler = SessionHandler()
@@ -69,7 +72,7 @@ class TestContext:
         def set_context(timeout: int = 100):
             with pytest.raises(Success):
                 with session_handler.context(timeout=timeout):
-                    assert session_handler.get_session().timeout == timeout
+                    assert session_handler.get_session().session_kwargs["timeout"] == timeout
                     raise Success
 
         def set_context_fail():
@@ -94,7 +97,7 @@ class TestContext:
             thread.join()
 
             # 5. test if the session handler still resets
-            assert session_handler.get_session().timeout == 12
+            assert session_handler.get_session().session_kwargs["timeout"] == 12
 
         # 6. test if the context is closed properly
         thread = Thread(target=set_context, args=(13,))
@@ -130,7 +133,7 @@ class TestContext:
 
         assert inside_context_session is not None
         assert inside_context_session is not pre_context_session
-        assert inside_context_session.timeout == 9999
+        assert inside_context_session.session_kwargs["timeout"] == 9999
 
     def test_context_restores_other_threads_sessions(self):
         """After the context exits, other threads get back their original session."""
@@ -160,110 +163,188 @@ class TestContext:
         assert post_context_session is pre_context_session
 
 
-class TestInterruptableSession:
-    def test_worker_thread_starts_on_init(self):
-        session = InterruptableSession()
-        assert session._worker_thread.is_alive()
-        session.close()
+def _patch_follow_redirects(side_effect):
+    """Patch the redirect handling of the transport's sessions with a plain function run on the I/O thread."""
 
-    def test_worker_thread_is_daemon(self):
-        session = InterruptableSession()
-        assert session._worker_thread.daemon
-        session.close()
+    async def follow_redirects(self, url, **kwargs):
+        return side_effect(url, **kwargs)
+
+    return patch.object(AsyncInterruptableSession, "_follow_redirects", follow_redirects)
 
-    def test_worker_thread_exits_after_close(self):
+
+class TestInterruptableSession:
+    def test_request_against_local_server(self, local_publisher_server):
         session = InterruptableSession()
+        response = session.get_with_interrupt(local_publisher_server.url("/article/0"))
+        assert response.status_code == 200
+        assert b"<title>/article/0</title>" in response.content
         session.close()
-        session._worker_thread.join(timeout=2)
-        assert not session._worker_thread.is_alive()
 
-    def test_close_is_nonblocking(self):
-        """close() returns immediately even when a request is in flight."""
-        session = InterruptableSession()
-        inside_request = threading.Event()
-        allow_return = threading.Event()
+    def test_close_keeps_shared_transport_open(self, local_publisher_server):
+        """Closing a session releases its curl handles, but other sessions keep using the multi handle."""
+        closed, session = InterruptableSession(), InterruptableSession()
+        for s in (closed, session):
+            assert s.get_with_interrupt(local_publisher_server.url("/article/0")).status_code == 200
+        released = closed._session
+        assert released is not None
 
-        def slow_follow_redirects(url, **kwargs):
-            inside_request.set()
-            allow_return.wait(timeout=5)
+        closed.close()
+        get_transport().release_session(released).result(timeout=5)
 
-        with patch.object(session, "_follow_redirects", side_effect=slow_follow_redirects):
-            result_queue: Queue[Union[curl_cffi.requests.Response, Exception]] = Queue()
-            session._task_queue.put(_RequestTask("http://example.com", {}, result_queue))
-            assert inside_request.wait(5)
+        assert released._closed
+        assert session.get_with_interrupt(local_publisher_server.url("/article/1")).status_code == 200
+        session.close()
 
-            start = time.monotonic()
-            session.close()
-            assert time.monotonic() - start < 1.0
+    def test_close_while_request_in_flight(self, local_publisher_server):
+        """Handles of requests in flight when the session is closed are closed once they finished."""
+        received, respond = threading.Event(), threading.Event()
 
-        allow_return.set()
-        session._worker_thread.join(timeout=2)
+        def slow_route():
+            received.set()
+            respond.wait(5)
+            return 200, {"content-type": "text/html"}, b"<html></html>"
 
-    def test_request_runs_on_worker_thread(self):
-        """_follow_redirects executes on the worker thread, not the caller thread."""
+        local_publisher_server.routes["/slow"] = slow_route
+        session = InterruptableSession()
+        closed_handles = []
+        close = Curl.close
+
+        def record_close(curl):
+            closed_handles.append(curl)
+            close(curl)
+
+        with patch.object(Curl, "close", record_close):
+            future = session.submit(local_publisher_server.url("/slow"))
+            assert received.wait(5)
+            released = session._session
+            assert released is not None
+            session.close()
+            get_transport().release_session(released).result(timeout=5)
+            assert not closed_handles
+
+            respond.set()
+            assert future.result(timeout=5).status_code == 200
+            assert len(closed_handles) == 1
+
+    def test_async_session_handler_closes_sessions(self, local_publisher_server):
+        async def crawl() -> None:
+            handler = AsyncSessionHandler()
+            sessions = [handler.get_session(), handler.get_session(impersonate="chrome")]
+            for session in sessions:
+                response = await session.get_with_interrupt(local_publisher_server.url("/article/0"))
+                assert response.status_code == 200
+            await handler.close_sessions()
+            assert all(session._closed for session in sessions)
+            assert handler._async_curl is None
+
+        asyncio.run(crawl())
+
+    def test_request_runs_on_transport_thread(self):
+        """Requests are performed on the I/O thread of the transport, not the caller thread."""
         session = InterruptableSession()
-        caller_thread_id = threading.current_thread().ident
-        captured_thread_id = None
+        captured_threads = []
 
         def capture_thread(url, **kwargs):
-            nonlocal captured_thread_id
-            captured_thread_id = threading.current_thread().ident
+            captured_threads.append(threading.current_thread())
             return _mock_response()
 
-        with patch.object(session, "_follow_redirects", side_effect=capture_thread):
+        with _patch_follow_redirects(capture_thread):
             session.get_with_interrupt("http://example.com")
 
-        assert captured_thread_id is not None
-        assert captured_thread_id != caller_thread_id
-        assert captured_thread_id == session._worker_thread.ident
+        assert captured_threads == [get_transport()._thread]
         session.close()
 
-    def test_same_worker_thread_handles_all_requests(self):
-        """All requests go through the same persistent worker thread, enabling connection reuse."""
-        session = InterruptableSession()
-        captured_thread_ids = []
+    def test_sessions_share_transport_thread(self):
+        """Requests of all sessions and threads go through the same I/O thread."""
+        sessions = [InterruptableSession() for _ in range(4)]
+        captured_threads = set()
+        threads_before = threading.active_count()
 
         def capture_thread(url, **kwargs):
-            captured_thread_ids.append(threading.current_thread().ident)
+            captured_threads.add(threading.current_thread())
             return _mock_response()
 
-        with patch.object(session, "_follow_redirects", side_effect=capture_thread):
-            for _ in range(3):
-                session.get_with_interrupt("http://example.com")
+        with _patch_follow_redirects(capture_thread):
+            workers = [Thread(target=session.get_with_interrupt, args=("http://example.com",)) for session in sessions]
+            for worker in workers:
+                worker.start()
+            for worker in workers:
+                worker.join()
+
+        assert captured_threads == {get_transport()._thread}
+        assert threading.active_count() == threads_before
+        for session in sessions:
+            session.close()
+
+    def test_submit_returns_future(self):
+        session = InterruptableSession()
+        mock = _mock_response()
+
+        with _patch_follow_redirects(lambda url, **kwargs: mock):
+            future = session.submit("http://example.com")
+            assert future.result(timeout=5) is mock
 
-        assert len(set(captured_thread_ids)) == 1
-        assert captured_thread_ids[0] == session._worker_thread.ident
         session.close()
 
+    def test_close_is_nonblocking(self):
+        """close() returns immediately even when a request is in flight."""
+        session = InterruptableSession()
+        inside_request = threading.Event()
+        allow_return = threading.Event()
+
+        async def slow_follow_redirects(self, url, **kwargs):
+            inside_request.set()
+            while not allow_return.is_set():
+                await asyncio.sleep(0.01)
+            return _mock_response()
+
+        with patch.object(AsyncInterruptableSession, "_follow_redirects", slow_follow_redirects):
+            future = session.submit("http://example.com")
+            assert inside_request.wait(5)
+
+            start = time.monotonic()
+            session.close()
+            assert time.monotonic() - start < 1.0
+
+            allow_return.set()
+            future.result(timeout=5)
+
     def test_response_returned_to_caller(self):
         session = InterruptableSession()
         mock = _mock_response(status_code=200)
 
-        with patch.object(session, "_follow_redirects", return_value=mock):
+        with _patch_follow_redirects(lambda url, **kwargs: mock):
             response = session.get_with_interrupt("http://example.com")
 
         assert response is mock
         session.close()
 
     def test_exception_propagates_to_caller(self):
-        """Exceptions raised in the worker thread are re-raised in the caller thread."""
+        """Exceptions raised on the I/O thread are re-raised in the caller thread."""
         session = InterruptableSession()
 
-        with patch.object(session, "_follow_redirects", side_effect=ConnectionError("unreachable")):
+        def unreachable(url, **kwargs):
+            raise ConnectionError("unreachable")
+
+        with _patch_follow_redirects(unreachable):
             with pytest.raises(ConnectionError, match="unreachable"):
                 session.get_with_interrupt("http://example.com")
 
         session.close()
 
     def test_crash_thread_on_stop_event(self):
-        """CrashThread is raised in the caller when the stop event fires while polling."""
+        """The stop event cancels the request right away and raises CrashThread in the caller."""
         session = InterruptableSession()
         inside_request = threading.Event()
-        allow_return = threading.Event()
+        cancelled = threading.Event()
 
-        def slow_follow_redirects(url, **kwargs):
+        async def hanging_follow_redirects(self, url, **kwargs):
             inside_request.set()
-            allow_return.wait(timeout=5)
+            try:
+                await asyncio.sleep(60)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
 
         def set_stop():
             assert inside_request.wait(5)
@@ -271,39 +352,54 @@ class TestInterruptableSession:
 
         stopper = Thread(target=set_stop, daemon=True)
 
-        with patch.object(session, "_follow_redirects", side_effect=slow_follow_redirects):
+        with patch.object(AsyncInterruptableSession, "_follow_redirects", hanging_follow_redirects):
             stopper.start()
             with __EVENTS__.context("test-stop-event"):
+                start = time.monotonic()
                 with pytest.raises(CrashThread):
                     session.get_with_interrupt("http://example.com")
+                assert time.monotonic() - start < 1.0
+
+            assert cancelled.wait(5)
 
         stopper.join(timeout=2)
-        allow_return.set()
         session.close()
 
-    def test_use_thread_local_curl_always_true(self):
-        """use_thread_local_curl=True is enforced regardless of what kwargs pass."""
-        session = InterruptableSession(use_thread_local_curl=False)
-        assert session._use_thread_local_curl is True
+    def test_crash_thread_if_stop_event_already_set(self):
+        session = InterruptableSession()
+
+        async def hanging_follow_redirects(self, url, **kwargs):
+            await asyncio.sleep(60)
+
+        with patch.object(AsyncInterruptableSession, "_follow_redirects", hanging_follow_redirects):
+            with __EVENTS__.context("test-stop-event-set"):
+                __EVENTS__.set_event("stop")
+                with pytest.raises(CrashThread):
+                    session.get_with_interrupt("http://example.com")
+
         session.close()
 
     def test_kwargs_forwarded_to_curl_session(self):
         session = InterruptableSession(timeout=42, verify=False)
-        assert session.timeout == 42
-        assert session.verify is False
+
+        with _patch_follow_redirects(lambda url, **kwargs: _mock_response()):
+            session.get_with_interrupt("http://example.com")
+
+        assert session._session is not None
+        assert session._session.timeout == 42
+        assert session._session.verify is False
         session.close()
 
     def test_impersonate_drops_kwargs_before_dispatch(self):
         """When impersonating, get_with_interrupt strips caller kwargs so curl_cffi's fingerprint is unmodified."""
         session = InterruptableSession(impersonate="chrome")
-        final = _mock_response()
         captured_kwargs = []
 
         def capturing_follow(url, **kwargs):
             captured_kwargs.append(kwargs)
-            return final
+            return _mock_response()
 
-        with patch.object(session, "_follow_redirects", side_effect=capturing_follow):
+        with _patch_follow_redirects(capturing_follow):
             session.get_with_interrupt("http://example.com", headers={"x-custom": "value"})
 
         assert captured_kwargs[0] == {}
@@ -311,14 +407,13 @@ class TestInterruptableSession:
 
     def test_no_impersonate_forwards_kwargs(self):
         session = InterruptableSession()
-        final = _mock_response()
         captured_kwargs = []
 
         def capturing_follow(url, **kwargs):
             captured_kwargs.append(kwargs)
-            return final
+            return _mock_response()
 
-        with patch.object(session, "_follow_redirects", side_effect=capturing_follow):
+        with _patch_follow_redirects(capturing_follow):
             session.get_with_interrupt("http://example.com", headers={"x-custom": "value"})
 
         assert captured_kwargs[0] == {"headers": {"x-custom": "value"}}
@@ -329,7 +424,7 @@ class TestInterruptableSession:
         mock = _mock_response(status_code=404)
         mock.raise_for_status.side_effect = HTTPError("404")
 
-        with patch.object(session, "_follow_redirects", return_value=mock):
+        with _patch_follow_redirects(lambda url, **kwargs: mock):
             with pytest.raises(HTTPError):
                 session.get_with_interrupt("http://example.com")
 
@@ -346,32 +441,37 @@ def _redirect_response(status_code: int, location: str) -> MagicMock:
 
 
 class TestFollowRedirects:
+    @staticmethod
+    def follow_redirects(get: AsyncMock, url: str = "http://example.com", **kwargs):
+        async def run():
+            session = AsyncInterruptableSession()
+            try:
+                with patch.object(session, "get", get):
+                    return await session._follow_redirects(url, **kwargs)
+            finally:
+                await session.close()
+
+        return asyncio.run(run())
+
     def test_no_redirect_returns_response_with_empty_history(self):
-        session = InterruptableSession()
         final = _mock_response()
 
-        with patch.object(session, "get", return_value=final):
-            result = session._follow_redirects("http://example.com", headers={"x": "y"})
+        result = self.follow_redirects(AsyncMock(return_value=final), headers={"x": "y"})
 
         assert result is final
         assert object.__getattribute__(result, "_history") == []
-        session.close()
 
     def test_redirect_chain_builds_history(self):
-        session = InterruptableSession()
         r1 = _redirect_response(301, "http://example.com/step2")
         r2 = _redirect_response(302, "http://example.com/final")
         final = _mock_response()
 
-        with patch.object(session, "get", side_effect=[r1, r2, final]):
-            result = session._follow_redirects("http://example.com")
+        result = self.follow_redirects(AsyncMock(side_effect=[r1, r2, final]))
 
         assert result is final
         assert object.__getattribute__(result, "_history") == [r1, r2]
-        session.close()
 
     def test_redirect_chain_follows_location_urls(self):
-        session = InterruptableSession()
         r1 = _redirect_response(301, "http://example.com/step2")
         final = _mock_response()
         captured_urls = []
@@ -380,50 +480,32 @@ class TestFollowRedirects:
             captured_urls.append(url)
             return r1 if url == "http://example.com" else final
 
-        with patch.object(session, "get", side_effect=capturing_get):
-            session._follow_redirects("http://example.com")
+        self.follow_redirects(AsyncMock(side_effect=capturing_get))
 
         assert captured_urls == ["http://example.com", "http://example.com/step2"]
-        session.close()
 
     def test_missing_location_header_raises_http_error(self):
-        session = InterruptableSession()
         redirect = MagicMock()
         redirect.status_code = 301
         redirect.headers = MagicMock()
         redirect.headers.get = MagicMock(return_value=None)
         redirect.url = "http://example.com"
 
-        with patch.object(session, "get", return_value=redirect):
-            with pytest.raises(HTTPError):
-                session._follow_redirects("http://example.com")
-
-        session.close()
+        with pytest.raises(HTTPError):
+            self.follow_redirects(AsyncMock(return_value=redirect))
 
     def test_too_many_redirects_raises(self):
-        session = InterruptableSession()
         redirect = _redirect_response(301, "http://example.com/loop")
 
-        with patch.object(session, "get", return_value=redirect):
-            with pytest.raises(TooManyRedirects):
-                session._follow_redirects("http://example.com")
-
-        session.close()
+        with pytest.raises(TooManyRedirects):
+            self.follow_redirects(AsyncMock(return_value=redirect))
 
     def test_kwargs_passed_through(self):
-        session = InterruptableSession()
-        final = _mock_response()
-        captured_kwargs = []
-
-        def capturing_get(url, **kwargs):
-            captured_kwargs.append(kwargs)
-            return final
+        get = AsyncMock(return_value=_mock_response())
 
-        with patch.object(session, "get", side_effect=capturing_get):
-            session._follow_redirects("http://example.com", headers={"x-custom": "value"})
+        self.follow_redirects(get, headers={"x-custom": "value"})
 
-        assert captured_kwargs[0].get("headers") == {"x-custom": "value"}
-        session.close()
+        assert get.call_args.kwargs.get("headers") == {"x-custom": "value"}
 
 
 class TestSessionHandlerExtra:
@@ -490,46 +572,92 @@ class TestGetWithInterruptClosed:
 
     def test_does_not_raise_before_close(self):
         session = InterruptableSession()
-        mock = _mock_response()
-        with patch.object(session, "_follow_redirects", return_value=mock):
+        with _patch_follow_redirects(lambda url, **kwargs: _mock_response()):
             session.get_with_interrupt("http://example.com")  # must not raise
         session.close()
 
 
 class TestEncoding:
     def test_charset_detected_from_meta_tag(self):
-        from fundus.scraping.session import _detect_encoding_from_html
+        from fundus.scraping.encoding import _detect_encoding_from_html
 
         html = b'<meta http-equiv="Content-Type" content="text/html; charset=iso-8859-1">'
         assert _detect_encoding_from_html(html) == "iso-8859-1"
 
     def test_charset_detected_without_quotes(self):
-        from fundus.scraping.session import _detect_encoding_from_html
+        from fundus.scraping.encoding import _detect_encoding_from_html
 
         html = b"<meta charset=utf-8>"
         assert _detect_encoding_from_html(html) == "utf-8"
 
     def test_no_charset_returns_none(self):
-        from fundus.scraping.session import _detect_encoding_from_html
+        from fundus.scraping.encoding import _detect_encoding_from_html
 
         assert _detect_encoding_from_html(b"<html><body>no charset here</body></html>") is None
 
     def test_charset_only_scanned_in_first_2048_bytes(self):
-        from fundus.scraping.session import _detect_encoding_from_html
+        from fundus.scraping.encoding import _detect_encoding_from_html
 
         prefix = b"x" * 2048
         html = prefix + b'<meta charset="utf-8">'
         assert _detect_encoding_from_html(html) is None
 
     def test_detect_encoding_falls_back_to_utf8(self):
-        from fundus.scraping.session import _detect_encoding_from_bytes
+        from fundus.scraping.encoding import _detect_encoding_from_bytes
 
         # bytes that chardet cannot identify reliably → fallback
         assert _detect_encoding_from_bytes(b"") == "utf-8"
 
     def test_detect_encoding_prefers_html_meta_over_chardet(self):
-        from fundus.scraping.session import _detect_encoding_from_bytes
+        from fundus.scraping.encoding import _detect_encoding_from_bytes
 
         html = b'<meta charset="iso-8859-1">' + b"\xe9\xe0\xfc" * 100
         result = _detect_encoding_from_bytes(html)
         assert result == "iso-8859-1"
+
+    def test_decode_tiers(self):
+        from fundus.scraping.encoding import decode
+
+        text = "<p>Grüße</p>"
+        assert decode(text.encode("latin-1"), "text/html; charset=ISO-8859-1").method == "content-type"
+        assert decode(codecs.BOM_UTF8 + text.encode("utf-8")) == (text, "utf-8-sig", "bom")
+        assert decode(b'<meta charset="latin-1">' + text.encode("latin-1")).method == "meta"
+        # declared charsets that fail to decode are skipped
+        assert decode(text.encode("utf-8"), "text/html; charset=ascii") == (text, "utf-8", "utf-8")
+        assert decode(text.encode("cp1252"), fallback="cp1252") == (text, "cp1252", "fallback")
+
+    def test_detect_agrees_with_decode(self):
+        from fundus.scraping.encoding import decode, detect
+
+        text = "<p>Grüße</p>"
+        # multi-byte characters spanning the chunks detect() validates with, and an invalid byte at the end
+        long = ("a" + "ü" * 100_000).encode("utf-8")
+        cases = [
+            (text.encode("latin-1"), "text/html; charset=ISO-8859-1", None),
+            (codecs.BOM_UTF8 + text.encode("utf-8"), None, None),
+            (text.encode("utf-8"), "text/html; charset=ascii", None),
+            (text.encode("cp1252"), None, "cp1252"),
+            (long, "text/html; charset=unknown", None),
+            (long + b"\xff", None, "latin-1"),
+            (("Die Straße ist für Fußgänger gesperrt. " * 20).encode("cp1252"), None, None),
+        ]
+        for content, content_type, fallback in cases:
+            assert detect(content, content_type, fallback) == decode(content, content_type, fallback).encoding
+
+    def test_decode_falls_back_to_chardet(self):
+        from fundus.scraping.encoding import decode
+
+        text = "Die Straße ist für Fußgänger gesperrt. " * 20
+        decoded = decode(text.encode("cp1252"), "text/html; charset=utf-8")
+        assert decoded.method == "chardet"
+        assert decoded.text == text
+
+    def test_publisher_encodings_skip_chardet(self):
+        from fundus.scraping.encoding import PublisherEncodings
+
+        encodings = PublisherEncodings()
+        content = ("Die Straße ist für Fußgänger gesperrt. " * 20).encode("cp1252")
+
+        assert encodings.decode("publisher", content).method == "chardet"
+        assert encodings.decode("publisher", content).method == "fallback"
+        assert encodings.decode("other_publisher", content).method == "chardet"
@@ -0,0 +1,69 @@
+import json
+import pickle
+
+import pytest
+
+from fundus.scraping.stats import CrawlStats, Histogram, Metric
+
+
+class TestHistogram:
+    def test_observe(self):
+        histogram = Histogram(buckets=(0.1, 1.0))
+        for value in (0.05, 0.1, 0.5, 2.0):
+            histogram.observe(value)
+
+        assert histogram.count == 4
+        assert histogram.sum == pytest.approx(2.65)
+        assert list(histogram.cumulative()) == [(0.1, 2), (1.0, 3), (float("inf"), 4)]
+
+    def test_merge_different_buckets(self):
+        with pytest.raises(ValueError):
+            Histogram(buckets=(1.0,)).merge(Histogram(buckets=(2.0,)))
+
+
+class TestCrawlStats:
+    def test_get(self):
+        stats = CrawlStats()
+        stats.increment("a", "feed", Metric.URLS_DISCOVERED, 3)
+        stats.increment("a", "sitemap", Metric.URLS_DISCOVERED, 2)
+        stats.increment("b", "feed", Metric.URLS_DISCOVERED)
+        stats.observe("a", "feed", Metric.PARSE_SECONDS, 0.5)
+
+        assert stats.get(Metric.URLS_DISCOVERED) == 6
+        assert stats.get(Metric.URLS_DISCOVERED, publisher="a") == 5
+        assert stats.get(Metric.URLS_DISCOVERED, source="feed") == 4
+        assert stats.get(Metric.PARSE_SECONDS) == 0.5
+        assert stats.by_publisher() == {
+            "a": {Metric.URLS_DISCOVERED: 5, Metric.PARSE_SECONDS: 0.5},
+            "b": {Metric.URLS_DISCOVERED: 1},
+        }
+
+    def test_merge_and_pop(self):
+        stats, worker = CrawlStats(), CrawlStats()
+        stats.increment("a", "cc-news", Metric.ARTICLES_YIELDED)
+        worker.increment("a", "cc-news", Metric.ARTICLES_YIELDED, 2)
+        worker.observe("a", "cc-news", Metric.DECODE_SECONDS, 0.01)
+
+        stats.merge(pickle.loads(pickle.dumps(worker.pop())))
+
+        assert stats.get(Metric.ARTICLES_YIELDED) == 3
+        assert stats.get(Metric.DECODE_SECONDS) == 0.01
+        assert worker.to_dict() == {}
+
+    def test_export(self, tmp_path):
+        stats = CrawlStats()
+        stats.increment("a", "feed", Metric.BYTES_DOWNLOADED, 1024)
+        stats.observe("a", "feed", Metric.REQUEST_SECONDS, 0.2)
+
+        stats.export(tmp_path / "stats.json")
+        stats.export(tmp_path / "stats.prom")
+
+        data = json.loads((tmp_path / "stats.json").read_text())
+        assert data["a"]["feed"][Metric.BYTES_DOWNLOADED] == 1024
+        assert data["a"]["feed"][Metric.REQUEST_SECONDS]["count"] == 1
+
+        prometheus = (tmp_path / "stats.prom").read_text()
+        assert "# TYPE fundus_bytes_downloaded_total counter" in prometheus
+        assert 'fundus_bytes_downloaded_total{publisher="a",source="feed"} 1024' in prometheus
+        assert 'fundus_request_seconds_bucket{publisher="a",source="feed",le="+Inf"} 1' in prometheus
+        assert 'fundus_request_seconds_count{publisher="a",source="feed"} 1' in prometheus
@@ -0,0 +1,363 @@
+import asyncio
+import bz2
+import gzip
+import io
+import re
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Generator, List, Set, cast
+
+import pytest
+
+from fundus import RSSFeed, Sitemap
+from fundus.scraping.cache import CachedResponse
+from fundus.scraping.filter import DateWindow
+from fundus.scraping.session import AsyncInterruptableSession, _default_header, session_handler
+from fundus.scraping.url import URLRecord
+
+
+def _urlset(paths, namespace: str = "") -> bytes:
+    entries = "".join(f"<url><loc>https://example.com{path}</loc></url>" for path in paths)
+    return f'<?xml version="1.0" encoding="UTF-8"?>\n<urlset{namespace}>{entries}</urlset>'.encode()
+
+
+def _parse(sitemap: Sitemap, content: bytes, content_type: str = "application/xml", date_window=None):
+    sitemap_locs: List[str] = []
+    response = CachedResponse(sitemap.url, content, {"content-type": content_type})
+    urls = list(sitemap._parse_sitemap(sitemap.url, response, sitemap_locs, date_window))
+    return urls, sitemap_locs
+
+
+class TestSitemap:
+    paths = [f"/article/{i}" for i in range(5)]
+    urls = [f"https://example.com{path}" for path in paths]
+
+    @pytest.mark.parametrize(
+        "content, content_type",
+        [
+            (_urlset(paths), "application/xml"),
+            (_urlset(paths, ' xmlns="http://www.sitemaps.org/schemas/sitemap/0.9"'), "text/xml"),
+            (gzip.compress(_urlset(paths)), "application/x-gzip"),
+            (gzip.compress(_urlset(paths)), "application/octet-stream"),
+            (bz2.compress(_urlset(paths)), "application/octet-stream"),
+        ],
+    )
+    def test_parse_urls(self, content, content_type):
+        urls, sitemap_locs = _parse(Sitemap("https://example.com/sitemap.xml"), content, content_type)
+
+        assert urls == self.urls
+        assert sitemap_locs == []
+
+    def test_urls_are_yielded_while_parsing(self, monkeypatch):
+        sitemap = Sitemap("https://example.com/sitemap.xml")
+        stream = io.BytesIO(_urlset(f"/article/{i}" for i in range(10_000)))
+        monkeypatch.setattr(sitemap, "_open", lambda *_: stream)
+
+        urls = sitemap._parse_sitemap(sitemap.url, CachedResponse(sitemap.url, b"", {}), [])
+
+        assert next(urls) == "https://example.com/article/0"
+        assert stream.tell() < len(stream.getvalue())
+
+    def test_reverse(self, monkeypatch):
+        sitemap = Sitemap("https://example.com/sitemap.xml", reverse=True)
+        assert _parse(sitemap, _urlset(self.paths))[0] == self.urls[::-1]
+
+        # sitemaps exceeding the buffer are reversed in parts
+        monkeypatch.setattr(Sitemap, "_reverse_buffer_size", 2)
+        assert _parse(sitemap, _urlset(self.paths))[0] == [self.urls[i] for i in (1, 0, 3, 2, 4)]
+
+    def test_parse_sitemap_index(self):
+        content = (
+            "<sitemapindex>"
+            + "".join(
+                f"<sitemap><loc>https://example.com/sitemap-{year}.xml</loc></sitemap>" for year in (2023, 2025, 2024)
+            )
+            + "<sitemap><loc>https://example.com/sitemap-video-2022.xml</loc></sitemap></sitemapindex>"
+        ).encode()
+        sitemap = Sitemap(
+            "https://example.com/sitemap.xml",
+            sitemap_filter=lambda url: "video" in url,
+            sort_predicate=re.compile(r"\d{4}"),
+        )
+
+        urls, sitemap_locs = _parse(sitemap, content)
+
+        assert urls == []
+        assert sitemap_locs == [f"https://example.com/sitemap-{year}.xml" for year in (2025, 2024, 2023)]
+
+        urls, sitemap_locs = _parse(Sitemap("https://example.com/sitemap.xml", recursive=False), content)
+        assert sitemap_locs == []
+
+    def test_parse_dates(self):
+        content = (
+            '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9" '
+            'xmlns:news="http://www.google.com/schemas/sitemap-news/0.9">'
+            "<url><loc>https://example.com/article/0</loc><lastmod>2024-06-06T09:45:15.030Z</lastmod>"
+            "<news:news><news:publication_date>2024-06-05T10:00:00+02:00</news:publication_date></news:news></url>"
+            "<url><loc>https://example.com/article/1</loc><lastmod>2024-06-06</lastmod></url>"
+            "<url><loc>https://example.com/article/2</loc><lastmod>yesterday</lastmod></url>"
+            "</urlset>"
+        ).encode()
+
+        first, second, third = _parse(Sitemap("https://example.com/sitemap.xml"), content)[0]
+
+        assert isinstance(first, URLRecord) and first == "https://example.com/article/0"
+        assert first.lastmod == datetime(2024, 6, 6, 9, 45, 15, 30_000, tzinfo=timezone.utc)
+        assert first.date == first.publication_date == datetime(2024, 6, 5, 8, tzinfo=timezone.utc)
+        assert second.date == datetime(2024, 6, 6)
+        # URLs without (valid) dates are plain strings
+        assert type(third) is str
+
+    def test_prune_outdated_child_sitemaps(self):
+        content = (
+            "<sitemapindex>"
+            "<sitemap><loc>https://example.com/sitemap-2023.xml</loc><lastmod>2023-12-31</lastmod></sitemap>"
+            "<sitemap><loc>https://example.com/sitemap-2024.xml</loc><lastmod>2024-01-02</lastmod></sitemap>"
+            "<sitemap><loc>https://example.com/sitemap-undated.xml</loc></sitemap>"
+            "</sitemapindex>"
+        ).encode()
+        sitemap = Sitemap("https://example.com/sitemap.xml")
+
+        assert len(_parse(sitemap, content)[1]) == 3
+        assert _parse(sitemap, content, date_window=DateWindow(start=datetime(2024, 1, 1)))[1] == [
+            "https://example.com/sitemap-2024.xml",
+            "https://example.com/sitemap-undated.xml",
+        ]
+        # an end of the window doesn't prune, since older child sitemaps are modified when articles are added
+        assert len(_parse(sitemap, content, date_window=DateWindow(end=datetime(2000, 1, 1)))[1]) == 3
+
+    @pytest.mark.parametrize(
+        "content, content_type",
+        [
+            (b"", "application/xml"),
+            (b"  \n", "application/xml"),
+            (b"<html><body>Not found</body></html>", "text/html"),
+            (gzip.compress(_urlset(paths))[:-20], "application/x-gzip"),
+            (_urlset(paths), "application/x-gzip"),
+            (b"PK\x03\x04", "application/octet-stream"),
+        ],
+    )
+    def test_invalid_sitemaps(self, content, content_type):
+        urls, sitemap_locs = _parse(Sitemap("https://example.com/sitemap.xml"), content, content_type)
+
+        # a truncated archive may still yield the URLs read before the error
+        assert set(urls) <= set(self.urls)
+        assert sitemap_locs == []
+
+
+def _add_sitemap_index(server, months) -> None:
+    server.add_route(
+        "/sitemap.xml",
+        (
+            "<sitemapindex>"
+            + "".join(f"<sitemap><loc>{server.url(f'/sitemap-{month}.xml')}</loc></sitemap>" for month in months)
+            + "</sitemapindex>"
+        ).encode(),
+        "application/xml",
+    )
+    for month in months:
+        server.add_route(
+            f"/sitemap-{month}.xml",
+            f"<urlset><url><loc>{server.url(f'/article/{month}-1')}</loc></url>"
+            f"<url><loc>{server.url(f'/article/{month}-2')}</loc></url></urlset>".encode(),
+            "application/xml",
+        )
+
+
+class TestSitemapPrefetch:
+    months = ["2024-01", "2024-03", "2024-02", "2023-12"]
+
+    @staticmethod
+    def _expected(server, months, reverse: bool = False):
+        order = (2, 1) if reverse else (1, 2)
+        return [server.url(f"/article/{month}-{i}") for month in months for i in order]
+
+    @pytest.mark.parametrize("prefetch", [0, 2])
+    @pytest.mark.parametrize("reverse", [False, True])
+    def test_order_is_preserved(self, local_publisher_server, prefetch, reverse):
+        _add_sitemap_index(local_publisher_server, self.months)
+        sitemap = Sitemap(
+            local_publisher_server.url("/sitemap.xml"),
+            sort_predicate=re.compile(r"\d{4}-\d{2}"),
+            reverse=reverse,
+            prefetch=prefetch,
+        )
+        # sorted descending by <sort_predicate> and then reversed
+        months = sorted(self.months, reverse=not reverse)
+
+        assert list(sitemap.fetch(session_handler.get_session(), _default_header)) == self._expected(
+            local_publisher_server, months, reverse
+        )
+
+    def test_look_ahead_is_bounded(self, local_publisher_server):
+        _add_sitemap_index(local_publisher_server, self.months)
+        sitemap = Sitemap(local_publisher_server.url("/sitemap.xml"), prefetch=2)
+
+        urls = cast(Generator[str, None, None], sitemap.fetch(session_handler.get_session(), _default_header))
+        assert next(urls) == local_publisher_server.url(f"/article/{self.months[0]}-1")
+
+        def requested():
+            return sum(local_publisher_server.requests[f"/sitemap-{month}.xml"] for month in self.months)
+
+        deadline = time.monotonic() + 5
+        while requested() < 3 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        # the current child sitemap and the next two
+        assert requested() == 3
+        assert local_publisher_server.requests[f"/sitemap-{self.months[-1]}.xml"] == 0
+        urls.close()
+
+    def test_disabled_by_default(self, local_publisher_server):
+        _add_sitemap_index(local_publisher_server, self.months)
+        sitemap = Sitemap(local_publisher_server.url("/sitemap.xml"))
+        threads: Set[str] = set()
+
+        for _ in sitemap.fetch(session_handler.get_session(), _default_header):
+            threads.update(thread.name for thread in threading.enumerate())
+
+        assert not any(name.startswith("sitemap-prefetch") for name in threads)
+
+    def test_child_sitemaps_are_throttled(self, local_publisher_server):
+        _add_sitemap_index(local_publisher_server, self.months)
+        calls = []
+
+        for prefetch in (0, 2):
+            sitemap = Sitemap(local_publisher_server.url("/sitemap.xml"), prefetch=prefetch)
+            urls = list(
+                sitemap.fetch(session_handler.get_session(), _default_header, throttle=lambda: calls.append(prefetch))
+            )
+
+            assert urls == self._expected(local_publisher_server, self.months)
+            assert calls.count(prefetch) == len(self.months)
+
+    def test_fetch_async(self, local_publisher_server):
+        _add_sitemap_index(local_publisher_server, self.months)
+        local_publisher_server.add_route(f"/sitemap-{self.months[1]}.xml", b"", status=500)
+        sitemap = Sitemap(local_publisher_server.url("/sitemap.xml"), prefetch=2)
+        calls: List[None] = []
+
+        async def throttle():
+            calls.append(None)
+
+        async def collect():
+            session = AsyncInterruptableSession()
+            try:
+                return [url async for url in sitemap.fetch_async(session, _default_header, throttle=throttle)]
+            finally:
+                await session.close()
+
+        months = [month for month in self.months if month != self.months[1]]
+        assert asyncio.run(collect()) == self._expected(local_publisher_server, months)
+        assert len(calls) == len(self.months)
+
+
+RSS_2 = b"""<?xml version="1.0" encoding="UTF-8"?>
+<rss version="2.0" xmlns:atom="http://www.w3.org/2005/Atom">
+  <channel>
+    <link>https://example.com/</link>
+    <atom:link href="https://example.com/feed" rel="self"/>
+    <item>
+      <link> https://example.com/article/0?page=1&amp;ref=rss </link>
+      <guid>https://example.com/0</guid>
+      <pubDate>Mon, 01 Jan 2024 10:00:00 +0200</pubDate>
+      <description><![CDATA[<p>Summary with a <a href="https://example.com/other">link</a></p>]]></description>
+    </item>
+    <item><guid isPermaLink="true">https://example.com/article/1</guid></item>
+    <item><guid isPermaLink="false">not-a-link</guid></item>
+    <item><link><![CDATA[https://example.com/article/%C3%A4]]></link></item>
+  </channel>
+</rss>"""
+
+ATOM = b"""<?xml version="1.0" encoding="utf-8"?>
+<feed xmlns="http://www.w3.org/2005/Atom">
+  <link href="https://example.com/" rel="alternate"/>
+  <entry>
+    <link rel="enclosure" href="https://example.com/image.jpg"/>
+    <link href="https://example.com/article/0" rel="alternate" type="text/html"/>
+    <updated>2024-01-02T00:00:00Z</updated>
+    <published>2024-01-01T00:00:00+01:00</published>
+  </entry>
+  <entry><link href="https://example.com/article/1"/></entry>
+</feed>"""
+
+RSS_1 = b"""<?xml version="1.0"?>
+<rdf:RDF xmlns:rdf="http://www.w3.org/1999/02/22-rdf-syntax-ns#" xmlns="http://purl.org/rss/1.0/"
+    xmlns:dc="http://purl.org/dc/elements/1.1/">
+  <channel rdf:about="https://example.com/"><link>https://example.com/</link></channel>
+  <item rdf:about="https://example.com/article/0">
+    <link>https://example.com/article/0</link>
+    <dc:date>2024-01-01T00:00:00Z</dc:date>
+  </item>
+</rdf:RDF>"""
+
+
+def _feed_response(content: bytes) -> CachedResponse:
+    return CachedResponse("https://example.com/feed", content, {"content-type": "application/rss+xml"})
+
+
+def _with_dates(urls):
+    return [(url, getattr(url, "lastmod", None), getattr(url, "publication_date", None)) for url in urls]
+
+
+def _record_fallback(feed: RSSFeed, monkeypatch) -> List[str]:
+    """Replaces the feedparser fallback of <feed> and returns the list of documents passed to it."""
+    fallback: List[str] = []
+
+    def extract_urls_with_feedparser(content: str) -> List[str]:
+        fallback.append(content)
+        return []
+
+    monkeypatch.setattr(feed, "_extract_urls_with_feedparser", extract_urls_with_feedparser)
+    return fallback
+
+
+class TestRSSFeed:
+    @pytest.mark.parametrize(
+        "content",
+        [RSS_2, ATOM, RSS_1, "<rss><channel><item><link>https://example.com/ä</link></item></channel></rss>".encode()],
+    )
+    def test_matches_feedparser(self, content, monkeypatch):
+        feed = RSSFeed("https://example.com/feed")
+        fallback = _record_fallback(feed, monkeypatch)
+
+        urls = _with_dates(feed._extract_urls(_feed_response(content)))
+        monkeypatch.undo()
+
+        assert urls
+        assert not fallback
+        assert urls == _with_dates(feed._extract_urls_with_feedparser(_feed_response(content).text))
+
+    def test_falls_back_to_feedparser(self, monkeypatch):
+        feed = RSSFeed("https://example.com/feed")
+        fallback = _record_fallback(feed, monkeypatch)
+
+        for content in (b"", b"<html><body><item><link>https://example.com/a</link></item></body></html>"):
+            assert list(feed._extract_urls(_feed_response(content))) == []
+
+        assert len(fallback) == 2
+
+    def test_truncated_feed(self):
+        content = RSS_2[: RSS_2.index(b"<item><link><![CDATA[")]
+
+        assert len(list(RSSFeed("https://example.com/feed")._extract_urls(_feed_response(content)))) == 2
+
+    def test_rss_feed_dates(self, local_publisher_server):
+        published = datetime.now(timezone.utc).replace(microsecond=0) - timedelta(days=1)
+        local_publisher_server.add_route(
+            "/feed",
+            (
+                "<rss><channel>"
+                f"<item><link>{local_publisher_server.url('/article/0')}</link>"
+                f"<pubDate>{published.strftime('%a, %d %b %Y %H:%M:%S +0000')}</pubDate></item>"
+                f"<item><link>{local_publisher_server.url('/article/1')}</link></item>"
+                "</channel></rss>"
+            ).encode(),
+            "application/rss+xml",
+        )
+
+        first, second = RSSFeed(local_publisher_server.url("/feed"))
+
+        assert isinstance(first, URLRecord)
+        assert first.publication_date == published
+        assert type(second) is str
@@ -0,0 +1,110 @@
+import gzip
+import json
+from datetime import datetime
+from typing import IO, Callable
+
+import pytest
+
+from fundus import Crawler
+from fundus.scraping.article import Article
+from fundus.scraping.html import HTML, SourceInfo
+from fundus.scraping.writer import JSONLinesWriter, is_jsonlines_path
+
+
+def make_article(i: int) -> Article:
+    html = HTML(
+        requested_url=f"https://example.com/{i}",
+        responded_url=f"https://example.com/{i}",
+        content="<html></html>",
+        crawl_date=datetime.now(),
+        source_info=SourceInfo("publisher"),
+    )
+    return Article(html=html, title=f"Title {i}")
+
+
+def read_lines(path):
+    opener: Callable[..., IO[str]] = open
+    if path.suffix == ".gz":
+        opener = gzip.open
+    with opener(path, "rt", encoding="utf-8") as file:
+        return [json.loads(line) for line in file]
+
+
+class TestJSONLinesWriter:
+    @pytest.mark.parametrize("name", ["articles.jsonl", "articles.jsonl.gz"])
+    def test_write(self, tmp_path, name):
+        path = tmp_path / name
+        with JSONLinesWriter(path) as writer:
+            for i in range(3):
+                writer.write(make_article(i))
+
+        lines = read_lines(path)
+        assert [line["article"]["title"] for line in lines] == ["Title 0", "Title 1", "Title 2"]
+        assert all(line["publisher"] == "publisher" for line in lines)
+
+    def test_rotation(self, tmp_path):
+        with JSONLinesWriter(tmp_path / "articles.jsonl.gz", max_articles=2) as writer:
+            for i in range(5):
+                writer.write(make_article(i))
+
+        parts = sorted(tmp_path.iterdir())
+        assert [part.name for part in parts] == [f"articles-0000{i}.jsonl.gz" for i in range(3)]
+        assert [len(read_lines(part)) for part in parts] == [2, 2, 1]
+
+    @pytest.mark.parametrize("name", ["articles.jsonl", "articles.jsonl.gz"])
+    def test_append(self, tmp_path, name):
+        for i in range(2):
+            with JSONLinesWriter(tmp_path / name) as writer:
+                writer.write(make_article(i))
+
+        assert [line["article"]["title"] for line in read_lines(tmp_path / name)] == ["Title 0", "Title 1"]
+
+        with JSONLinesWriter(tmp_path / name, append=False) as writer:
+            writer.write(make_article(2))
+
+        assert [line["article"]["title"] for line in read_lines(tmp_path / name)] == ["Title 2"]
+
+    def test_rotation_continues_after_existing_parts(self, tmp_path):
+        for _ in range(2):
+            with JSONLinesWriter(tmp_path / "articles.jsonl.gz", max_articles=2) as writer:
+                for i in range(3):
+                    writer.write(make_article(i))
+
+        assert [part.name for part in sorted(tmp_path.iterdir())] == [f"articles-0000{i}.jsonl.gz" for i in range(4)]
+
+    def test_flush(self, tmp_path):
+        writer = JSONLinesWriter(tmp_path / "articles.jsonl", flush_every=1)
+        writer.write(make_article(0))
+        # readable before the writer is closed
+        assert len(read_lines(tmp_path / "articles.jsonl")) == 1
+        writer.close()
+
+    def test_is_jsonlines_path(self):
+        assert is_jsonlines_path("articles.jsonl")
+        assert is_jsonlines_path("articles.jsonl.zst")
+        assert not is_jsonlines_path("articles.json")
+        assert not is_jsonlines_path("articles.gz")
+
+    def test_crawl_streams_to_jsonlines(self, tmp_path, local_publishers):
+        crawler = Crawler(*local_publishers(1), delay=0.0)
+        articles = list(crawler.crawl(only_complete=False, save_to_file=tmp_path / "articles.jsonl.gz"))
+
+        lines = read_lines(tmp_path / "articles.jsonl.gz")
+        assert [line["article"]["title"] for line in lines] == [article.title for article in articles]
+
+    def test_resumed_crawl_keeps_written_articles(self, tmp_path, local_publishers):
+        publishers = local_publishers(1)
+        path = tmp_path / "articles.jsonl.gz"
+
+        first = list(
+            Crawler(*publishers, delay=0.0, state_dir=tmp_path / "state").crawl(
+                only_complete=False, max_articles=2, save_to_file=path
+            )
+        )
+        rest = list(
+            Crawler(*publishers, delay=0.0, state_dir=tmp_path / "state").crawl(only_complete=False, save_to_file=path)
+        )
+
+        lines = read_lines(path)
+        assert len(lines) == 6
+        assert [line["article"]["title"] for line in lines] == [article.title for article in first + rest]